@@ -0,0 +1,151 @@
+"""
+Bancos de pruebas de rendimiento del inventario.
+
+Uso: python benchmarks.py [nombre ...]   (sin argumentos se ejecutan todos)
+"""
+import gc
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+import inventarioEnlazado
+import inventario_contiguo
+from inventario_concurrente import InventarioConcurrente
+
+
+class _InventarioCerrojoGlobal:
+    """Envoltorio con un único cerrojo para todas las llamadas (la referencia a batir)."""
+
+    def __init__(self, inventario):
+        self._inventario = inventario
+        self._cerrojo: threading.Lock = threading.Lock()
+
+    def consultar(self, nombre: str) -> float:
+        with self._cerrojo:
+            return self._inventario.consultar(nombre)
+
+    def agregar(self, nombre: str, valor: float = 1.0) -> None:
+        with self._cerrojo:
+            self._inventario.agregar(nombre, valor)
+
+
+def _operaciones_por_segundo(inventario, hilos: int, operaciones: int, nombres: list[str],
+                             proporcion_lecturas: float) -> float:
+    """Lanza varios hilos mezclando consultas y altas, y mide las operaciones por segundo."""
+    barrera: threading.Barrier = threading.Barrier(hilos + 1)
+
+    def trabajo(semilla: int) -> None:
+        aleatorio = random.Random(semilla)
+        barrera.wait()
+        for _ in range(operaciones):
+            nombre: str = aleatorio.choice(nombres)
+            if aleatorio.random() < proporcion_lecturas:
+                inventario.consultar(nombre)
+            else:
+                inventario.agregar(nombre, 1.0)
+
+    trabajadores = [threading.Thread(target=trabajo, args=(i,)) for i in range(hilos)]
+    for trabajador in trabajadores:
+        trabajador.start()
+
+    barrera.wait()
+    inicio: float = time.perf_counter()
+    for trabajador in trabajadores:
+        trabajador.join()
+    return hilos * operaciones / (time.perf_counter() - inicio)
+
+
+def contencion(hilos: int = 8, operaciones: int = 50000, elementos: int = 10000,
+               proporcion_lecturas: float = 0.9) -> None:
+    """
+    Compara un cerrojo global con InventarioConcurrente (cerrojos por franjas).
+    Con el GIL los dos quedan a la par: ver el docstring de inventario_concurrente.
+    """
+    nombres: list[str] = [f"sku{i}" for i in range(elementos)]
+
+    global_ = _InventarioCerrojoGlobal(inventario_contiguo.Inventario())
+    concurrente = InventarioConcurrente(inventario_contiguo.Inventario, franjas=16)
+    for inventario in (global_, concurrente):
+        for nombre in nombres:
+            inventario.agregar(nombre, 1.0)
+
+    print(f"contencion: {hilos} hilos x {operaciones} operaciones, {proporcion_lecturas:.0%} lecturas")
+    for etiqueta, inventario in (("cerrojo global", global_), ("16 franjas", concurrente)):
+        ops: float = _operaciones_por_segundo(inventario, hilos, operaciones, nombres, proporcion_lecturas)
+        print(f"  {etiqueta:<16} {ops:>12,.0f} ops/s")
+
+
+def bytes_por_elemento(elementos: int = 200000) -> None:
+    """
+    Memoria que ocupa cada elemento en cada implementación (nodos o arrays, valores,
+    índice), sin contar las cadenas de los nombres, que se crean antes de medir.
+    """
+    nombres: list[str] = [f"sku{i:07d}" for i in range(elementos)]
+    clases = (
+        ("enlazado", inventarioEnlazado.Inventario),
+        ("contiguo", inventario_contiguo.Inventario),
+        ("contiguo compacto", lambda: inventario_contiguo.Inventario(compacto=True)),
+    )
+
+    print(f"bytes_por_elemento: {elementos} elementos")
+    for etiqueta, clase in clases:
+        gc.collect()
+        tracemalloc.start()
+        inventario = clase()
+        for i, nombre in enumerate(nombres):
+            inventario.agregar(nombre, i + 0.5)
+        memoria, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {etiqueta:<18} {memoria / elementos:>8.1f} B/elemento")
+        del inventario
+
+
+def _posicion_media(inventario, nombres: list[str]) -> float:
+    """Posición media en la cadena (recorriendo desde el principio) de los nombres dados."""
+    buscados: set[str] = set(nombres)
+    posiciones: list[int] = [i for i, nombre in enumerate(inventario) if nombre in buscados]
+    return sum(posiciones) / len(posiciones)
+
+
+def zipf(elementos: int = 20000, consultas: int = 200000, exponente: float = 1.1, calientes: int = 100) -> None:
+    """
+    Consultas con popularidad de Zipf sobre el inventario enlazado con cada política
+    de reorganización: operaciones por segundo y posición media en la cadena de los
+    nombres más consultados (lo que cuesta llegar a ellos recorriendo).
+    """
+    nombres: list[str] = [f"sku{i}" for i in range(elementos)]
+    aleatorio = random.Random(0)
+    # El nombre de rango k se consulta con probabilidad proporcional a 1 / k^exponente
+    populares: list[str] = nombres[:]
+    aleatorio.shuffle(populares)
+    pesos: list[float] = [1 / (k + 1) ** exponente for k in range(elementos)]
+    secuencia: list[str] = aleatorio.choices(populares, weights=pesos, k=consultas)
+
+    print(f"zipf: {elementos} elementos, {consultas} consultas, exponente {exponente}")
+    politicas = (("sin política", None),
+                 ("mover al frente", inventarioEnlazado.Inventario.MOVER_AL_FRENTE),
+                 ("transponer", inventarioEnlazado.Inventario.TRANSPONER))
+    for etiqueta, politica in politicas:
+        inventario = inventarioEnlazado.Inventario(politica)
+        inventario.agregar_lote((nombre, 1.0) for nombre in nombres)
+
+        inicio: float = time.perf_counter()
+        for nombre in secuencia:
+            inventario.consultar(nombre)
+        ops: float = consultas / (time.perf_counter() - inicio)
+
+        posicion: float = _posicion_media(inventario, populares[:calientes])
+        print(f"  {etiqueta:<16} {ops:>12,.0f} ops/s   posición media de los {calientes} más consultados: {posicion:,.0f}")
+
+
+BANCOS = {
+    "contencion": contencion,
+    "bytes_por_elemento": bytes_por_elemento,
+    "zipf": zipf,
+}
+
+if __name__ == "__main__":
+    for nombre in sys.argv[1:] or BANCOS:
+        BANCOS[nombre]()
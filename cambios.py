@@ -0,0 +1,229 @@
+"""
+Flujo de cambios (change data capture) de un Inventario, para mantener réplicas
+al día sin volver a enviar el CSV entero.
+
+Cada modificación emite un Cambio numerado a los sumideros suscritos con
+Inventario.suscribir: un anillo en memoria, un archivo o cualquier flujo de
+texto abierto para escribir (una tubería, la entrada de un subproceso, un
+socket). Una Replica aplica esos cambios, en orden, sobre otro Inventario.
+
+En archivos y tuberías cada cambio es una fila CSV con las mismas operaciones
+que el diario:
+
+    secuencia,=,nombre,valor,delta    nombre pasa a valer valor (delta = valor - anterior)
+    secuencia,-,nombre,,delta         nombre se elimina (delta = -anterior)
+    secuencia,*,,,                    el inventario se vacía
+"""
+import csv
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, TextIO
+
+from diario import Diario
+
+
+class Cambio(NamedTuple):
+    secuencia: int
+    operacion: str
+    nombre: str | None = None
+    valor: float | None = None
+    delta: float | None = None
+
+
+class CambiosPerdidos(ValueError):
+    """Faltan cambios entre la última secuencia aplicada y los recibidos."""
+
+
+class FlujoCambios:
+    """Numera los cambios de un inventario y los reparte entre sus sumideros."""
+
+    def __init__(self):
+        self._secuencia: int = 0
+        self._sumideros: list = []
+        # Sumideros que fallaron al recibir un cambio, con su excepción; ya no reciben más
+        self._fallidos: list[tuple[object, Exception]] = []
+
+    def get_secuencia(self) -> int:
+        """Secuencia del último cambio emitido (0 si aún no hay ninguno)."""
+        return self._secuencia
+
+    def get_fallidos(self) -> list[tuple[object, Exception]]:
+        return list(self._fallidos)
+
+    def _quitar_fallido(self, sumidero) -> bool:
+        for i, (fallido, _) in enumerate(self._fallidos):
+            if fallido is sumidero:
+                del self._fallidos[i]
+                return True
+        return False
+
+    def suscribir(self, sumidero) -> None:
+        self._quitar_fallido(sumidero)
+        self._sumideros.append(sumidero)
+
+    def desuscribir(self, sumidero) -> None:
+        """Quita un sumidero suscrito o uno ya desconectado por fallar; ValueError si no es ninguno."""
+        if not self._quitar_fallido(sumidero):
+            self._sumideros.remove(sumidero)
+
+    def _emitir(self, operacion: str, nombre: str | None, valor: float | None, delta: float | None) -> None:
+        self._secuencia += 1
+        cambio: Cambio = Cambio(self._secuencia, operacion, nombre, valor, delta)
+        fallidos: list = []
+        for sumidero in self._sumideros:
+            # La modificación ya está aplicada: el error de un sumidero (una tubería rota,
+            # un disco lleno) no debe llegar a quien la pidió, que la reintentaría, ni
+            # impedir que el cambio llegue a los demás
+            try:
+                sumidero.recibir(cambio)
+            except Exception as e:
+                fallidos.append((sumidero, e))
+
+        if fallidos:
+            # Un sumidero desconectado ya tiene un hueco en la secuencia: sus réplicas
+            # han de resincronizarse, así que no se le envía nada más
+            self._fallidos.extend(fallidos)
+            self._sumideros = [s for s in self._sumideros if all(s is not f for f, _ in fallidos)]
+
+    def emitir(self, nombre: str, anterior: float | None, nuevo: float | None) -> None:
+        """Emite el paso de nombre de anterior a nuevo (None: no existía o se elimina)."""
+        delta: float = (0.0 if nuevo is None else float(nuevo)) - (0.0 if anterior is None else float(anterior))
+        if nuevo is None:
+            self._emitir(Diario.BORRAR, nombre, None, delta)
+        else:
+            self._emitir(Diario.FIJAR, nombre, float(nuevo), delta)
+
+    def emitir_vaciado(self) -> None:
+        self._emitir(Diario.VACIAR, None, None, None)
+
+
+# ========================= SUMIDEROS =============================
+
+class SumideroAnillo:
+    """
+    Guarda en memoria los últimos capacidad cambios. Una réplica que lee con
+    desde() puede quedarse como mucho capacidad cambios por detrás; si se
+    retrasa más, desde() lanza CambiosPerdidos y hay que resincronizarla.
+    """
+
+    def __init__(self, capacidad: int = 4096):
+        if capacidad <= 0:
+            raise ValueError("La capacidad del anillo ha de ser mayor que 0.")
+        self._cambios: deque[Cambio] = deque(maxlen=capacidad)
+
+    def __len__(self) -> int:
+        return len(self._cambios)
+
+    def recibir(self, cambio: Cambio) -> None:
+        self._cambios.append(cambio)
+
+    def desde(self, secuencia: int) -> list[Cambio]:
+        """Cambios posteriores a secuencia, en orden."""
+        if not self._cambios or self._cambios[-1].secuencia <= secuencia:
+            return []
+
+        primera: int = self._cambios[0].secuencia
+        if primera > secuencia + 1:
+            raise CambiosPerdidos(f"El anillo ya no guarda los cambios {secuencia + 1} a {primera - 1}.")
+        # Las secuencias del anillo son consecutivas: el cambio secuencia + 1 está en la posición secuencia + 1 - primera
+        return list(islice(self._cambios, secuencia + 1 - primera, None))
+
+
+class SumideroFlujo:
+    """
+    Escribe cada cambio como una fila CSV en un flujo de texto ya abierto (una
+    tubería, la entrada de un subproceso...) y lo vuelca en cuanto lo escribe.
+    El flujo es de quien lo abrió: cerrar() no lo cierra.
+    """
+
+    def __init__(self, flujo: TextIO):
+        self._flujo: TextIO = flujo
+        self._escritor = csv.writer(flujo)
+
+    def recibir(self, cambio: Cambio) -> None:
+        self._escritor.writerow(codificar(cambio))
+        self._flujo.flush()
+
+    def cerrar(self) -> None:
+        pass
+
+
+class SumideroArchivo(SumideroFlujo):
+    """SumideroFlujo sobre un archivo que abre (añadiendo al final) y cierra él mismo."""
+
+    def __init__(self, ruta: str):
+        super().__init__(open(ruta, "a", newline="", encoding="utf-8"))
+
+    def cerrar(self) -> None:
+        self._flujo.close()
+
+
+# ========================= FORMATO =============================
+
+def codificar(cambio: Cambio) -> list[str]:
+    """Fila CSV de un cambio."""
+    secuencia, operacion, nombre, valor, delta = cambio
+    return [str(secuencia), operacion,
+            "" if nombre is None else nombre,
+            "" if valor is None else repr(valor),
+            "" if delta is None else repr(delta)]
+
+
+def leer(flujo: Iterable[str]) -> Iterator[Cambio]:
+    """Recorre los cambios escritos por un SumideroFlujo o un SumideroArchivo."""
+    for fila in csv.reader(flujo):
+        if len(fila) != 5 or fila[1] not in (Diario.FIJAR, Diario.BORRAR, Diario.VACIAR):
+            raise ValueError(f"Fila incorrecta en el flujo de cambios: {fila}")
+        secuencia, operacion, nombre, valor, delta = fila
+        yield Cambio(int(secuencia), operacion,
+                     nombre if operacion != Diario.VACIAR else None,
+                     float(valor) if valor else None,
+                     float(delta) if delta else None)
+
+
+# ========================= RÉPLICA =============================
+
+class Replica:
+    """
+    Aplica sobre un inventario los cambios de otro, en orden de secuencia.
+    Los cambios ya aplicados se ignoran (se pueden volver a entregar sin
+    riesgo) y un hueco en la secuencia lanza CambiosPerdidos.
+
+    Para arrancar una réplica sin reaplicar todo el historial se parte de
+    una copia del original y de la secuencia que devolvió su suscribir.
+    """
+
+    def __init__(self, inventario, secuencia: int = 0):
+        self._inventario = inventario
+        self._secuencia: int = secuencia
+
+    def get_inventario(self):
+        return self._inventario
+
+    def get_secuencia(self) -> int:
+        """Secuencia del último cambio aplicado."""
+        return self._secuencia
+
+    def aplicar(self, cambios: Iterable[Cambio]) -> int:
+        """Aplica los cambios pendientes y devuelve cuántos ha aplicado."""
+        aplicados: int = 0
+        for cambio in cambios:
+            if cambio.secuencia <= self._secuencia:
+                continue
+            if cambio.secuencia != self._secuencia + 1:
+                raise CambiosPerdidos(f"Se esperaba el cambio {self._secuencia + 1} y ha llegado el {cambio.secuencia}.")
+
+            if cambio.operacion == Diario.FIJAR:
+                self._inventario.fijar(cambio.nombre, cambio.valor)
+            elif cambio.operacion == Diario.BORRAR:
+                self._inventario.eliminar(cambio.nombre, self._inventario.consultar(cambio.nombre))
+            else:
+                self._inventario.vaciar()
+
+            self._secuencia = cambio.secuencia
+            aplicados += 1
+        return aplicados
+
+    def seguir(self, anillo: SumideroAnillo) -> int:
+        """Aplica los cambios del anillo posteriores a los ya aplicados."""
+        return self.aplicar(anillo.desde(self._secuencia))
@@ -0,0 +1,72 @@
+"""
+Carga en paralelo de muchos archivos CSV en un único Inventario.
+
+Cada archivo se lee en un proceso del pool como inventario parcial, y los
+parciales se combinan por parejas con fusionar (reducción en árbol) hasta
+quedar uno. Entre procesos los inventarios viajan en forma de columnas
+(lista de nombres + bytes de los valores float64), no como objetos Inventario.
+"""
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import inventario_contiguo
+
+# Forma columnar de un inventario: nombres y sus valores empaquetados en float64
+Columnas = tuple[list[str], bytes]
+
+
+def _a_columnas(inventario) -> Columnas:
+    nombres: list[str] = []
+    valores: array = array('d')
+    for nombre, valor in inventario._pares():
+        nombres.append(nombre)
+        valores.append(valor)
+    return nombres, valores.tobytes()
+
+
+def _desde_columnas(clase, columnas: Columnas):
+    nombres, datos = columnas
+    valores: array = array('d')
+    valores.frombytes(datos)
+
+    inventario = clase()
+    inventario.agregar_lote(zip(nombres, valores))
+    return inventario
+
+
+def _cargar(clase, ruta: str) -> Columnas:
+    inventario = clase()
+    inventario.cargar(ruta)
+    return _a_columnas(inventario)
+
+
+def _fusionar(clase, izquierda: Columnas, derecha: Columnas) -> Columnas:
+    inventario = _desde_columnas(clase, izquierda)
+    inventario.fusionar(_desde_columnas(clase, derecha))
+    return _a_columnas(inventario)
+
+
+def cargar_muchos(rutas, workers: int = None, clase=inventario_contiguo.Inventario):
+    """
+    Carga todos los archivos CSV de rutas en un nuevo inventario de la clase indicada
+    (de cualquiera de los dos módulos), usando un pool de workers procesos.
+
+    Cada archivo se valida con el cargar de esa clase; si alguno falla se propaga
+    su InventarioError.
+    """
+    rutas = list(rutas)
+    if not rutas:
+        return clase()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parciales: list[Columnas] = list(pool.map(_cargar, repeat(clase), rutas))
+
+        # Reducción en árbol: cada nivel fusiona los parciales por parejas en paralelo
+        while len(parciales) > 1:
+            fusionados: list[Columnas] = list(pool.map(_fusionar, repeat(clase), parciales[0::2], parciales[1::2]))
+            if len(parciales) % 2 == 1:
+                fusionados.append(parciales[-1])
+            parciales = fusionados
+
+    return _desde_columnas(clase, parciales[0])
@@ -0,0 +1,133 @@
+"""
+Diario de cambios (write-ahead log): cada modificación de un Inventario con
+abrir_diario se añade al disco en cuanto ocurre, sin reescribir el CSV entero.
+
+El estado en disco es una instantánea CSV (el mismo formato que guardar)
+más un diario junto a ella, en ruta + ".log", con una fila por cambio:
+
+    =,nombre,valor    el elemento pasa a valer valor (alta o modificación)
+    -,nombre          el elemento se elimina
+    *                 el inventario se vacía
+"""
+import csv
+import io
+import os
+from typing import Iterable, Iterator
+
+
+class Diario:
+    """Registro append-only de los cambios de un inventario."""
+
+    FIJAR: str = "="
+    BORRAR: str = "-"
+    VACIAR: str = "*"
+
+    _EXTENSION: str = ".log"
+
+    _BLOQUE_LECTURA: int = 64 * 1024
+
+    def __init__(self, ruta_instantanea: str):
+        self._ruta_instantanea: str = ruta_instantanea
+        # Antes de añadir se quita la fila a medias que pueda haber dejado una caída:
+        # si no, la siguiente fila quedaría pegada a ella y el diario ya no se podría leer
+        Diario._recortar_fila_incompleta(Diario.ruta_log(ruta_instantanea))
+        self._archivo = open(Diario.ruta_log(ruta_instantanea), "a", newline="", encoding="utf-8")
+        self._escritor = csv.writer(self._archivo)
+
+    @staticmethod
+    def ruta_log(ruta_instantanea: str) -> str:
+        """Ruta del diario asociado a una instantánea."""
+        return ruta_instantanea + Diario._EXTENSION
+
+    def get_ruta_instantanea(self) -> str:
+        return self._ruta_instantanea
+
+    @staticmethod
+    def _recortar_fila_incompleta(ruta_log: str) -> None:
+        """Trunca el diario en disco justo después de su último salto de línea."""
+        try:
+            archivo = open(ruta_log, "r+b")
+        except FileNotFoundError:
+            return
+
+        with archivo:
+            longitud: int = archivo.seek(0, os.SEEK_END)
+            fin: int = longitud
+            # Se busca el último salto de línea leyendo bloques desde el final
+            while fin > 0:
+                inicio: int = max(0, fin - Diario._BLOQUE_LECTURA)
+                archivo.seek(inicio)
+                salto: int = archivo.read(fin - inicio).rfind(b"\n")
+                if salto != -1:
+                    fin = inicio + salto + 1
+                    break
+                fin = inicio
+
+            if fin < longitud:
+                archivo.truncate(fin)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+
+    # ========================= ESCRITURA =============================
+
+    def _escribir(self, fila: list) -> None:
+        # Cada fila se vuelca al sistema en cuanto se escribe
+        self._escritor.writerow(fila)
+        self._archivo.flush()
+
+    def anotar(self, nombre: str, valor: float | None) -> None:
+        """Anota el nuevo valor de nombre, o su eliminación si valor es None."""
+        if valor is None:
+            self._escribir([Diario.BORRAR, nombre])
+        else:
+            self._escribir([Diario.FIJAR, nombre, repr(float(valor))])
+
+    def anotar_vaciado(self) -> None:
+        self._escribir([Diario.VACIAR])
+
+    def compactar(self, pares: Iterable[tuple[str, float]]) -> None:
+        """
+        Escribe una instantánea nueva con los pares dados y vacía el diario.
+        La instantánea se escribe en un temporal y se sustituye de forma atómica.
+        """
+        temporal: str = self._ruta_instantanea + ".tmp"
+        with open(temporal, "w", newline="", encoding="utf-8") as archivo:
+            writer = csv.writer(archivo)
+            for nombre, valor in pares:
+                writer.writerow([nombre, repr(float(valor))])
+            archivo.flush()
+            os.fsync(archivo.fileno())
+
+        os.replace(temporal, self._ruta_instantanea)
+        self._archivo.truncate(0)
+
+    def cerrar(self) -> None:
+        self._archivo.close()
+
+    # ========================= LECTURA =============================
+
+    @staticmethod
+    def leer(ruta_instantanea: str) -> Iterator[tuple[str, str | None, float | None]]:
+        """
+        Recorre los cambios anotados como tuplas (operacion, nombre, valor).
+        Si el diario no existe no hay cambios. Una última fila sin terminar
+        (escritura interrumpida) se descarta.
+        """
+        try:
+            with open(Diario.ruta_log(ruta_instantanea), "r", newline="", encoding="utf-8") as archivo:
+                contenido: str = archivo.read()
+        except FileNotFoundError:
+            return
+
+        if not contenido.endswith("\n"):
+            contenido = contenido[:contenido.rfind("\n") + 1]
+
+        for fila in csv.reader(io.StringIO(contenido, newline="")):
+            if fila == [Diario.VACIAR]:
+                yield Diario.VACIAR, None, None
+            elif len(fila) == 2 and fila[0] == Diario.BORRAR:
+                yield Diario.BORRAR, fila[1], None
+            elif len(fila) == 3 and fila[0] == Diario.FIJAR:
+                yield Diario.FIJAR, fila[1], float(fila[2])
+            else:
+                raise ValueError(f"Fila incorrecta en el diario: {fila}")
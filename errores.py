@@ -0,0 +1,15 @@
+"""
+Excepción común a todos los módulos del inventario: las dos implementaciones y
+los envoltorios (mapeado, particionado, concurrente, servicio). Cada módulo la
+reexporta como su InventarioError, de modo que capturar la de uno de ellos
+captura también los errores de los demás.
+"""
+
+
+class InventarioError(Exception):
+    def __init__(self, msg = "%ERR%. Se ha producido un error en el inventario"):
+        super().__init__(msg)
+        self._msg = msg
+
+    def __str__(self):
+        return self._msg
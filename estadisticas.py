@@ -0,0 +1,176 @@
+"""
+Agregados que cada Inventario mantiene al modificarse, para que cantidad_total,
+maximo, minimo y top no recorran todos los elementos en cada consulta.
+"""
+import heapq
+import math
+from typing import Callable, Iterable
+
+
+class Estadisticas:
+    """
+    Mantiene la suma de los valores con compensación de Neumaier y dos
+    montículos perezosos para el máximo y el mínimo.
+
+    Los montículos no se crean hasta la primera consulta de maximo/minimo.
+    Cada cambio de valor añade una entrada nueva y las antiguas se descartan
+    al consultar, comparándolas con el valor actual del inventario.
+    """
+
+    # Holgura antes de tirar los montículos por acumular entradas obsoletas
+    _HOLGURA_MONTICULOS: int = 64
+
+    def __init__(self):
+        self._suma: float = 0.0
+        self._compensacion: float = 0.0
+        self._elementos: int = 0
+        self._monticulo_max: list[tuple[float, str]] | None = None
+        self._monticulo_min: list[tuple[float, str]] | None = None
+
+    # ========================= ACTUALIZACIÓN =============================
+
+    def _sumar(self, delta: float) -> None:
+        """Suma compensada de Neumaier."""
+        t: float = self._suma + delta
+        if abs(self._suma) >= abs(delta):
+            self._compensacion += (self._suma - t) + delta
+        else:
+            self._compensacion += (delta - t) + self._suma
+        self._suma = t
+
+    def registrar(self, nombre: str, anterior: float | None, nuevo: float | None) -> None:
+        """
+        Registra que el valor de nombre pasa de anterior a nuevo.
+        None indica que el elemento no existía o que se ha eliminado.
+        """
+        if anterior is not None:
+            self._sumar(-anterior)
+        else:
+            self._elementos += 1
+
+        if nuevo is not None:
+            self._sumar(nuevo)
+        else:
+            self._elementos -= 1
+
+        if self._elementos == 0:
+            self.vaciar()
+            return
+
+        if self._monticulo_max is None:
+            return
+
+        if nuevo is not None:
+            heapq.heappush(self._monticulo_max, (-nuevo, nombre))
+            heapq.heappush(self._monticulo_min, (nuevo, nombre))
+
+        # Demasiadas entradas obsoletas: se reconstruirán en la próxima consulta
+        limite: int = 2 * self._elementos + Estadisticas._HOLGURA_MONTICULOS
+        if len(self._monticulo_max) > limite or len(self._monticulo_min) > limite:
+            self._monticulo_max = None
+            self._monticulo_min = None
+
+    def vaciar(self) -> None:
+        """Deja las estadísticas como las de un inventario vacío."""
+        self._suma = 0.0
+        self._compensacion = 0.0
+        self._elementos = 0
+        self._monticulo_max = None
+        self._monticulo_min = None
+
+    def copiar(self) -> 'Estadisticas':
+        """Devuelve una copia independiente de las estadísticas."""
+        copia: Estadisticas = Estadisticas()
+        copia._suma = self._suma
+        copia._compensacion = self._compensacion
+        copia._elementos = self._elementos
+        if self._monticulo_max is not None:
+            copia._monticulo_max = list(self._monticulo_max)
+            copia._monticulo_min = list(self._monticulo_min)
+        return copia
+
+    # ========================= CONSULTAS =============================
+
+    def total(self) -> float:
+        """Suma de todos los valores registrados."""
+        return self._suma + self._compensacion
+
+    def monticulos_construidos(self) -> bool:
+        """Indica si maximo/minimo responderán desde los montículos sin reconstruirlos."""
+        return self._monticulo_max is not None
+
+    def _construir(self, pares: Callable[[], Iterable[tuple[str, float]]]) -> None:
+        """Reconstruye los montículos (y la suma, exacta con fsum) desde cero."""
+        self._monticulo_max = []
+        self._monticulo_min = []
+        for nombre, valor in pares():
+            self._monticulo_max.append((-valor, nombre))
+            self._monticulo_min.append((valor, nombre))
+
+        heapq.heapify(self._monticulo_max)
+        heapq.heapify(self._monticulo_min)
+        self._suma = math.fsum(valor for valor, _ in self._monticulo_min)
+        self._compensacion = 0.0
+
+    @staticmethod
+    def _cima(monticulo: list[tuple[float, str]], signo: int,
+              consultar: Callable[[str], float]) -> str | None:
+        """Descarta las entradas obsoletas de la cima y devuelve el nombre válido."""
+        while monticulo:
+            valor, nombre = monticulo[0]
+            if consultar(nombre) == signo * valor:
+                return nombre
+            heapq.heappop(monticulo)
+        return None
+
+    def maximo(self, consultar: Callable[[str], float],
+               pares: Callable[[], Iterable[tuple[str, float]]]) -> str | None:
+        """
+        Nombre con el valor más alto, o None si no hay elementos.
+        consultar devuelve el valor actual de un nombre (0.0 si no existe) y
+        pares recorre los (nombre, valor) del inventario si hay que reconstruir.
+        """
+        if self._monticulo_max is None:
+            self._construir(pares)
+        return Estadisticas._cima(self._monticulo_max, -1, consultar)
+
+    def minimo(self, consultar: Callable[[str], float],
+               pares: Callable[[], Iterable[tuple[str, float]]]) -> str | None:
+        """Nombre con el valor más bajo, o None si no hay elementos."""
+        if self._monticulo_min is None:
+            self._construir(pares)
+        return Estadisticas._cima(self._monticulo_min, 1, consultar)
+
+    def primeros(self, k: int, descendente: bool, consultar: Callable[[str], float],
+                 pares: Callable[[], Iterable[tuple[str, float]]]) -> list[tuple[str, float]]:
+        """
+        Los k pares (nombre, valor) de mayor valor (o de menor si descendente es False).
+
+        Recorre el montículo correspondiente en orden sin modificarlo, con una
+        frontera acotada de candidatos, así que cuesta O(k log k) más las entradas
+        obsoletas que encuentre por el camino.
+        """
+        if descendente:
+            if self._monticulo_max is None:
+                self._construir(pares)
+            monticulo, signo = self._monticulo_max, -1
+        else:
+            if self._monticulo_min is None:
+                self._construir(pares)
+            monticulo, signo = self._monticulo_min, 1
+
+        resultado: list[tuple[str, float]] = []
+        vistos: set[str] = set()
+        frontera: list[tuple[tuple[float, str], int]] = [(monticulo[0], 0)] if monticulo else []
+
+        while frontera and len(resultado) < k:
+            (valor, nombre), i = heapq.heappop(frontera)
+            if nombre not in vistos and consultar(nombre) == signo * valor:
+                vistos.add(nombre)
+                resultado.append((nombre, signo * valor))
+
+            for hijo in (2 * i + 1, 2 * i + 2):
+                if hijo < len(monticulo):
+                    heapq.heappush(frontera, (monticulo[hijo], hijo))
+
+        return resultado
@@ -0,0 +1,122 @@
+"""
+Formato binario versionado de guardar_binario y cargar_binario, que es también
+el archivo que InventarioMapeado abre con mmap.
+
+Disposición del archivo (todo en little-endian):
+
+    cabecera   "INVB", versión (u16), banderas (u16), número de elementos n (u64)
+    valores    n float64 empaquetados, en el mismo orden que los nombres
+    índice     n + 1 u64 con el desplazamiento de cada nombre dentro de la tabla
+    tabla      por cada nombre: longitud en bytes (u32) + nombre en UTF-8
+
+La columna de valores se lee de una sola vez, y el índice permite saltar a
+cualquier nombre sin recorrer la tabla. Si la bandera ORDENADO está activa,
+los nombres están ordenados por sus bytes UTF-8 (lo que permite búsqueda binaria).
+"""
+from array import array
+import struct
+import sys
+from typing import Iterable
+
+MAGICO: bytes = b"INVB"
+VERSION: int = 1
+
+# Banderas de la cabecera
+ORDENADO: int = 1
+
+CABECERA = struct.Struct("<4sHHQ")
+LONGITUD_NOMBRE = struct.Struct("<I")
+DESPLAZAMIENTO = struct.Struct("<Q")
+
+_LITTLE_ENDIAN: bool = sys.byteorder == "little"
+
+
+def desplazamientos(n: int) -> tuple[int, int, int]:
+    """Posiciones de la columna de valores, del índice y de la tabla de nombres."""
+    inicio_valores: int = CABECERA.size
+    inicio_indice: int = inicio_valores + 8 * n
+    inicio_tabla: int = inicio_indice + 8 * (n + 1)
+    return inicio_valores, inicio_indice, inicio_tabla
+
+
+def leer_cabecera(datos: bytes) -> tuple[int, int]:
+    """Valida la cabecera y devuelve (banderas, n)."""
+    if len(datos) < CABECERA.size:
+        raise ValueError("El archivo es demasiado corto para ser un inventario binario.")
+
+    magico, version, banderas, n = CABECERA.unpack_from(datos, 0)
+    if magico != MAGICO:
+        raise ValueError("El archivo no es un inventario binario.")
+    if version != VERSION:
+        raise ValueError(f"Versión de inventario binario no soportada: {version}")
+
+    return banderas, n
+
+
+def comprobar_tamano(datos: bytes, n: int) -> None:
+    """
+    Comprueba que datos, el archivo entero, mide lo que indican la cabecera (n) y
+    el último desplazamiento del índice. Lanza ValueError si está truncado o sobra algo.
+    """
+    _, _, inicio_tabla = desplazamientos(n)
+    if len(datos) < inicio_tabla:
+        raise ValueError("El inventario binario está truncado: faltan valores o parte del índice.")
+
+    fin_tabla: int = inicio_tabla + DESPLAZAMIENTO.unpack_from(datos, inicio_tabla - DESPLAZAMIENTO.size)[0]
+    if len(datos) != fin_tabla:
+        raise ValueError("La tabla de nombres del inventario binario está incompleta.")
+
+
+def escribir(ruta: str, pares: Iterable[tuple[str, float]], ordenado: bool = False) -> None:
+    """Escribe los pares (nombre, valor) en ruta con el formato binario."""
+    if ordenado:
+        pares = sorted(pares, key=lambda par: par[0])
+
+    valores: array = array('d')
+    indice: array = array('Q', [0])
+    entradas: list[bytes] = []
+    tamano_tabla: int = 0
+
+    for nombre, valor in pares:
+        codificado: bytes = nombre.encode("utf-8")
+        entradas.append(LONGITUD_NOMBRE.pack(len(codificado)))
+        entradas.append(codificado)
+        tamano_tabla += LONGITUD_NOMBRE.size + len(codificado)
+        indice.append(tamano_tabla)
+        valores.append(valor)
+
+    if not _LITTLE_ENDIAN:
+        valores.byteswap()
+        indice.byteswap()
+
+    with open(ruta, "wb") as archivo:
+        archivo.write(CABECERA.pack(MAGICO, VERSION, ORDENADO if ordenado else 0, len(valores)))
+        archivo.write(valores.tobytes())
+        archivo.write(indice.tobytes())
+        archivo.write(b"".join(entradas))
+
+
+def leer(ruta: str) -> tuple[list[str], array]:
+    """Lee un inventario binario y devuelve sus nombres y su columna de valores."""
+    with open(ruta, "rb") as archivo:
+        _, n = leer_cabecera(archivo.read(CABECERA.size))
+
+        # Columna de valores e índice: una lectura en bloque cada uno
+        valores: array = array('d')
+        valores.fromfile(archivo, n)
+        indice: array = array('Q')
+        indice.fromfile(archivo, n + 1)
+        tabla: bytes = archivo.read()
+
+    if not _LITTLE_ENDIAN:
+        valores.byteswap()
+        indice.byteswap()
+
+    if len(tabla) != indice[n]:
+        raise ValueError("La tabla de nombres del inventario binario está incompleta.")
+
+    nombres: list[str] = [
+        tabla[indice[i] + LONGITUD_NOMBRE.size:indice[i + 1]].decode("utf-8")
+        for i in range(n)
+    ]
+    return nombres, valores
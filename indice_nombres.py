@@ -0,0 +1,39 @@
+"""
+Nombres en orden alfabético para buscar_prefijo y cantidad_total(prefijo):
+autocompletado y totales de nombres jerárquicos como fruta/manzana/golden.
+"""
+from typing import Iterator
+
+from lista_ordenada import ListaOrdenada
+
+
+class IndiceNombres:
+    """
+    Nombres en una ListaOrdenada. Como el prefijo de longitud fija de un nombre
+    crece con el orden de los nombres, los que empiezan por un prefijo forman
+    un tramo contiguo que se localiza con dos búsquedas binarias: recorrer los
+    k nombres de un prefijo cuesta O(log n + k).
+    """
+
+    def __init__(self, nombres=()):
+        self._nombres: ListaOrdenada = ListaOrdenada(nombres)
+
+    def __len__(self) -> int:
+        return len(self._nombres)
+
+    def registrar(self, nombre: str, anterior: float | None, nuevo: float | None) -> None:
+        """
+        Registra que el valor de nombre pasa de anterior a nuevo; sólo importan las
+        altas (anterior None) y las bajas (nuevo None).
+        """
+        if anterior is None and nuevo is not None:
+            self._nombres.insertar(nombre)
+        elif anterior is not None and nuevo is None:
+            self._nombres.quitar(nombre)
+
+    def con_prefijo(self, prefijo: str) -> Iterator[str]:
+        """Recorre en orden alfabético los nombres que empiezan por prefijo."""
+        longitud: int = len(prefijo)
+        inicio = self._nombres.primera_no_menor(prefijo)
+        fin = self._nombres.primera_mayor(prefijo, key=lambda nombre: nombre[:longitud])
+        return self._nombres.entre(inicio, fin)
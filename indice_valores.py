@@ -0,0 +1,62 @@
+"""
+Índice secundario ordenado por valor para las consultas por rango de valores
+(rango, contar_rango) y la vista por_valor.
+"""
+from operator import itemgetter
+from typing import Iterable, Iterator
+
+from lista_ordenada import ListaOrdenada, Posicion
+
+# Las claves son (valor, nombre): únicas, porque los nombres lo son
+_VALOR = itemgetter(0)
+
+
+class IndiceValores:
+    """
+    Claves (valor, nombre) en una ListaOrdenada; a igualdad de valor, las claves
+    se ordenan por nombre.
+
+    Registrar un cambio cuesta O(log n + _CARGA), y recorrer las k claves de
+    un rango cuesta O(log n + k).
+    """
+
+    def __init__(self, pares: Iterable[tuple[str, float]] = ()):
+        self._claves: ListaOrdenada = ListaOrdenada((float(valor), nombre) for nombre, valor in pares)
+
+    def __len__(self) -> int:
+        return len(self._claves)
+
+    # ========================= ACTUALIZACIÓN =============================
+
+    def registrar(self, nombre: str, anterior: float | None, nuevo: float | None) -> None:
+        """
+        Registra que el valor de nombre pasa de anterior a nuevo.
+        None indica que el elemento no existía o que se ha eliminado.
+        """
+        if anterior is not None:
+            self._claves.quitar((float(anterior), nombre))
+        if nuevo is not None:
+            self._claves.insertar((float(nuevo), nombre))
+
+    # ========================= CONSULTAS =============================
+
+    def _tramo(self, valor_minimo: float, valor_maximo: float) -> tuple[Posicion, Posicion]:
+        """Posiciones [inicio, fin) de las claves con valor_minimo <= valor <= valor_maximo."""
+        # (valor_minimo,) va delante de cualquier (valor_minimo, nombre)
+        return (self._claves.primera_no_menor((valor_minimo,)),
+                self._claves.primera_mayor(valor_maximo, key=_VALOR))
+
+    def rango(self, valor_minimo: float, valor_maximo: float) -> Iterator[tuple[str, float]]:
+        """Recorre en orden los pares (nombre, valor) con valor_minimo <= valor <= valor_maximo."""
+        for valor, nombre in self._claves.entre(*self._tramo(valor_minimo, valor_maximo)):
+            yield nombre, valor
+
+    def contar(self, valor_minimo: float, valor_maximo: float) -> int:
+        """Número de claves con valor_minimo <= valor <= valor_maximo, sin recorrerlas."""
+        return self._claves.contar_entre(*self._tramo(valor_minimo, valor_maximo))
+
+    def recorrer(self, descendente: bool = False) -> Iterator[tuple[str, float]]:
+        """Recorre todos los pares (nombre, valor) en orden de valor."""
+        claves = reversed(self._claves) if descendente else iter(self._claves)
+        for valor, nombre in claves:
+            yield nombre, valor
@@ -5,20 +5,34 @@ TECNOLOGÍA DE LA PROGRAMACIÓN UNIVERSIDAD DE MURCIA
 2º DTIE MATEMÁTICAS Y FÍSICA CURSO 2025/6
 """
 import csv
-
-class InventarioError(Exception):
-    def __init__(self, mensaje: str):
-        super().__init__(mensaje)
-
+from itertools import islice
+import math
+import os
+import time
+
+from cambios import FlujoCambios
+from diario import Diario
+from errores import InventarioError
+from estadisticas import Estadisticas
+import formato_binario
+from indice_nombres import IndiceNombres
+from indice_valores import IndiceValores
+from vistas import Vista
 
 class Inventario:
 
     class Nodo:
+        # Sin __dict__ por instancia: con millones de nodos es la mayor parte de la memoria
+        __slots__ = ("_nombre", "_valor", "_siguiente", "_anterior")
+
         # CORRECCIÓN SINTAXIS: El valor por defecto va después del tipo (siguiente: Tipo = None)
-        def __init__(self, nombre: str, valor: float, siguiente: 'Inventario.Nodo' = None):
+        def __init__(self, nombre: str, valor: float, siguiente: 'Inventario.Nodo' = None,
+                     anterior: 'Inventario.Nodo' = None):
             self._nombre: str = nombre
             self._valor: float = valor
             self._siguiente: 'Inventario.Nodo' = siguiente
+            # Enlace hacia atrás para poder desenlazar un nodo sin recorrer la lista
+            self._anterior: 'Inventario.Nodo' = anterior
 
         def __str__(self) -> str:
             return f"[{self.get_nombre()} : {self.get_valor()}]"
@@ -45,19 +59,75 @@ class Inventario:
         def get_siguiente(self) -> 'Inventario.Nodo':
             return self._siguiente
 
+        def get_anterior(self) -> 'Inventario.Nodo':
+            return self._anterior
+
+        def set_nombre(self, nombre: str):
+            self._nombre = nombre
+
         def set_valor(self, nuevo_valor: float):
             self._valor = nuevo_valor
 
         def set_siguiente(self, siguiente: 'Inventario.Nodo'):
             self._siguiente = siguiente
 
+        def set_anterior(self, anterior: 'Inventario.Nodo'):
+            self._anterior = anterior
+
+
+    # Partes que copiar() comparte: la cadena (con su índice) y las estadísticas
+    _PARTES: tuple[str, ...] = ("_cadena", "_estadisticas")
+
+    # Nodos liberados que se guardan para reutilizar (el resto se deja al recolector)
+    _MAXIMO_NODOS_LIBRES: int = 4096
+
+    # Políticas de autoorganización de la cadena al buscar un nombre
+    MOVER_AL_FRENTE: str = "mover_al_frente"
+    TRANSPONER: str = "transponer"
+    _POLITICAS: tuple[str, ...] = (MOVER_AL_FRENTE, TRANSPONER)
 
     # ========================= CONSTRUCTOR =============================
 
-    def __init__(self):
-        """Constructor: Crea un nuevo inventario, inicialmente vacío."""
+    def __init__(self, politica: str = None):
+        """
+        Constructor: Crea un nuevo inventario, inicialmente vacío.
+        Con politica=Inventario.MOVER_AL_FRENTE cada nodo encontrado pasa al principio
+        de la cadena, y con Inventario.TRANSPONER avanza una posición; así los nombres
+        más buscados quedan al principio del recorrido. Por defecto no se reordena.
+
+        La política sólo cambia el orden de recorrido (iterar, items, guardar...): las
+        búsquedas por nombre ya van por el índice en O(1) y no se aceleran. A cambio,
+        cada consulta también modifica la cadena y cuesta unas 3-4 veces más
+        (benchmarks.zipf). No se reordena durante un recorrido ni mientras la cadena
+        se comparta con una copia (ver copiar).
+        """
+        if politica is not None and politica not in Inventario._POLITICAS:
+            raise InventarioError(f"Política de reorganización desconocida: {politica}")
+
+        self._politica: str = politica
         self._primer_nodo: 'Inventario.Nodo' = None
         self._longitud: int = 0
+        # Índice nombre -> nodo, para no recorrer la cadena en cada consulta
+        self._indice: dict[str, 'Inventario.Nodo'] = {}
+        # Total, máximo y mínimo mantenidos en cada modificación
+        self._estadisticas: Estadisticas = Estadisticas()
+        # Índice ordenado por valor: se crea con la primera consulta por rango (y no se comparte con copias)
+        self._indice_valores: IndiceValores = None
+        # Índice de nombres ordenados para buscar por prefijo: se crea igual, con la primera búsqueda
+        self._indice_nombres: IndiceNombres = None
+        # Diario de cambios abierto con abrir_diario, o None
+        self._diario: Diario = None
+        # Flujo de cambios para réplicas, creado con la primera suscripción, o None
+        self._flujo_cambios: FlujoCambios = None
+        # Partes que son sólo de este inventario; las demás se comparten con copias
+        # (copy-on-write) y se copian antes de la primera escritura
+        self._partes_propias: set[str] = set(Inventario._PARTES)
+        # Lista libre: nodos retirados, encadenados por su enlace siguiente
+        self._nodos_libres: 'Inventario.Nodo' = None
+        self._num_nodos_libres: int = 0
+        # Recorridos en curso: mientras haya alguno la cadena no se reorganiza ni se
+        # reutilizan los nodos que se eliminen
+        self._recorridos_activos: int = 0
 
 
     # ========================= MÉTODOS MÁGICOS =============================
@@ -66,22 +136,11 @@ class Inventario:
         return self.total_items()
 
     def __iter__(self):
-        actual: 'Inventario.Nodo' = self._get_primer_nodo()
-        while actual is not None:
-            yield actual.get_nombre()
-            actual = actual.get_siguiente()
+        return (nodo.get_nombre() for nodo in self._nodos())
 
     def __str__(self) -> str:
-        msg: str = "\n\n################# INVENTARIO #################\n"
-        
-        pos = 0
-        actual = self._get_primer_nodo()
-        while actual is not None:
-            msg += f"\t{pos} - {actual}\n"
-            actual = actual.get_siguiente()
-            pos += 1
-            
-        return msg
+        cabecera: str = "\n\n################# INVENTARIO #################\n"
+        return cabecera + "".join(f"\t{pos} - {nodo}\n" for pos, nodo in enumerate(self._nodos()))
         
 
     # ========================= GETTERS Y SETTERS INTERNOS =============================
@@ -98,29 +157,233 @@ class Inventario:
     def _set_longitud(self, longitud: int):
         self._longitud = longitud
 
-    def _buscar_nodo(self, nombre: str) -> 'Inventario.Nodo':
-        """Dado el nombre de un nodo, lo busca y devuelve el nodo nombre:valor"""
+    def _get_indice(self) -> dict[str, 'Inventario.Nodo']:
+        return self._indice
+
+    def _set_indice(self, indice: dict[str, 'Inventario.Nodo']):
+        self._indice = indice
+
+    def _get_estadisticas(self) -> Estadisticas:
+        return self._estadisticas
+
+    def _set_estadisticas(self, estadisticas: Estadisticas):
+        self._estadisticas = estadisticas
+
+    def _get_diario(self) -> Diario:
+        return self._diario
+
+    def _set_diario(self, diario: Diario):
+        self._diario = diario
+
+    def _get_indice_valores(self) -> IndiceValores:
+        """Índice ordenado por valor, creado la primera vez que se necesita."""
+        if self._indice_valores is None:
+            self._indice_valores = IndiceValores(self._pares())
+        return self._indice_valores
+
+    def _get_indice_nombres(self) -> IndiceNombres:
+        """Índice de nombres ordenados, creado la primera vez que se necesita."""
+        if self._indice_nombres is None:
+            self._indice_nombres = IndiceNombres(self._get_indice())
+        return self._indice_nombres
+
+    def _get_partes_propias(self) -> set[str]:
+        return self._partes_propias
+
+    def _set_partes_propias(self, partes: set[str]):
+        self._partes_propias = partes
+
+    def _nuevo_nodo(self, nombre: str, valor: float, siguiente: 'Inventario.Nodo' = None,
+                    anterior: 'Inventario.Nodo' = None) -> 'Inventario.Nodo':
+        """Devuelve un nodo con los datos indicados, reutilizando uno de la lista libre si hay."""
+        nodo: 'Inventario.Nodo' = self._nodos_libres
+        if nodo is None:
+            return Inventario.Nodo(nombre, valor, siguiente, anterior)
+
+        self._nodos_libres = nodo.get_siguiente()
+        self._num_nodos_libres -= 1
+        nodo.set_nombre(nombre)
+        nodo.set_valor(valor)
+        nodo.set_siguiente(siguiente)
+        nodo.set_anterior(anterior)
+        return nodo
+
+    def _liberar_nodo(self, nodo: 'Inventario.Nodo') -> bool:
+        """
+        Guarda un nodo ya desenlazado en la lista libre. Sólo se llama con la cadena
+        propia (un nodo compartido con una copia no se puede reutilizar).
+        Devuelve False si la lista libre está llena.
+        """
+        if self._num_nodos_libres >= Inventario._MAXIMO_NODOS_LIBRES:
+            return False
+
+        nodo.set_nombre(None)
+        nodo.set_valor(0.0)
+        nodo.set_anterior(None)
+        nodo.set_siguiente(self._nodos_libres)
+        self._nodos_libres = nodo
+        self._num_nodos_libres += 1
+        return True
+
+    def _copiar_cadena(self) -> None:
+        """Sustituye la cadena y el índice por una copia nodo a nodo, en el mismo orden."""
+        indice: dict[str, 'Inventario.Nodo'] = {}
+        primer_nodo: 'Inventario.Nodo' = None
+        ultimo: 'Inventario.Nodo' = None
         actual = self._get_primer_nodo()
+
         while actual is not None:
-            if actual.get_nombre() == nombre:
-                return actual
+            # Enlazamos al final de la copia para conservar el orden original
+            nuevo_nodo: 'Inventario.Nodo' = self._nuevo_nodo(actual.get_nombre(), actual.get_valor(), None, ultimo)
+            if ultimo is None:
+                primer_nodo = nuevo_nodo
+            else:
+                ultimo.set_siguiente(nuevo_nodo)
+            indice[nuevo_nodo.get_nombre()] = nuevo_nodo
+            ultimo = nuevo_nodo
             actual = actual.get_siguiente()
-        return None
+
+        self._set_primer_nodo(primer_nodo)
+        self._set_indice(indice)
+
+    def _preparar_escritura(self, *partes: str) -> bool:
+        """
+        Copia las partes indicadas que aún se compartan con otro inventario, para
+        poder modificarlas. Devuelve True si ha copiado alguna (los nodos obtenidos
+        antes de la llamada ya no son los de este inventario).
+        """
+        propias: set[str] = self._get_partes_propias()
+        copiado: bool = False
+        for parte in partes:
+            if parte not in propias:
+                if parte == "_cadena":
+                    self._copiar_cadena()
+                else:
+                    self._set_estadisticas(self._get_estadisticas().copiar())
+                propias.add(parte)
+                copiado = True
+        return copiado
+
+    def _nodos(self):
+        """
+        Recorre los nodos siguiendo la cadena. Mientras dura el recorrido las
+        búsquedas no reordenan la cadena, aunque haya política, y se puede eliminar
+        el elemento actual sin cortar el recorrido.
+        """
+        self._recorridos_activos += 1
+        try:
+            actual: 'Inventario.Nodo' = self._get_primer_nodo()
+            while actual is not None:
+                yield actual
+                actual = actual.get_siguiente()
+        finally:
+            self._recorridos_activos -= 1
+
+    def _pares(self):
+        """Recorre los pares (nombre, valor) siguiendo la cadena."""
+        return ((nodo.get_nombre(), nodo.get_valor()) for nodo in self._nodos())
+
+    def _recorrer_valores(self):
+        return (nodo.get_valor() for nodo in self._nodos())
+
+    def _registrar_cambio(self, nombre: str, anterior: float | None, nuevo: float | None) -> None:
+        """
+        Punto único por el que pasan todas las modificaciones de un elemento.
+        None en anterior/nuevo indica que el elemento no existía o se ha eliminado.
+        """
+        self._preparar_escritura("_estadisticas")
+        self._get_estadisticas().registrar(nombre, anterior, nuevo)
+
+        if self._indice_valores is not None:
+            self._indice_valores.registrar(nombre, anterior, nuevo)
+        if self._indice_nombres is not None:
+            self._indice_nombres.registrar(nombre, anterior, nuevo)
+
+        if self._get_diario() is not None:
+            self._get_diario().anotar(nombre, nuevo)
+
+        if self._flujo_cambios is not None:
+            self._flujo_cambios.emitir(nombre, anterior, nuevo)
+
+    def _buscar_nodo(self, nombre: str) -> 'Inventario.Nodo':
+        """
+        Dado el nombre de un nodo, lo busca y devuelve el nodo nombre:valor.
+        Si hay política de reorganización, además adelanta el nodo en la cadena.
+        """
+        nodo: 'Inventario.Nodo' = self._get_indice().get(nombre)
+        if nodo is not None and self._politica is not None:
+            self._reorganizar(nodo)
+        return nodo
+
+    def _valor(self, nombre: str) -> float:
+        """Valor de nombre (0.0 si no existe) sin aplicar la política de reorganización."""
+        nodo: 'Inventario.Nodo' = self._get_indice().get(nombre)
+        if nodo is not None:
+            return nodo.get_valor()
+        return 0.0
+
+    def _reorganizar(self, nodo: 'Inventario.Nodo') -> None:
+        """
+        Adelanta el nodo según la política. No se hace durante un recorrido (el
+        iterador saltaría o repetiría nodos) ni si la cadena se comparte con una
+        copia (una lectura no debe pagar la copia de la cadena).
+        """
+        anterior: 'Inventario.Nodo' = nodo.get_anterior()
+        if anterior is None or self._recorridos_activos > 0 or "_cadena" not in self._get_partes_propias():
+            return
+
+        destino: 'Inventario.Nodo' = self._get_primer_nodo() if self._politica == Inventario.MOVER_AL_FRENTE else anterior
+
+        # Desenlazamos el nodo (no es el primero, así que tiene anterior)...
+        siguiente: 'Inventario.Nodo' = nodo.get_siguiente()
+        anterior.set_siguiente(siguiente)
+        if siguiente is not None:
+            siguiente.set_anterior(anterior)
+
+        # ... y lo enlazamos justo delante de destino
+        previo_destino: 'Inventario.Nodo' = destino.get_anterior()
+        nodo.set_anterior(previo_destino)
+        nodo.set_siguiente(destino)
+        destino.set_anterior(nodo)
+        if previo_destino is None:
+            self._set_primer_nodo(nodo)
+        else:
+            previo_destino.set_siguiente(nodo)
 
     def _get_nodo_previo(self, nodo: 'Inventario.Nodo') -> 'Inventario.Nodo':
         """
-        Busca y devuelve el nodo anterior al nodo proporcionado.
+        Devuelve el nodo anterior al nodo proporcionado.
         Si el nodo proporcionado es el primero o None, devuelve None.
         """
-        if nodo is None or nodo is self._get_primer_nodo():
+        if nodo is None:
             return None
+        return nodo.get_anterior()
 
-        nodo_anterior: 'Inventario.Nodo' = self._get_primer_nodo()
-        
-        while nodo_anterior is not None and nodo_anterior.get_siguiente() is not nodo:
-            nodo_anterior = nodo_anterior.get_siguiente()
-            
-        return nodo_anterior
+    def _desenlazar(self, nodo: 'Inventario.Nodo') -> None:
+        """
+        Saca el nodo de la cadena y del índice sin recorrer la lista.
+        La cadena ha de ser ya propia (_preparar_escritura).
+        """
+        nodo_anterior: 'Inventario.Nodo' = nodo.get_anterior()
+        nodo_siguiente: 'Inventario.Nodo' = nodo.get_siguiente()
+
+        if nodo_anterior is None:
+            self._set_primer_nodo(nodo_siguiente)
+        else:
+            nodo_anterior.set_siguiente(nodo_siguiente)
+
+        if nodo_siguiente is not None:
+            nodo_siguiente.set_anterior(nodo_anterior)
+
+        del self._get_indice()[nodo.get_nombre()]
+        self._set_longitud(self._get_longitud() - 1)
+        # Durante un recorrido el nodo conserva su enlace siguiente: el iterador
+        # puede estar en él y ha de poder continuar. Tampoco se reutiliza.
+        if self._recorridos_activos > 0:
+            return
+        if not self._liberar_nodo(nodo):
+            nodo.set_siguiente(None)
+            nodo.set_anterior(None)
 
 
     # ========================= MÉTODOS MODIFICADORES =============================
@@ -132,15 +395,27 @@ class Inventario:
         """
         if valor <= 0:
             raise InventarioError("No se puede agregar un valor menor o igual a 0.")
-        
+
+        self._agregar_validado(nombre, valor)
+
+    def _agregar_validado(self, nombre: str, valor: float) -> None:
+        """Lógica de agregar una vez comprobado que valor > 0."""
+        self._preparar_escritura("_cadena")
         nodo = self._buscar_nodo(nombre)
         if nodo is not None:
-            nodo.set_valor(nodo.get_valor() + valor)
+            anterior: float = nodo.get_valor()
+            nodo.set_valor(anterior + valor)
+            self._registrar_cambio(nombre, anterior, anterior + valor)
         else:
             # Inserta al principio de la lista
-            nuevo_nodo:'Inventario.Nodo' = Inventario.Nodo(nombre, valor, self._get_primer_nodo())
+            primer_nodo: 'Inventario.Nodo' = self._get_primer_nodo()
+            nuevo_nodo:'Inventario.Nodo' = self._nuevo_nodo(nombre, valor, primer_nodo)
+            if primer_nodo is not None:
+                primer_nodo.set_anterior(nuevo_nodo)
             self._set_primer_nodo(nuevo_nodo)
+            self._get_indice()[nombre] = nuevo_nodo
             self._longitud += 1
+            self._registrar_cambio(nombre, None, valor)
 
 
     def actualizar(self, nombre: str, nuevo_valor: float) -> None:
@@ -153,8 +428,19 @@ class Inventario:
         nodo = self._buscar_nodo(nombre)
         if nodo is None:
             raise InventarioError(f"El elemento '{nombre}' no existe para actualizar.")
-        
+
+        if self._preparar_escritura("_cadena"):
+            nodo = self._buscar_nodo(nombre)
+        anterior: float = nodo.get_valor()
         nodo.set_valor(nuevo_valor)
+        self._registrar_cambio(nombre, anterior, nuevo_valor)
+
+    def fijar(self, nombre: str, valor: float) -> None:
+        """Deja nombre con el valor indicado, exista o no (lo que aplican el diario y las réplicas)."""
+        if self.existe(nombre):
+            self.actualizar(nombre, valor)
+        else:
+            self.agregar(nombre, valor)
 
     def eliminar(self, nombre: str, cantidad: float = 1.0) -> None:
         """
@@ -167,62 +453,152 @@ class Inventario:
         
         if nodo_actual is None:
             raise InventarioError(f"El elemento '{nombre}' no existe para eliminar.")
-        
-        nuevo_valor = nodo_actual.get_valor() - cantidad
+
+        if self._preparar_escritura("_cadena"):
+            nodo_actual = self._buscar_nodo(nombre)
+        anterior: float = nodo_actual.get_valor()
+        nuevo_valor = anterior - cantidad
     
         if nuevo_valor > 0:
             nodo_actual.set_valor(nuevo_valor)
+            self._registrar_cambio(nombre, anterior, nuevo_valor)
         else:
-            nodo_anterior: 'Inventario.Nodo' = self._get_nodo_previo(nodo_actual)
-            
-            if nodo_actual is self._get_primer_nodo():
-                self._set_primer_nodo(nodo_actual.get_siguiente())         
-            elif nodo_anterior is not None:
-                nodo_anterior.set_siguiente(nodo_actual.get_siguiente())
-            
-            self._set_longitud(self._get_longitud() - 1)
+            self._desenlazar(nodo_actual)
+            self._registrar_cambio(nombre, anterior, None)
 
     def vaciar(self) -> None:
         """Elimina todos los elementos del inventario."""
+        # Los primeros nodos van a la lista libre, salvo si la cadena se comparte con una
+        # copia o hay un recorrido en curso (el iterador sigue por la cadena anterior)
+        if "_cadena" in self._get_partes_propias() and self._recorridos_activos == 0:
+            actual: 'Inventario.Nodo' = self._get_primer_nodo()
+            while actual is not None:
+                siguiente: 'Inventario.Nodo' = actual.get_siguiente()
+                if not self._liberar_nodo(actual):
+                    break
+                actual = siguiente
+
         self._set_primer_nodo(None)
+        # Un índice y unas estadísticas nuevos: no se tocan los que pueda compartir una copia
+        self._set_indice({})
+        self._set_estadisticas(Estadisticas())
+        self._set_partes_propias(set(Inventario._PARTES))
+        self._indice_valores = None
+        self._indice_nombres = None
         self._longitud = 0
 
-    def fusionar(self, otro: 'Inventario') -> None:
+        if self._get_diario() is not None:
+            self._get_diario().anotar_vaciado()
+
+        if self._flujo_cambios is not None:
+            self._flujo_cambios.emitir_vaciado()
+
+    def fusionar(self, otro) -> None:
         """
-        Modifica el inventario actual añadiendo los elementos del inventario 'otro'.
+        Modifica el inventario actual añadiendo los elementos de 'otro': un Inventario
+        de cualquiera de los dos módulos o cualquier iterable de pares (nombre, valor).
+        Se recorre 'otro' una sola vez y se aplica como un lote (todos o ninguno).
         """
-        if not isinstance(otro, Inventario):
-            raise InventarioError("El objeto a fusionar debe ser de tipo Inventario.")
-            
-        for nombre in otro:
-            valor_otro: float = otro.consultar(nombre)
-            self.agregar(nombre, valor_otro)
+        pares = otro._pares() if hasattr(otro, "_pares") else otro
+
+        try:
+            self.agregar_lote(pares)
+        except (TypeError, ValueError):
+            raise InventarioError("El objeto a fusionar debe ser un Inventario o un iterable de pares (nombre, valor).")
 
-    def diferencia(self, otro: 'Inventario') -> None:
+    def diferencia(self, otro) -> None:
         """
-        Resta al inventario actual los valores de los elementos contenidos en 'otro'.
+        Resta al inventario actual los valores de los elementos contenidos en 'otro'
+        (de cualquiera de los dos módulos); los que no estén aquí se ignoran.
         """
-        if not isinstance(otro, Inventario):
+        if not hasattr(otro, "_pares"):
             raise InventarioError("El objeto para la diferencia debe ser de tipo Inventario.")
-        
-        for nombre in list(otro): # Usamos list() para iterar sobre una copia de las claves
-            valor_otro: float = otro.consultar(nombre)
-            try:
-                self.eliminar(nombre, valor_otro)
-            except InventarioError as e:
-                if "no existe" not in str(e):
-                    raise e
-                pass
 
+        # Una pasada por 'otro' cruzándolo con el índice; los comunes se restan como un lote
+        indice: dict[str, 'Inventario.Nodo'] = self._get_indice()
+        self.eliminar_lote([(nombre, valor) for nombre, valor in otro._pares() if nombre in indice])
 
-    # ========================= MÉTODOS DE PERSISTENCIA =============================
 
-    def cargar(self, ruta: str) -> None:
+    # ========================= MODIFICADORES POR LOTES =============================
+
+    def agregar_lote(self, pares) -> None:
         """
-        Carga los elementos desde un archivo CSV y los fusiona con el inventario actual.
+        Agrega de una vez todos los pares (nombre, valor). Los nombres repetidos se
+        acumulan antes de aplicar el lote, y se valida entero antes de modificar nada.
+        """
+        lote: dict[str, float] = {}
+        for nombre, valor in pares:
+            if valor <= 0:
+                raise InventarioError("No se puede agregar un valor menor o igual a 0.")
+            lote[nombre] = lote.get(nombre, 0) + valor
+
+        for nombre, valor in lote.items():
+            self._agregar_validado(nombre, valor)
+
+    def _validar_actualizar_lote(self, pares) -> dict[str, float]:
+        """Valida un lote de actualizar_lote sin aplicarlo y lo devuelve agrupado por nombre."""
+        lote: dict[str, float] = {}
+        for nombre, nuevo_valor in pares:
+            if nuevo_valor <= 0:
+                raise InventarioError("El nuevo valor debe ser mayor que 0.")
+            if self._buscar_nodo(nombre) is None:
+                raise InventarioError(f"El elemento '{nombre}' no existe para actualizar.")
+            lote[nombre] = nuevo_valor
+        return lote
+
+    def actualizar_lote(self, pares) -> None:
+        """
+        Sustituye de una vez los valores de todos los pares (nombre, nuevo_valor).
+        Si un nombre se repite prevalece el último, y se valida el lote entero antes de aplicarlo.
         """
-        inventario_leido: 'Inventario' = Inventario()
+        lote: dict[str, float] = self._validar_actualizar_lote(pares)
+        self._preparar_escritura("_cadena")
+
+        for nombre, nuevo_valor in lote.items():
+            nodo: 'Inventario.Nodo' = self._buscar_nodo(nombre)
+            anterior: float = nodo.get_valor()
+            nodo.set_valor(nuevo_valor)
+            self._registrar_cambio(nombre, anterior, nuevo_valor)
+
+    def _validar_eliminar_lote(self, pares) -> dict[str, float]:
+        """Valida un lote de eliminar_lote sin aplicarlo y lo devuelve agrupado por nombre."""
+        lote: dict[str, float] = {}
+        for nombre, cantidad in pares:
+            if cantidad <= 0:
+                raise InventarioError("La cantidad a eliminar debe ser mayor que 0.")
+            if self._buscar_nodo(nombre) is None:
+                raise InventarioError(f"El elemento '{nombre}' no existe para eliminar.")
+            lote[nombre] = lote.get(nombre, 0) + cantidad
+        return lote
+
+    def eliminar_lote(self, pares) -> None:
+        """
+        Resta de una vez las cantidades de todos los pares (nombre, cantidad).
+        Las cantidades de un mismo nombre se acumulan, y se valida el lote entero antes de aplicarlo.
+        """
+        lote: dict[str, float] = self._validar_eliminar_lote(pares)
+        self._preparar_escritura("_cadena")
+
+        for nombre, cantidad in lote.items():
+            nodo: 'Inventario.Nodo' = self._buscar_nodo(nombre)
+            anterior: float = nodo.get_valor()
+            nuevo_valor = anterior - cantidad
+
+            if nuevo_valor > 0:
+                nodo.set_valor(nuevo_valor)
+                self._registrar_cambio(nombre, anterior, nuevo_valor)
+            else:
+                self._desenlazar(nodo)
+                self._registrar_cambio(nombre, anterior, None)
+
 
+    # ========================= MÉTODOS DE PERSISTENCIA =============================
+
+    def _leer_csv(self, ruta: str):
+        """
+        Recorre en streaming los pares (nombre, valor) de un archivo CSV.
+        Ignora líneas vacías, mal formadas, no numéricas o con valor <= 0.
+        """
         try:
             with open(ruta, mode='r', newline='', encoding='utf-8') as file:
                 reader = csv.reader(file)
@@ -236,24 +612,61 @@ class Inventario:
                     
                     try:
                         valor = float(valor_str)
-                        if valor > 0:
-                            inventario_leido.agregar(nombre, valor)
                     except ValueError:
                         # Ignorar valores no numéricos
                         continue
+
+                    if valor > 0:
+                        yield nombre, valor
         
         except FileNotFoundError:
             raise InventarioError(f"El archivo CSV no existe en la ruta: {ruta}")
         except Exception as e:
             raise InventarioError(f"Error al cargar el archivo CSV en {ruta}: {e}")
 
-        self.fusionar(inventario_leido)
+    def cargar(self, ruta: str) -> None:
+        """
+        Carga los elementos desde un archivo CSV y los fusiona con el inventario actual.
+        """
+        # Se lee el archivo entero antes de aplicar nada, para no dejar cargas a medias
+        self.agregar_lote(list(self._leer_csv(ruta)))
+
+    def cargar_por_lotes(self, ruta: str, tamano_lote: int = 10000) -> dict[str, float]:
+        """
+        Carga un archivo CSV en streaming aplicando las filas en lotes de tamano_lote,
+        sin inventario intermedio. Devuelve las filas cargadas, los segundos y las filas por segundo.
+        """
+        if tamano_lote <= 0:
+            raise InventarioError("El tamaño de lote debe ser mayor que 0.")
+
+        inicio: float = time.perf_counter()
+        filas: int = 0
+        pares = self._leer_csv(ruta)
+
+        lote = list(islice(pares, tamano_lote))
+        while lote:
+            self.agregar_lote(lote)
+            filas += len(lote)
+            lote = list(islice(pares, tamano_lote))
+
+        segundos: float = time.perf_counter() - inicio
+        return {
+            "filas": filas,
+            "segundos": segundos,
+            "filas_por_segundo": filas / segundos if segundos > 0 else 0.0,
+        }
 
     def guardar(self, ruta: str) -> None:
         """
         Guarda el inventario en un archivo CSV fusionando con el contenido existente.
         """
+        propias: set[str] = set(self._get_partes_propias())
         inventario_a_guardar = self.copiar()
+        # La copia temporal toma sus propias partes ya: este inventario vuelve a ser
+        # dueño de lo que lo era (si no, la política dejaría de reordenar hasta la
+        # siguiente escritura)
+        inventario_a_guardar._preparar_escritura(*Inventario._PARTES)
+        self._set_partes_propias(propias)
 
         try:
             inventario_a_guardar.cargar(ruta)
@@ -266,15 +679,109 @@ class Inventario:
         try:
             with open(ruta, mode='w', newline='', encoding='utf-8') as file:
                 writer = csv.writer(file)
-                for nombre in inventario_a_guardar:
-                    valor = inventario_a_guardar.consultar(nombre)
-                    if valor > 0:
-                        writer.writerow([nombre, valor])
+                writer.writerows(inventario_a_guardar.items())
 
         except Exception as e:
             raise InventarioError(f"Error al escribir en el archivo CSV en {ruta}: {e}")
 
 
+    def guardar_binario(self, ruta: str, ordenado: bool = False) -> None:
+        """
+        Guarda el inventario en el formato binario de formato_binario (sustituye el archivo).
+        Con ordenado=True los nombres se escriben ordenados.
+        """
+        try:
+            formato_binario.escribir(ruta, self._pares(), ordenado)
+        except Exception as e:
+            raise InventarioError(f"Error al escribir el archivo binario en {ruta}: {e}")
+
+    def cargar_binario(self, ruta: str) -> None:
+        """
+        Carga los elementos desde un archivo binario y los fusiona con el inventario actual.
+        """
+        try:
+            nombres, valores = formato_binario.leer(ruta)
+        except FileNotFoundError:
+            raise InventarioError(f"El archivo binario no existe en la ruta: {ruta}")
+        except Exception as e:
+            raise InventarioError(f"Error al cargar el archivo binario en {ruta}: {e}")
+
+        self.agregar_lote(zip(nombres, valores))
+
+    def abrir_diario(self, ruta: str) -> None:
+        """
+        Activa la persistencia con diario: vacía el inventario, lo reconstruye con la
+        instantánea CSV de ruta (si existe) más el diario ruta + ".log", y desde entonces
+        añade cada modificación al diario en cuanto ocurre.
+        """
+        if self._get_diario() is not None:
+            raise InventarioError("El inventario ya tiene un diario abierto.")
+
+        self.vaciar()
+
+        if os.path.exists(ruta):
+            self.cargar(ruta)
+
+        try:
+            for operacion, nombre, valor in Diario.leer(ruta):
+                if operacion == Diario.FIJAR:
+                    self.fijar(nombre, valor)
+                elif operacion == Diario.BORRAR and self.existe(nombre):
+                    self.eliminar(nombre, self.consultar(nombre))
+                elif operacion == Diario.VACIAR:
+                    self.vaciar()
+
+            self._set_diario(Diario(ruta))
+        except Exception as e:
+            raise InventarioError(f"Error al leer el diario de {ruta}: {e}")
+
+    def compactar(self) -> None:
+        """Vuelca el estado actual en la instantánea CSV y vacía el diario."""
+        if self._get_diario() is None:
+            raise InventarioError("El inventario no tiene un diario abierto.")
+
+        try:
+            self._get_diario().compactar(self._pares())
+        except Exception as e:
+            raise InventarioError(f"Error al compactar el diario de {self._get_diario().get_ruta_instantanea()}: {e}")
+
+    def cerrar_diario(self) -> None:
+        """Cierra el diario abierto; el inventario deja de anotar sus cambios."""
+        if self._get_diario() is not None:
+            self._get_diario().cerrar()
+            self._set_diario(None)
+
+    def suscribir(self, sumidero) -> int:
+        """
+        Suscribe un sumidero (con recibir(cambio): SumideroAnillo, SumideroArchivo, SumideroFlujo)
+        al flujo de cambios (ver cambios.py) y devuelve la secuencia del último cambio emitido
+        antes de suscribirse. Sin suscriptores no se emite nada.
+        """
+        if self._flujo_cambios is None:
+            self._flujo_cambios = FlujoCambios()
+        self._flujo_cambios.suscribir(sumidero)
+        return self._flujo_cambios.get_secuencia()
+
+    def desuscribir(self, sumidero) -> None:
+        """
+        Deja de enviar cambios al sumidero (u olvida uno desconectado por fallar, ver
+        sumideros_fallidos); la numeración continúa para el resto.
+        """
+        try:
+            self._flujo_cambios.desuscribir(sumidero)
+        except (AttributeError, ValueError):
+            raise InventarioError("El sumidero no está suscrito a los cambios del inventario.")
+
+    def sumideros_fallidos(self) -> list[tuple[object, Exception]]:
+        """
+        Sumideros que fallaron al recibir un cambio, con su excepción. El fallo no interrumpe
+        la modificación: el sumidero se desconecta y sus réplicas han de resincronizarse.
+        """
+        if self._flujo_cambios is None:
+            return []
+        return self._flujo_cambios.get_fallidos()
+
+
     # ========================= MÉTODOS DE CONSULTA =============================
     
     def consultar(self, nombre: str) -> float:
@@ -293,35 +800,104 @@ class Inventario:
         """Retorna el número total de elementos distintos en el inventario."""
         return self._get_longitud()
 
-    def cantidad_total(self) -> float:
-        """Retorna la suma de los valores de todos los elementos del inventario."""
-        total_inventario: float = 0.0
-        actual: 'Inventario.Nodo' = self._get_primer_nodo()
-        while actual is not None:
-            total_inventario += actual.get_valor()
-            actual = actual.get_siguiente()
-        return total_inventario
+    def cantidad_total(self, prefijo: str = None) -> float:
+        """
+        Retorna la suma de los valores de todos los elementos del inventario o, con prefijo,
+        sólo la de los nombres que empiezan por él (con el índice de nombres, en O(log n + k)).
+        """
+        if prefijo is None:
+            return self._get_estadisticas().total()
+        return math.fsum(self._valor(nombre) for nombre in self._get_indice_nombres().con_prefijo(prefijo))
 
 
     def _invertir(self) -> None:
         """Invierte el orden de la lista enlazada."""
+        self._preparar_escritura("_cadena")
         nodo_anterior: 'Inventario.Nodo' = None
         nodo_actual: 'Inventario.Nodo' = self._get_primer_nodo()
         while nodo_actual is not None:
             nodo_siguiente: 'Inventario.Nodo' = nodo_actual.get_siguiente()
             nodo_actual.set_siguiente(nodo_anterior)
+            nodo_actual.set_anterior(nodo_siguiente)
             nodo_anterior = nodo_actual
             nodo_actual = nodo_siguiente
         
         self._set_primer_nodo(nodo_anterior)
 
 
-    def ordenar_por_valor(self, descendente=False):
+    @staticmethod
+    def _mezclar(izquierda: 'Inventario.Nodo', derecha: 'Inventario.Nodo', descendente: bool) -> 'Inventario.Nodo':
+        """
+        Mezcla dos cadenas ya ordenadas reenlazando sus nodos.
+        A igualdad de valor se toma primero el de la izquierda (mezcla estable).
+        """
+        centinela: 'Inventario.Nodo' = Inventario.Nodo(None, 0.0)
+        cola: 'Inventario.Nodo' = centinela
+
+        while izquierda is not None and derecha is not None:
+            if (descendente and izquierda >= derecha) or (not descendente and izquierda <= derecha):
+                cola.set_siguiente(izquierda)
+                izquierda = izquierda.get_siguiente()
+            else:
+                cola.set_siguiente(derecha)
+                derecha = derecha.get_siguiente()
+            cola = cola.get_siguiente()
+
+        cola.set_siguiente(izquierda if izquierda is not None else derecha)
+        return centinela.get_siguiente()
+
+    @staticmethod
+    def _ordenar_cadena(cabeza: 'Inventario.Nodo', longitud: int, descendente: bool) -> 'Inventario.Nodo':
+        """Merge sort sobre una cadena de 'longitud' nodos terminada en None."""
+        if longitud < 2:
+            return cabeza
+
+        mitad: int = longitud // 2
+        ultimo_izquierda: 'Inventario.Nodo' = cabeza
+        for _ in range(mitad - 1):
+            ultimo_izquierda = ultimo_izquierda.get_siguiente()
+
+        # Cortamos la cadena en dos mitades
+        derecha: 'Inventario.Nodo' = ultimo_izquierda.get_siguiente()
+        ultimo_izquierda.set_siguiente(None)
+
+        izquierda = Inventario._ordenar_cadena(cabeza, mitad, descendente)
+        derecha = Inventario._ordenar_cadena(derecha, longitud - mitad, descendente)
+        return Inventario._mezclar(izquierda, derecha, descendente)
+
+    def ordenar_por_valor(self, descendente: bool = False) -> list[str]:
         """
-        Ordena la lista enlazada por el valor del elemento (Insertion Sort).
+        Ordena la lista enlazada por el valor del elemento (Merge Sort estable, O(n log n))
+        y devuelve la lista de nombres en el nuevo orden.
         """
-        pass 
+        self._preparar_escritura("_cadena")
+        primer_nodo = Inventario._ordenar_cadena(self._get_primer_nodo(), self._get_longitud(), descendente)
+        self._set_primer_nodo(primer_nodo)
 
+        # La mezcla sólo reenlaza hacia delante: rehacemos los enlaces hacia atrás
+        nombres: list[str] = []
+        nodo_anterior: 'Inventario.Nodo' = None
+        actual: 'Inventario.Nodo' = primer_nodo
+        while actual is not None:
+            actual.set_anterior(nodo_anterior)
+            nombres.append(actual.get_nombre())
+            nodo_anterior = actual
+            actual = actual.get_siguiente()
+
+        return nombres
+
+
+    def items(self) -> Vista:
+        """Vista perezosa de los pares (nombre, valor), en el orden de la cadena."""
+        return Vista(self, self._pares)
+
+    def nombres(self) -> Vista:
+        """Vista perezosa de los nombres, en el orden de la cadena."""
+        return Vista(self, self.__iter__)
+
+    def valores(self) -> Vista:
+        """Vista perezosa de los valores, en el mismo orden que nombres()."""
+        return Vista(self, self._recorrer_valores)
 
     def maximo(self) -> str:
         """
@@ -329,18 +905,8 @@ class Inventario:
         """
         if self._get_primer_nodo() is None:
             raise InventarioError("El inventario está vacío.")
-        
-        max_nombre: str = self._get_primer_nodo().get_nombre()
-        max_valor: float = self._get_primer_nodo().get_valor()
-        
-        actual: 'Inventario.Nodo' = self._get_primer_nodo().get_siguiente()
-        while actual is not None:
-            if actual.get_valor() > max_valor:
-                max_valor = actual.get_valor()
-                max_nombre = actual.get_nombre()
-            actual = actual.get_siguiente()
-    
-        return max_nombre
+
+        return self._get_estadisticas().maximo(self._valor, self._pares)
 
     def minimo(self) -> str:
         """
@@ -348,35 +914,63 @@ class Inventario:
         """
         if self._get_primer_nodo() is None:
             raise InventarioError("El inventario está vacío.")
-        
-        min_nombre: str = self._get_primer_nodo().get_nombre()
-        min_valor: float = self._get_primer_nodo().get_valor()
-        
-        actual: 'Inventario.Nodo' = self._get_primer_nodo().get_siguiente()
-        while actual is not None:
-            if actual.get_valor() < min_valor:
-                min_valor = actual.get_valor()
-                min_nombre = actual.get_nombre()
-            actual = actual.get_siguiente()
-    
-        return min_nombre
+
+        return self._get_estadisticas().minimo(self._valor, self._pares)
 
 
+    def rango(self, valor_minimo: float, valor_maximo: float) -> list[tuple[str, float]]:
+        """
+        Devuelve los pares (nombre, valor) con valor_minimo <= valor <= valor_maximo, ordenados
+        por valor (y por nombre a igualdad). La primera consulta crea el índice por valor en
+        O(n log n); desde entonces se mantiene en cada cambio y consultar cuesta O(log n + k).
+        """
+        return list(self._get_indice_valores().rango(valor_minimo, valor_maximo))
+
+    def contar_rango(self, valor_minimo: float, valor_maximo: float) -> int:
+        """Cuántos elementos tienen valor_minimo <= valor <= valor_maximo (con el índice por valor)."""
+        return self._get_indice_valores().contar(valor_minimo, valor_maximo)
+
+    def buscar_prefijo(self, prefijo: str, limite: int = None) -> list[tuple[str, float]]:
+        """
+        Devuelve los pares (nombre, valor) cuyo nombre empieza por prefijo, en orden alfabético
+        y como mucho limite de ellos (todos si es None). La primera búsqueda crea el índice de
+        nombres en O(n log n); desde entonces se mantiene en cada alta o baja y buscar cuesta
+        O(log n + k). No aplica la política de reorganización.
+        """
+        if limite is not None and limite < 0:
+            raise InventarioError("El límite de resultados ha de ser mayor o igual a 0.")
+        nombres = islice(self._get_indice_nombres().con_prefijo(prefijo), limite)
+        return [(nombre, self._valor(nombre)) for nombre in nombres]
+
+    def por_valor(self, descendente: bool = False) -> Vista:
+        """Vista perezosa de los pares (nombre, valor) en orden de valor, leída del índice por valor."""
+        return Vista(self, lambda: self._get_indice_valores().recorrer(descendente))
+
+    def top(self, k: int, descendente: bool = True) -> list[tuple[str, float]]:
+        """
+        Devuelve los k elementos de mayor valor (o de menor si descendente es False)
+        como pares (nombre, valor), sin ordenar la lista.
+        """
+        if k < 0:
+            raise InventarioError("El número de elementos pedido debe ser mayor o igual que 0.")
+
+        return self._get_estadisticas().primeros(k, descendente, self._valor, self._pares)
+
     def copiar(self) -> 'Inventario':
         """
-        Crea y retorna un nuevo inventario mediante copia profunda.
+        Crea y retorna una copia independiente en O(1): comparte la cadena y las
+        estadísticas con el original (copy-on-write) y cada parte se copia la primera
+        vez que uno de los dos la modifica.
         """
-        nuevo_inventario = Inventario()
-        actual = self._get_primer_nodo()
-        
-        while actual is not None:
-            # Al usar 'agregar', se inserta al principio (invirtiendo el orden)
-            nuevo_inventario.agregar(actual.get_nombre(), actual.get_valor())
-            actual = actual.get_siguiente()
-        
-        # Invertimos el nuevo inventario para restaurar el orden original
-        nuevo_inventario._invertir()
-        
+        nuevo_inventario = Inventario(self._politica)
+        nuevo_inventario._set_primer_nodo(self._get_primer_nodo())
+        nuevo_inventario._set_indice(self._get_indice())
+        nuevo_inventario._set_longitud(self._get_longitud())
+        nuevo_inventario._set_estadisticas(self._get_estadisticas())
+
+        # A partir de ahora ninguno de los dos es el único dueño de nada
+        nuevo_inventario._set_partes_propias(set())
+        self._set_partes_propias(set())
         return nuevo_inventario
 
 if __name__ == "__main__":
@@ -413,8 +1007,8 @@ if __name__ == "__main__":
     print("Copia creada:", copia)
 
     print("Recorriendo elementos:")
-    for nombre in inv:
-        print(f" - {nombre}: { inv.consultar(nombre)}")
+    for nombre, valor in inv.items():
+        print(f" - {nombre}: {valor}")
 
     inv.vaciar()
     print("Inventario vacío:", inv)
@@ -0,0 +1,272 @@
+"""
+Inventario seguro para compartir entre hilos, con bloqueo por franjas.
+
+Los nombres se reparten por hash entre varias franjas, cada una con su propio
+inventario (de cualquiera de los dos módulos) y su propio cerrojo. Las
+operaciones sobre un nombre sólo bloquean su franja, de modo que hilos que
+trabajan con nombres de franjas distintas no se esperan entre sí.
+
+Las operaciones que necesitan ver el inventario entero (agregados, lotes,
+fusionar, diferencia, copiar, guardar...) toman todos los cerrojos, siempre en
+el mismo orden, y trabajan así sobre una instantánea consistente.
+
+Recorrer el inventario es seguro aunque otros hilos escriban a la vez: cada
+franja se copia bajo su cerrojo antes de recorrerla, por lo que nunca se ve un
+estado a medias, pero los cambios hechos en franjas aún no visitadas sí pueden
+aparecer (recorrido débilmente consistente).
+
+Rendimiento: con el GIL sólo un hilo ejecuta Python a la vez y las secciones
+críticas no lo sueltan, así que repartir los cerrojos no añade paralelismo. En
+benchmarks.contencion las franjas rinden como un cerrojo global (por encima o
+por debajo según la ejecución, dentro del ruido); la ganancia esperada sólo
+aparecería en un intérprete sin GIL.
+"""
+from contextlib import contextmanager
+import heapq
+import math
+import threading
+
+from errores import InventarioError
+import inventario_contiguo
+
+
+class InventarioConcurrente:
+
+    _FRANJAS_POR_DEFECTO: int = 16
+
+    # ========================= CONSTRUCTOR =============================
+
+    def __init__(self, clase=inventario_contiguo.Inventario, franjas: int = _FRANJAS_POR_DEFECTO):
+        """Crea un inventario vacío repartido en el número de franjas indicado."""
+        if franjas <= 0:
+            raise InventarioError("El número de franjas debe ser mayor que 0.")
+
+        self._clase = clase
+        self._franjas: list = [clase() for _ in range(franjas)]
+        self._cerrojos: list[threading.Lock] = [threading.Lock() for _ in range(franjas)]
+        self._numero_franjas: int = franjas
+
+    # ========================= CERROJOS =============================
+
+    # Las operaciones sobre un nombre calculan su franja en línea (hash(nombre) %
+    # self._numero_franjas) y llaman al método de la franja directamente: en estas
+    # llamadas tan cortas, cada llamada auxiliar de más se nota
+
+    def _franja(self, nombre: str) -> int:
+        return hash(nombre) % self._numero_franjas
+
+    @contextmanager
+    def _bloquear_todas(self):
+        """Toma todos los cerrojos en orden creciente (evita interbloqueos)."""
+        for cerrojo in self._cerrojos:
+            cerrojo.acquire()
+        try:
+            yield
+        finally:
+            for cerrojo in reversed(self._cerrojos):
+                cerrojo.release()
+
+    def _repartir(self, pares) -> list[list[tuple[str, float]]]:
+        repartidos: list[list[tuple[str, float]]] = [[] for _ in self._franjas]
+        for nombre, valor in pares:
+            repartidos[self._franja(nombre)].append((nombre, valor))
+        return repartidos
+
+    def _instantanea(self) -> list[tuple[str, float]]:
+        """Pares (nombre, valor) de todo el inventario en un mismo instante."""
+        with self._bloquear_todas():
+            return [par for franja in self._franjas for par in franja._pares()]
+
+    def _pares(self):
+        return iter(self._instantanea())
+
+    # ========================= MÉTODOS MODIFICADORES =============================
+
+    def agregar(self, nombre: str, valor: float = 1.0) -> None:
+        """Añade el elemento nombre con el valor indicado; si ya existe, lo incrementa."""
+        i: int = hash(nombre) % self._numero_franjas
+        with self._cerrojos[i]:
+            self._franjas[i].agregar(nombre, valor)
+
+    def actualizar(self, nombre: str, nuevo_valor: float) -> None:
+        """Sustituye el valor actual del elemento nombre por nuevo_valor."""
+        i: int = hash(nombre) % self._numero_franjas
+        with self._cerrojos[i]:
+            self._franjas[i].actualizar(nombre, nuevo_valor)
+
+    def eliminar(self, nombre: str, cantidad: float = 1.0) -> None:
+        """Resta la cantidad indicada al elemento nombre; si llega a <= 0 se elimina."""
+        i: int = hash(nombre) % self._numero_franjas
+        with self._cerrojos[i]:
+            self._franjas[i].eliminar(nombre, cantidad)
+
+    def _lote(self, metodo: str, pares) -> None:
+        """
+        Aplica un método por lotes en todas las franjas de forma atómica: la parte
+        de cada franja se valida (con _validar_<metodo>) antes de aplicar ninguna.
+        """
+        repartidos = self._repartir(pares)
+        with self._bloquear_todas():
+            try:
+                for i, pares_franja in enumerate(repartidos):
+                    if pares_franja:
+                        getattr(self._franjas[i], "_validar_" + metodo)(pares_franja)
+                for i, pares_franja in enumerate(repartidos):
+                    if pares_franja:
+                        getattr(self._franjas[i], metodo)(pares_franja)
+            except Exception as e:
+                raise InventarioError(str(e))
+
+    def agregar_lote(self, pares) -> None:
+        """Agrega todos los pares (nombre, valor): o entran todos o ninguno."""
+        pares = list(pares)
+        for _, valor in pares:
+            if valor <= 0:
+                raise InventarioError("No se puede agregar un valor menor o igual a 0.")
+
+        # Con los valores ya validados, agregar no puede fallar en ninguna franja
+        repartidos = self._repartir(pares)
+        with self._bloquear_todas():
+            for i, pares_franja in enumerate(repartidos):
+                if pares_franja:
+                    self._franjas[i].agregar_lote(pares_franja)
+
+    def actualizar_lote(self, pares) -> None:
+        """Sustituye los valores de todos los pares (nombre, nuevo_valor): todos o ninguno."""
+        self._lote("actualizar_lote", pares)
+
+    def eliminar_lote(self, pares) -> None:
+        """Resta las cantidades de todos los pares (nombre, cantidad): todos o ninguno."""
+        self._lote("eliminar_lote", pares)
+
+    def vaciar(self) -> None:
+        """Elimina todos los elementos del inventario."""
+        with self._bloquear_todas():
+            for franja in self._franjas:
+                franja.vaciar()
+
+    def fusionar(self, otro) -> None:
+        """
+        Añade los elementos de otro inventario (de cualquier módulo, o concurrente).
+        Se toma una instantánea de otro y se aplica de una vez.
+        """
+        if not hasattr(otro, "_pares"):
+            raise InventarioError("El objeto a fusionar debe ser un inventario.")
+        self.agregar_lote(list(otro._pares()))
+
+    def diferencia(self, otro) -> None:
+        """Resta los valores de los elementos de otro inventario, sobre una instantánea de otro."""
+        if not hasattr(otro, "_pares"):
+            raise InventarioError("El objeto para la diferencia debe ser un inventario.")
+
+        repartidos = self._repartir(list(otro._pares()))
+        with self._bloquear_todas():
+            for i, pares_franja in enumerate(repartidos):
+                if pares_franja:
+                    restar = self._clase()
+                    restar.agregar_lote(pares_franja)
+                    self._franjas[i].diferencia(restar)
+
+    def copiar(self) -> 'InventarioConcurrente':
+        """Crea una copia independiente a partir de una instantánea consistente."""
+        copia: InventarioConcurrente = InventarioConcurrente(self._clase, len(self._franjas))
+        with self._bloquear_todas():
+            copia._franjas = [franja.copiar() for franja in self._franjas]
+        return copia
+
+    # ========================= MÉTODOS DE PERSISTENCIA =============================
+
+    def cargar(self, ruta: str) -> None:
+        """Carga un archivo CSV (con las reglas de la clase de las franjas) de forma atómica."""
+        try:
+            pares = list(self._clase()._leer_csv(ruta))
+        except Exception as e:
+            raise InventarioError(str(e))
+        self.agregar_lote(pares)
+
+    def guardar(self, ruta: str) -> None:
+        """Guarda una instantánea consistente en un archivo CSV, con el guardar de la clase."""
+        inventario = self._clase()
+        inventario.agregar_lote(self._instantanea())
+        try:
+            inventario.guardar(ruta)
+        except Exception as e:
+            raise InventarioError(str(e))
+
+    # ========================= MÉTODOS DE CONSULTA =============================
+
+    def consultar(self, nombre: str) -> float:
+        """Devuelve el valor actual del elemento nombre o 0.0 si no existe."""
+        i: int = hash(nombre) % self._numero_franjas
+        with self._cerrojos[i]:
+            return self._franjas[i].consultar(nombre)
+
+    def existe(self, nombre: str) -> bool:
+        """Indica si el elemento nombre está presente en el inventario."""
+        i: int = hash(nombre) % self._numero_franjas
+        with self._cerrojos[i]:
+            return self._franjas[i].existe(nombre)
+
+    def total_items(self) -> int:
+        """Retorna el número total de elementos distintos en el inventario."""
+        with self._bloquear_todas():
+            return sum(franja.total_items() for franja in self._franjas)
+
+    def cantidad_total(self) -> float:
+        """Retorna la suma de los valores de todos los elementos del inventario."""
+        with self._bloquear_todas():
+            return math.fsum(franja.cantidad_total() for franja in self._franjas)
+
+    def _extremo(self, maximo: bool) -> str:
+        with self._bloquear_todas():
+            candidatos: list[tuple[str, float]] = []
+            for franja in self._franjas:
+                if len(franja) > 0:
+                    nombre: str = franja.maximo() if maximo else franja.minimo()
+                    candidatos.append((nombre, franja.consultar(nombre)))
+
+        if not candidatos:
+            raise InventarioError("El inventario está vacío.")
+        if maximo:
+            return max(candidatos, key=lambda par: par[1])[0]
+        return min(candidatos, key=lambda par: par[1])[0]
+
+    def maximo(self) -> str:
+        """Devuelve el elemento con el valor más alto."""
+        return self._extremo(True)
+
+    def minimo(self) -> str:
+        """Devuelve el elemento con el valor más bajo."""
+        return self._extremo(False)
+
+    def top(self, k: int, descendente: bool = True) -> list[tuple[str, float]]:
+        """Los k pares (nombre, valor) de mayor (o menor) valor."""
+        if k < 0:
+            raise InventarioError("El número de elementos pedido debe ser mayor o igual que 0.")
+
+        with self._bloquear_todas():
+            candidatos = [par for franja in self._franjas for par in franja.top(k, descendente)]
+
+        if descendente:
+            return heapq.nlargest(k, candidatos, key=lambda par: par[1])
+        return heapq.nsmallest(k, candidatos, key=lambda par: par[1])
+
+    def ordenar_por_valor(self, descendente: bool = False) -> list[str]:
+        """Devuelve los nombres ordenados por valor."""
+        pares = sorted(self._instantanea(), key=lambda par: par[1], reverse=descendente)
+        return [nombre for nombre, _ in pares]
+
+    # ========================= MÉTODOS MÁGICOS =============================
+
+    def __len__(self) -> int:
+        return self.total_items()
+
+    def __iter__(self):
+        # Cada franja se copia bajo su cerrojo: seguro frente a escrituras concurrentes
+        for cerrojo, franja in zip(self._cerrojos, self._franjas):
+            with cerrojo:
+                nombres: list[str] = list(franja)
+            yield from nombres
+
+    def __str__(self) -> str:
+        return f"InventarioConcurrente de {len(self._franjas)} franjas y {len(self)} elementos"
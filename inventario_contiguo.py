@@ -1,36 +1,124 @@
-from copy import deepcopy
+from array import array
+from copy import copy
 import csv
-
-class InventarioError(Exception):
-    def __init__(self, msg = "%ERR%. Se ha producido un error en el inventario"):
-        super().__init__(msg)
-        self._msg = msg
-
-    def __str__(self):
-        return self._msg
+from itertools import islice
+import math
+import os
+import struct
+import sys
+import time
+
+from cambios import FlujoCambios
+from diario import Diario
+from errores import InventarioError
+from estadisticas import Estadisticas
+import formato_binario
+from indice_nombres import IndiceNombres
+from indice_valores import IndiceValores
+from vistas import Vista
+
+#NumPy es opcional: si no está instalado, el modo compacto usa array('d').
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class Inventario:
     """
     Parte Privada del Inventario Contiguo.
+
+    Los elementos ocupan las posiciones [0, ocupadas) de los arrays. Eliminar un
+    elemento deja una lápida (nombre None) en su posición, que el índice ya no
+    referencia; las lápidas se retiran todas de una pasada cuando superan una
+    proporción de las posiciones ocupadas, al redimensionar, y antes de
+    ordenar_por_valor y guardar.
+
+    Orden de recorrido: los elementos se recorren siempre en orden de inserción
+    (un elemento eliminado y vuelto a agregar pasa al final). Las lápidas y su
+    compactación no alteran ese orden. No se admite modificar el inventario
+    mientras se recorre.
+
+    Capacidad: al llenarse, los arrays crecen multiplicando su capacidad por el
+    factor de crecimiento. Cuando los elementos vivos bajan de 1/(2·factor) de
+    la capacidad, se reducen para quedar ocupados a 1/factor; la distancia entre
+    ambos umbrales evita redimensionar una y otra vez al agregar y eliminar
+    alrededor de un mismo tamaño. Nunca se reduce por debajo de lo reservado
+    con reservar.
     """
 
     _CAPACIDAD_MINIMA : int = 2
+    _FACTOR_CRECIMIENTO : float = 2.0
+
+    #Tamaño de una referencia (un puntero) en esta plataforma.
+    _BYTES_REFERENCIA : int = struct.calcsize("P")
+
+    #Proporción de lápidas sobre las posiciones ocupadas a partir de la cual se compacta.
+    _PROPORCION_MAXIMA_LAPIDAS : float = 0.5
+
+    #Atributos que copiar() comparte entre el original y la copia.
+    _PARTES : tuple[str, ...] = ("_nombres", "_valores", "_indice", "_estadisticas")
 
     @classmethod
     def _get_capacidad_minima(cls):
         return cls._CAPACIDAD_MINIMA
 
     #Creación de un inventario, inicialmente vacío.
-    def __init__(self):
+    #Con compacto=True los valores se guardan en un buffer float64 (NumPy o array('d'))
+    #en lugar de una lista de floats.
+    #factor_crecimiento (> 1) es el multiplicador de la capacidad cada vez que los arrays se llenan.
+    def __init__(self, compacto: bool = False, factor_crecimiento: float = _FACTOR_CRECIMIENTO):
+        if factor_crecimiento <= 1:
+            raise InventarioError("El factor de crecimiento ha de ser mayor a 1.")
+
+        self._compacto : bool = compacto
+        self._factor_crecimiento : float = factor_crecimiento
         self._capacidad : int = Inventario._CAPACIDAD_MINIMA
+        #Capacidad pedida con reservar: no se reduce por debajo de ella.
+        self._reserva : int = 0
+        #Contadores de redimensiones, para estado_capacidad().
+        self._capacidad_maxima : int = self._capacidad
+        self._redimensiones : int = 0
+        self._posiciones_copiadas : int = 0
         self._nombres : list[str | None] = [None] * self._capacidad
-        self._valores : list[float | None]  = [None] * self._capacidad
+        self._valores : list[float | None]  = self._nuevo_buffer_valores(self._capacidad)
+        #Elementos vivos, y posiciones usadas contando las lápidas.
         self._longitud : int = 0
+        self._ocupadas : int = 0
+        #Índice nombre -> posición, sincronizado con _nombres y _valores.
+        self._indice : dict[str, int] = {}
+        #Total, máximo y mínimo mantenidos en cada modificación.
+        self._estadisticas : Estadisticas = Estadisticas()
+        #Índice ordenado por valor: se crea con la primera consulta por rango (y no se comparte con copias).
+        self._indice_valores : IndiceValores | None = None
+        #Índice de nombres ordenados para buscar por prefijo: se crea igual, con la primera búsqueda.
+        self._indice_nombres : IndiceNombres | None = None
+        #Diario de cambios abierto con abrir_diario, o None.
+        self._diario : Diario | None = None
+        #Flujo de cambios para réplicas, creado con la primera suscripción, o None.
+        self._flujo_cambios : FlujoCambios | None = None
+        #Partes del estado que son sólo de este inventario; las demás se comparten
+        #con copias (copy-on-write) y se copian antes de la primera escritura.
+        self._partes_propias : set[str] = set(Inventario._PARTES)
 
     #Getters y setters
+    def _es_compacto(self) -> bool:
+        return self._compacto
+
+    def _usa_numpy(self) -> bool:
+        return self._compacto and np is not None
+
     def _get_capacidad(self) -> int:
         return self._capacidad
 
+    def _get_factor_crecimiento(self) -> float:
+        return self._factor_crecimiento
+
+    def _get_reserva(self) -> int:
+        return self._reserva
+
+    def _set_reserva(self, reserva: int) -> None:
+        self._reserva = reserva
+
     def _get_nombres(self) -> list[str | None]:
         return self._nombres
 
@@ -40,6 +128,33 @@ class Inventario:
     def _get_longitud(self) -> int:
         return self._longitud
 
+    def _get_ocupadas(self) -> int:
+        return self._ocupadas
+
+    def _get_lapidas(self) -> int:
+        return self._ocupadas - self._longitud
+
+    def _get_indice(self) -> dict[str, int]:
+        return self._indice
+
+    def _get_estadisticas(self) -> Estadisticas:
+        return self._estadisticas
+
+    def _get_diario(self) -> Diario | None:
+        return self._diario
+
+    def _get_indice_valores(self) -> IndiceValores:
+        #Crea el índice por valor la primera vez que se necesita.
+        if self._indice_valores is None:
+            self._indice_valores = IndiceValores(self._pares())
+        return self._indice_valores
+
+    def _get_indice_nombres(self) -> IndiceNombres:
+        #Crea el índice de nombres la primera vez que se necesita.
+        if self._indice_nombres is None:
+            self._indice_nombres = IndiceNombres(self._get_indice())
+        return self._indice_nombres
+
     def _set_capacidad(self, capacidad: int) -> None:
         self._capacidad = capacidad
 
@@ -52,12 +167,201 @@ class Inventario:
     def _set_longitud(self, nueva_longitud: int) -> None:
         self._longitud = nueva_longitud
 
+    def _set_ocupadas(self, ocupadas: int) -> None:
+        self._ocupadas = ocupadas
+
+    def _set_indice(self, indice: dict[str, int]) -> None:
+        self._indice = indice
+
+    def _set_estadisticas(self, estadisticas: Estadisticas) -> None:
+        self._estadisticas = estadisticas
+
+    def _set_diario(self, diario: Diario | None) -> None:
+        self._diario = diario
+
+    def _get_partes_propias(self) -> set[str]:
+        return self._partes_propias
+
+    def _set_partes_propias(self, partes: set[str]) -> None:
+        self._partes_propias = partes
+
     def _incrementar_longitud(self) -> None:
         self._longitud += 1
 
     def _decrementar_longitud(self) -> None:
         self._longitud -= 1
 
+    def _pares(self):
+        #Recorre los pares (nombre, valor) directamente sobre los arrays, saltando las lápidas.
+        nombres = self._get_nombres()
+        valores = self._get_valores()
+        for i in range(self._get_ocupadas()):
+            if nombres[i] is not None:
+                yield nombres[i], valores[i]
+
+    def _recorrer_nombres(self):
+        nombres = self._get_nombres()
+        for i in range(self._get_ocupadas()):
+            if nombres[i] is not None:
+                yield nombres[i]
+
+    def _recorrer_valores(self):
+        nombres = self._get_nombres()
+        valores = self._get_valores()
+        for i in range(self._get_ocupadas()):
+            if nombres[i] is not None:
+                yield valores[i]
+
+    def _preparar_escritura(self, *partes: str) -> bool:
+        """
+        Copia las partes indicadas que aún se compartan con otro inventario,
+        para poder modificarlas. Devuelve True si ha tenido que copiar alguna.
+        """
+
+        propias = self._get_partes_propias()
+        copiado = False
+        for parte in partes:
+            if parte not in propias:
+                compartida = getattr(self, parte)
+                setattr(self, parte, compartida.copiar() if parte == "_estadisticas" else copy(compartida))
+                propias.add(parte)
+                copiado = True
+
+        return copiado
+
+    def _registrar_cambio(self, nombre: str, anterior: float | None, nuevo: float | None) -> None:
+        """
+        Punto único por el que pasan todas las modificaciones de un elemento.
+        None en anterior/nuevo indica que el elemento no existía o se ha eliminado.
+        """
+
+        self._preparar_escritura("_estadisticas")
+        self._get_estadisticas().registrar(nombre, anterior, nuevo)
+
+        if self._indice_valores is not None:
+            self._indice_valores.registrar(nombre, anterior, nuevo)
+        if self._indice_nombres is not None:
+            self._indice_nombres.registrar(nombre, anterior, nuevo)
+
+        if self._get_diario() is not None:
+            self._get_diario().anotar(nombre, nuevo)
+
+        if self._flujo_cambios is not None:
+            self._flujo_cambios.emitir(nombre, anterior, nuevo)
+
+    def _nuevo_buffer_valores(self, capacidad: int):
+        """
+        Crea el almacenamiento de valores según el modo del inventario:
+        lista rellena con None, o buffer float64 relleno con 0.0 en modo compacto.
+        """
+
+        if not self._es_compacto():
+            return [None] * capacidad
+        if np is not None:
+            return np.zeros(capacidad, dtype=np.float64)
+        return array('d', bytes(8 * capacidad))
+
+    def _hueco(self) -> float | None:
+        #Valor de relleno de las posiciones libres de _valores.
+        return 0.0 if self._es_compacto() else None
+
+    def _redimensionar(self, nueva_capacidad: int) -> None:
+        """
+        Cambia la capacidad de los arrays. Si no hay lápidas se conservan las
+        posiciones, por lo que el índice nombre -> posición sigue siendo válido;
+        si las hay, se aprovecha la copia para retirarlas y se actualiza el índice.
+        """
+
+        ocupadas = self._get_ocupadas()
+        nuevos_nombres : list[str | None] = [None] * nueva_capacidad
+        nuevos_valores = self._nuevo_buffer_valores(nueva_capacidad)
+        nombres = self._get_nombres()
+        valores = self._get_valores()
+
+        if self._get_lapidas() == 0:
+            nuevos_nombres[:ocupadas] = nombres[:ocupadas]
+            nuevos_valores[:ocupadas] = valores[:ocupadas]
+        else:
+            self._preparar_escritura("_indice")
+            indice = self._get_indice()
+            j = 0
+            for i in range(ocupadas):
+                nombre = nombres[i]
+                if nombre is not None:
+                    nuevos_nombres[j] = nombre
+                    nuevos_valores[j] = valores[i]
+                    indice[nombre] = j
+                    j += 1
+            self._set_ocupadas(j)
+
+        self._set_capacidad(nueva_capacidad)
+        self._set_nombres(nuevos_nombres)
+        self._set_valores(nuevos_valores)
+        self._get_partes_propias().update(("_nombres", "_valores"))
+
+        self._redimensiones += 1
+        self._posiciones_copiadas += self._get_longitud()
+        self._capacidad_maxima = max(self._capacidad_maxima, nueva_capacidad)
+
+    def _asegurar_capacidad(self, capacidad_necesaria: int) -> None:
+        #Aplica el factor de crecimiento las veces necesarias, pero copia los arrays una sola vez.
+        nueva_capacidad = self._get_capacidad()
+        while nueva_capacidad < capacidad_necesaria:
+            nueva_capacidad = max(nueva_capacidad + 1, math.ceil(nueva_capacidad * self._get_factor_crecimiento()))
+
+        if nueva_capacidad != self._get_capacidad():
+            self._redimensionar(nueva_capacidad)
+
+    def _reducir_si_conviene(self) -> None:
+        """
+        Reduce la capacidad si los elementos vivos han bajado de 1/(2·factor) de ella,
+        dejándola a 1/factor de ocupación, sin bajar de la reserva ni del mínimo.
+        """
+
+        factor = self._get_factor_crecimiento()
+        l = self._get_longitud()
+        if l * 2 * factor >= self._get_capacidad():
+            return
+
+        nueva_capacidad = max(math.ceil(l * factor), self._get_reserva(), Inventario._CAPACIDAD_MINIMA)
+        if nueva_capacidad < self._get_capacidad():
+            self._redimensionar(nueva_capacidad)
+
+    def _compactar(self) -> None:
+        """
+        Elimina en una sola pasada las lápidas (posiciones con nombre None),
+        conservando el orden de los demás y actualizando el índice.
+        Las partes modificadas han de ser ya propias (_preparar_escritura).
+        """
+
+        nombres = self._get_nombres()
+        valores = self._get_valores()
+        indice = self._get_indice()
+        l = self._get_ocupadas()
+
+        j = 0
+        for i in range(l):
+            nombre = nombres[i]
+            if nombre is not None:
+                if i != j:
+                    nombres[j] = nombre
+                    valores[j] = valores[i]
+                    indice[nombre] = j
+                j += 1
+
+        nombres[j:l] = [None] * (l - j)
+        valores[j:l] = self._nuevo_buffer_valores(l - j)
+        self._set_ocupadas(j)
+
+    def _compactar_lapidas(self, forzar : bool = False) -> None:
+        #Compacta si hay lápidas y, salvo con forzar, sólo si superan la proporción máxima.
+        lapidas = self._get_lapidas()
+        if lapidas == 0:
+            return
+        if forzar or lapidas > self._get_ocupadas() * Inventario._PROPORCION_MAXIMA_LAPIDAS:
+            self._preparar_escritura("_nombres", "_valores", "_indice")
+            self._compactar()
+
     # ============================= CONSULTAS =============================
 
     def consultar(self, nombre: str) -> float:
@@ -71,11 +375,11 @@ class Inventario:
         Exception -> None
         """
 
-        for i in range(self._get_longitud()):
-            if self._get_nombres()[i] == nombre:
-                return self._get_valores()[i]
+        i = self._get_indice().get(nombre)
+        if i is None:
+            return 0.0
 
-        return 0.0
+        return self._get_valores()[i]
 
     #Funcionalidad extra para facilitar la lógica.
     def inventario_lleno(self) -> bool:
@@ -89,11 +393,57 @@ class Inventario:
         Exception -> None
         """
 
-        if self._get_capacidad() == self._get_longitud():
+        if self._get_capacidad() == self._get_ocupadas():
             return True
 
         return False
 
+    def estado_capacidad(self) -> dict[str, int | float]:
+        """
+        Devuelve el estado del almacenamiento: capacidad actual y máxima alcanzada,
+        posiciones ocupadas y lápidas, redimensiones hechas y posiciones copiadas
+        en ellas, y la memoria que ocupan.
+
+        "bytes_arrays" y "bytes_indice" son los sys.getsizeof de _nombres y _valores
+        y de la tabla del índice; los nombres no se cuentan. Los otros dos son
+        estimaciones, no medidas: "bytes_objetos_float" es el número de valores vivos
+        por el tamaño de un float (0 en modo compacto, que los guarda dentro del
+        buffer) y "bytes_arrays_maximo" la capacidad máxima por los bytes de cada
+        posición (una referencia al nombre más el itemsize del buffer compacto o una
+        referencia). Para medir de verdad, benchmarks.bytes_por_elemento usa tracemalloc.
+
+        Parámetros -> self: Inventario
+
+        Return -> estado: dict con "capacidad", "capacidad_maxima", "longitud",
+        "ocupadas", "lapidas", "reserva", "factor_crecimiento", "redimensiones",
+        "posiciones_copiadas", "bytes_arrays", "bytes_arrays_maximo", "bytes_indice"
+        y "bytes_objetos_float".
+
+        Exception -> None
+        """
+
+        return {
+            "capacidad": self._get_capacidad(),
+            "capacidad_maxima": self._capacidad_maxima,
+            "longitud": self._get_longitud(),
+            "ocupadas": self._get_ocupadas(),
+            "lapidas": self._get_lapidas(),
+            "reserva": self._get_reserva(),
+            "factor_crecimiento": self._get_factor_crecimiento(),
+            "redimensiones": self._redimensiones,
+            "posiciones_copiadas": self._posiciones_copiadas,
+            #sys.getsizeof de una lista, un array o un ndarray propio incluye su buffer de datos.
+            "bytes_arrays": sys.getsizeof(self._get_nombres()) + sys.getsizeof(self._get_valores()),
+            "bytes_arrays_maximo": self._capacidad_maxima * self._bytes_por_posicion(),
+            "bytes_indice": sys.getsizeof(self._get_indice()),
+            "bytes_objetos_float": 0 if self._es_compacto() else self._get_longitud() * sys.getsizeof(0.0),
+        }
+
+    def _bytes_por_posicion(self) -> int:
+        #Una referencia en _nombres y, en _valores, un float64 (itemsize del buffer) o una referencia.
+        valores = self._get_valores()
+        return Inventario._BYTES_REFERENCIA + (valores.itemsize if self._es_compacto() else Inventario._BYTES_REFERENCIA)
+
     def existe(self, nombre: str) -> bool:
         """
         Indica si el elemento nombre está presente en el inventario.
@@ -105,10 +455,7 @@ class Inventario:
         Exception -> None
         """
 
-        for i in range(self._get_longitud()):
-            if self._get_nombres()[i] == nombre:
-                return True
-        return False
+        return nombre in self._get_indice()
 
     def total_items(self) -> int:
         """
@@ -123,22 +470,23 @@ class Inventario:
 
         return self._get_longitud()
 
-    def cantidad_total(self) -> float:
+    def cantidad_total(self, prefijo: str | None = None) -> float:
         """
-        Retorna la suma de los valores de todos los elementos del inventario.
+        Retorna la suma de los valores de todos los elementos del inventario o, si se
+        da un prefijo, sólo de los elementos cuyo nombre empieza por él (por ejemplo,
+        "fruta/" suma toda la categoría). Con prefijo se usa el índice de nombres
+        (ver buscar_prefijo) y cuesta O(log n + k) para k coincidencias.
 
-        Parámetros -> self: Inventario
+        Parámetros -> prefijo: str | None (None por defecto)
 
         Return -> suma_total_items: float
 
         Exception -> None
         """
 
-        suma : float = 0
-        for i in range(self._get_longitud()):
-            suma += self._get_valores()[i]
-
-        return suma
+        if prefijo is None:
+            return self._get_estadisticas().total()
+        return math.fsum(self.consultar(nombre) for nombre in self._get_indice_nombres().con_prefijo(prefijo))
 
     def maximo(self) -> str:
         """
@@ -155,15 +503,10 @@ class Inventario:
         if self._get_longitud() == 0:
             raise InventarioError("Imposible encontrar al máximo, el inventario está vacío.")
 
-        nombre_max : str = self._get_nombres()[0]
-        maximo : float = self._get_valores()[0]
-
-        for i in range(1, self._get_longitud()):
-            if self._get_valores()[i] > maximo:
-                maximo = self._get_valores()[i]
-                nombre_max = self._get_nombres()[i]
+        if self._usa_numpy() and not self._get_estadisticas().monticulos_construidos():
+            return self._get_nombres()[self._posicion_extremo(True)]
 
-        return nombre_max
+        return self._get_estadisticas().maximo(self.consultar, self._pares)
 
     def minimo(self) -> str:
         """
@@ -180,20 +523,129 @@ class Inventario:
         if self._get_longitud() == 0:
             raise InventarioError("Imposible encontrar al mínimo, el inventario está vacío.")
 
-        nombre_min : str = self._get_nombres()[0]
-        minimo : float = self._get_valores()[0]
+        if self._usa_numpy() and not self._get_estadisticas().monticulos_construidos():
+            return self._get_nombres()[self._posicion_extremo(False)]
 
-        for i in range(1, self._get_longitud()):
-            if self._get_valores()[i] < minimo:
-                minimo = self._get_valores()[i]
-                nombre_min= self._get_nombres()[i]
+        return self._get_estadisticas().minimo(self.consultar, self._pares)
 
-        return nombre_min
+    #En modo compacto, mientras no haya montículos, un argmax de NumPy (~1 ms con un millón
+    #de elementos) sale mucho más barato que construirlos recorriendo los valores en Python (~1 s).
+    def _posicion_extremo(self, maximo: bool) -> int:
+        """
+        Posición del valor máximo (o mínimo) del buffer compacto de NumPy.
+        Las lápidas valen 0.0 y los valores vivos son > 0: nunca son el máximo,
+        y para el mínimo se descartan enmascarándolas.
+
+        Parámetros -> maximo: bool
+
+        Return -> posicion: int
+
+        Exception -> None
+        """
 
-    #Usamos inserción
+        valores = self._get_valores()[:self._get_ocupadas()]
+        if maximo:
+            return int(valores.argmax())
+
+        if self._get_lapidas() > 0:
+            valores = np.where(valores > 0, valores, np.inf)
+        return int(valores.argmin())
+
+    def top(self, k: int, descendente: bool = True) -> list[tuple[str, float]]:
+        """
+        Devuelve los k elementos de mayor valor (o de menor si descendente es False)
+        como pares (nombre, valor), sin ordenar el inventario entero.
+
+        Parámetros ->
+            k: int
+            descendente: bool (True por defecto)
+
+        Return -> lista_pares: list[tuple[str, float]]
+
+        Exception -> InventarioError si k < 0.
+        """
+
+        if k < 0:
+            raise InventarioError("El número de elementos pedido ha de ser mayor o igual a 0.")
+
+        return self._get_estadisticas().primeros(k, descendente, self.consultar, self._pares)
+
+    def rango(self, valor_minimo: float, valor_maximo: float) -> list[tuple[str, float]]:
+        """
+        Devuelve los pares (nombre, valor) con valor_minimo ≤ valor ≤ valor_maximo,
+        ordenados por valor (y por nombre a igualdad de valor).
+        La primera consulta por valor crea el índice ordenado en O(n log n); desde
+        entonces cada modificación lo mantiene y cada consulta cuesta O(log n + k).
+
+        Parámetros ->
+            valor_minimo: float
+            valor_maximo: float
+
+        Return -> lista_pares: list[tuple[str, float]]
+
+        Exception -> None
+        """
+
+        return list(self._get_indice_valores().rango(valor_minimo, valor_maximo))
+
+    def contar_rango(self, valor_minimo: float, valor_maximo: float) -> int:
+        """
+        Devuelve cuántos elementos tienen valor_minimo ≤ valor ≤ valor_maximo,
+        usando el índice ordenado por valor (ver rango).
+
+        Parámetros ->
+            valor_minimo: float
+            valor_maximo: float
+
+        Return -> cantidad: int
+
+        Exception -> None
+        """
+
+        return self._get_indice_valores().contar(valor_minimo, valor_maximo)
+
+    def buscar_prefijo(self, prefijo: str, limite: int | None = None) -> list[tuple[str, float]]:
+        """
+        Devuelve los pares (nombre, valor) cuyo nombre empieza por prefijo, en orden
+        alfabético y como mucho limite de ellos (todos si limite es None), para
+        autocompletar. La primera búsqueda crea el índice de nombres ordenados en
+        O(n log n); desde entonces cada alta o baja lo mantiene y cada búsqueda
+        cuesta O(log n + k) para k resultados.
+
+        Parámetros ->
+            prefijo: str
+            limite: int | None (None por defecto)
+
+        Return -> lista_pares: list[tuple[str, float]]
+
+        Exception -> InventarioError si limite es negativo
+        """
+
+        if limite is not None and limite < 0:
+            raise InventarioError("El límite de resultados ha de ser mayor o igual a 0.")
+
+        nombres = islice(self._get_indice_nombres().con_prefijo(prefijo), limite)
+        return [(nombre, self.consultar(nombre)) for nombre in nombres]
+
+    def por_valor(self, descendente: bool = False) -> Vista:
+        """
+        Vista perezosa de los pares (nombre, valor) ordenados por valor, leída del
+        índice ordenado por valor (ver rango); a igualdad de valor, por nombre.
+
+        Parámetros -> descendente: bool (False por defecto)
+
+        Return -> vista: Vista de tuple[str, float]
+
+        Exception -> None
+        """
+
+        return Vista(self, lambda: self._get_indice_valores().recorrer(descendente))
+
+    #Usamos una ordenación estable: Timsort sobre las posiciones, o argsort de NumPy en modo compacto.
     def ordenar_por_valor(self, descendente: bool = False) -> list[str]:
         """
-        Devuelve la lista de nombres ordenada según su valor usando inserción.
+        Devuelve la lista de nombres ordenada según su valor.
+        A igualdad de valor se respeta el orden de inserción.
 
         Parámetros -> descendente: bool (False por defecto)
 
@@ -202,46 +654,90 @@ class Inventario:
         Exception -> None
         """
 
-        #Creamos dos listas de nombres y valores vacías que son copias de los del inventario.
-        #Lo hacemos para no modificar el propio inventario cuando lo ordenamos.
+        #Ordenamos posiciones en lugar de mover los datos, sobre los arrays ya sin lápidas.
+        self._compactar_lapidas(forzar=True)
         l = self._get_longitud()
-        nombres : list[str | None] = [None] * l
-        valores : list[float | None] = [None] * l
+        nombres = self._get_nombres()
+        valores = self._get_valores()
 
-        for i in range(l):
-            nombres[i] = self._get_nombres()[i]
-            valores[i] = self._get_valores()[i]
+        if self._usa_numpy():
+            claves = -valores[:l] if descendente else valores[:l]
+            orden = claves.argsort(kind="stable")
+        else:
+            orden = sorted(range(l), key=valores.__getitem__, reverse=descendente)
+
+        return [nombres[i] for i in orden]
 
-        # Ordenación por inserción
-        for i in range(1, l):
-            key_nombre = nombres[i]
-            key_valor = valores[i]
-            j = i - 1
+    def items(self) -> Vista:
+        """
+        Vista perezosa de los pares (nombre, valor), en orden de inserción,
+        leídos directamente de los arrays (sin consultar cada nombre).
+
+        Parámetros -> self: Inventario
+
+        Return -> vista: Vista de tuple[str, float]
+
+        Exception -> None
+        """
+
+        return Vista(self, self._pares)
+
+    def nombres(self) -> Vista:
+        """
+        Vista perezosa de los nombres, en orden de inserción.
+
+        Parámetros -> self: Inventario
 
-            while j >= 0 and ((not descendente and valores[j] > key_valor) or
-                              (descendente and valores[j] < key_valor)):
-                valores[j + 1] = valores[j]
-                nombres[j + 1] = nombres[j]
-                j -= 1
+        Return -> vista: Vista de str
 
-            valores[j + 1] = key_valor
-            nombres[j + 1] = key_nombre
+        Exception -> None
+        """
+
+        return Vista(self, self._recorrer_nombres)
+
+    def valores(self) -> Vista:
+        """
+        Vista perezosa de los valores, en el mismo orden que nombres().
+
+        Parámetros -> self: Inventario
+
+        Return -> vista: Vista de float
+
+        Exception -> None
+        """
 
-        return nombres
+        return Vista(self, self._recorrer_valores)
 
     def copiar(self) -> 'Inventario':
         """
-        Crea y retorna una copia profunda del inventario.
+        Crea y retorna una copia independiente del inventario en O(1).
+        La copia comparte los arrays, el índice y las estadísticas con el original
+        (copy-on-write): cada parte se copia la primera vez que uno de los dos la
+        modifica, y sólo las partes que esa modificación toca.
 
         Parámetros -> self: Inventario
 
-        Return -> copia_profunda: Inventario
+        Return -> copia: Inventario
 
         Exception -> None
         """
 
-        copia_profunda = deepcopy(self)
-        return copia_profunda
+        #La copia no hereda el diario ni los suscriptores de cambios.
+        copia = Inventario(self._es_compacto(), self._get_factor_crecimiento())
+        copia._set_capacidad(self._get_capacidad())
+        copia._set_reserva(self._get_reserva())
+        copia._capacidad_maxima = self._get_capacidad()
+        copia._set_nombres(self._get_nombres())
+        copia._set_valores(self._get_valores())
+        copia._set_longitud(self._get_longitud())
+        copia._set_ocupadas(self._get_ocupadas())
+        copia._set_indice(self._get_indice())
+        copia._set_estadisticas(self._get_estadisticas())
+
+        #A partir de ahora ninguno de los dos es el único dueño de nada.
+        copia._set_partes_propias(set())
+        self._set_partes_propias(set())
+        return copia
 
     # ============================= MODIFICADORES =============================
 
@@ -263,41 +759,29 @@ class Inventario:
         if valor <= 0:
             raise InventarioError(f"Valor debe ser mayor a 0.")
 
-        nombres = self._get_nombres()
-        valores = self._get_valores()
-        l = self._get_longitud()
-
-        if self.existe(nombre):
-
-            i: int = 0
-            while i < l:
-                if nombres[i] == nombre:
-                    valores[i] += valor
-                    return
-                i += 1
-        else:
-            if self.inventario_lleno():
-                nueva_capacidad = self._get_capacidad() * 2
-                nuevos_nombres : list[str | None] = [None] * nueva_capacidad
-                nuevos_valores : list[float | None] = [None] * nueva_capacidad
-
-                for i in range(l):
-                    nuevos_nombres[i] = nombres[i]
-                    nuevos_valores[i] = valores[i]
-
-                nuevos_nombres[l] = nombre
-                nuevos_valores[l] = valor
-
-                self._set_capacidad(nueva_capacidad)
-                self._set_nombres(nuevos_nombres)
-                self._set_valores(nuevos_valores)
-                self._incrementar_longitud()
-
-            else:
-                nombres[l] = nombre
-                valores[l] = valor
-
-                self._incrementar_longitud()
+        self._agregar_validado(nombre, valor)
+
+    def _agregar_validado(self, nombre: str, valor: float) -> None:
+        #Lógica de agregar una vez comprobado que valor > 0.
+        i = self._get_indice().get(nombre)
+        if i is not None:
+            self._preparar_escritura("_valores")
+            anterior = self._get_valores()[i]
+            self._get_valores()[i] = anterior + valor
+            self._registrar_cambio(nombre, anterior, anterior + valor)
+            return
+
+        if self.inventario_lleno():
+            self._asegurar_capacidad(self._get_ocupadas() + 1)
+        self._preparar_escritura("_nombres", "_valores", "_indice")
+
+        l = self._get_ocupadas()
+        self._get_nombres()[l] = nombre
+        self._get_valores()[l] = valor
+        self._get_indice()[nombre] = l
+        self._set_ocupadas(l + 1)
+        self._incrementar_longitud()
+        self._registrar_cambio(nombre, None, valor)
 
     def actualizar(self, nombre: str, nuevo_valor: float) -> None:
         """
@@ -316,15 +800,34 @@ class Inventario:
 
         if nuevo_valor <= 0:
             raise InventarioError(f"Valor debe ser mayor a 0.")
-        elif not self.existe(nombre):
+
+        i = self._get_indice().get(nombre)
+        if i is None:
             raise InventarioError(f"Nombre '{nombre}' no encontrado en el inventario.")
+
+        self._preparar_escritura("_valores")
+        anterior = self._get_valores()[i]
+        self._get_valores()[i] = nuevo_valor
+        self._registrar_cambio(nombre, anterior, nuevo_valor)
+
+    def fijar(self, nombre: str, valor: float) -> None:
+        """
+        Deja el elemento nombre con el valor indicado, exista o no: lo actualiza
+        si existe y lo agrega si no. Es lo que aplican el diario y las réplicas.
+
+        Parámetros ->
+            nombre: str
+            valor: float
+
+        Return -> None
+
+        Excepciones -> InventarioError si valor ≤ 0.
+        """
+
+        if self.existe(nombre):
+            self.actualizar(nombre, valor)
         else:
-            i: int = 0
-            while i < self._get_longitud():
-                if self._get_nombres()[i] == nombre:
-                    self._get_valores()[i] = nuevo_valor
-                    return
-                i += 1
+            self.agregar(nombre, valor)
 
     #Aquí hay que comprobar que la cantidad a eliminar sea <= 0, ¿no? En el enunciado se les ha olvidado.
     def eliminar(self, nombre: str, cantidad : float = 1.0) -> None:
@@ -343,52 +846,59 @@ class Inventario:
             InventarioError si cantidad < 0.
         """
 
-        if not self.existe(nombre):
+        indice = self._get_indice()
+        i = indice.get(nombre)
+
+        if i is None:
             raise InventarioError("El elemento que se quiere eliminar no está en el inventario.")
         elif cantidad < 0:
             raise InventarioError(f"Valor a eliminar ha de ser mayor o igual a 0.")
 
-        nombres = self._get_nombres()
-        valores = self._get_valores()
-        l = self._get_longitud()
-
-        for i in range(l):
-            if nombres[i] == nombre:
-                if cantidad >= valores[i]:
-                    for j in range(i, l-1):
-                        nombres[j] = nombres[j+1]
-                        valores[j] = valores[j+1]
-
-                    nombres[l-1] = None
-                    valores[l-1] = None
-                    self._decrementar_longitud()
-                else:
-                    valores[i] -= cantidad
-                return
-
-    def fusionar(self, otro_inventario : 'Inventario') -> None:
+        anterior = self._get_valores()[i]
+
+        if cantidad < anterior:
+            self._preparar_escritura("_valores")
+            self._get_valores()[i] = anterior - cantidad
+            self._registrar_cambio(nombre, anterior, anterior - cantidad)
+            return
+
+        #Dejamos una lápida en su posición en lugar de desplazar los posteriores.
+        self._preparar_escritura("_nombres", "_valores", "_indice")
+        self._get_nombres()[i] = None
+        self._get_valores()[i] = self._hueco()
+        del self._get_indice()[nombre]
+        self._decrementar_longitud()
+        self._registrar_cambio(nombre, anterior, None)
+        self._reducir_si_conviene()
+        self._compactar_lapidas()
+
+    def fusionar(self, otro) -> None:
         """
-        Modifica el inventario actual añadiendo los elementos del inventario otro.
-        Si un elemento existe en ambos, sus valores se suman.
+        Modifica el inventario actual añadiendo los elementos de otro, que puede ser
+        un Inventario (de cualquiera de los dos módulos) o cualquier iterable de pares
+        (nombre, valor). Si un elemento existe en ambos, sus valores se suman.
+        Se recorre otro una sola vez y se aplica como un lote: o entran todos o ninguno.
 
-        Parámetros -> otro_inventario: Inventario
+        Parámetros -> otro: Inventario | Iterable[tuple[str, float]]
 
         Return -> None
 
-        Exception -> InventarioError si otro_inventario no es un Inventario.
+        Exception -> InventarioError si otro no es un inventario ni un iterable de pares,
+        o si algún valor ≤ 0.
         """
 
-        if not isinstance(otro_inventario, Inventario):
-            raise InventarioError("El inventario proporcionado no es de tipo Inventario")
+        pares = otro._pares() if hasattr(otro, "_pares") else otro
 
-        for nombre in otro_inventario:
-            valor_otro: float = otro_inventario.consultar(nombre)
-            self.agregar(nombre, valor_otro)
+        try:
+            self.agregar_lote(pares)
+        except (TypeError, ValueError):
+            raise InventarioError("El objeto a fusionar no es un Inventario ni un iterable de pares (nombre, valor)")
 
-    def diferencia(self, otro_inventario: 'Inventario') -> None:
+    def diferencia(self, otro_inventario) -> None:
         """
-        Resta al inventario actual los valores del inventario proporcionado.
-        Elementos que lleguen a valor ≤ 0 se eliminan.
+        Resta al inventario actual los valores del inventario proporcionado
+        (de cualquiera de los dos módulos). Elementos que lleguen a valor ≤ 0 se eliminan
+        y los que no estén en el inventario actual se ignoran.
 
         Parámetros -> otro_inventario: Inventario
 
@@ -397,15 +907,12 @@ class Inventario:
         Exception -> InventarioError si otro_inventario no es Inventario.
         """
 
-        if not isinstance(otro_inventario, Inventario):
+        if not hasattr(otro_inventario, "_pares"):
             raise InventarioError("El inventario proporcionado no es de tipo Inventario")
 
-        otros_nombres = otro_inventario._get_nombres()
-        otros_valores = otro_inventario._get_valores()
-
-        for i in range(otro_inventario._get_longitud()):
-            if self.existe(otros_nombres[i]):
-                self.eliminar(otros_nombres[i], otros_valores[i])
+        #Una pasada por otro cruzándolo con el índice; los comunes se restan como un lote.
+        indice = self._get_indice()
+        self.eliminar_lote([(nombre, valor) for nombre, valor in otro_inventario._pares() if nombre in indice])
 
     def vaciar(self) -> None:
         """
@@ -418,26 +925,217 @@ class Inventario:
         Exception -> None
         """
 
-        for i in range(self._get_longitud()):
-            self._get_nombres()[i] = None
-            self._get_valores()[i] = None
+        l = self._get_ocupadas()
+        if self._get_partes_propias() == set(Inventario._PARTES):
+            self._get_nombres()[:l] = [None] * l
+            self._get_valores()[:l] = self._nuevo_buffer_valores(l)
+            self._get_indice().clear()
+            self._get_estadisticas().vaciar()
+        else:
+            #Si se comparte algo con una copia, se empieza con partes nuevas en vez de copiarlas.
+            self._set_nombres([None] * self._get_capacidad())
+            self._set_valores(self._nuevo_buffer_valores(self._get_capacidad()))
+            self._set_indice({})
+            self._set_estadisticas(Estadisticas())
+            self._set_partes_propias(set(Inventario._PARTES))
 
         self._set_longitud(0)
+        self._set_ocupadas(0)
+        self._indice_valores = None
+        self._indice_nombres = None
+        self._reducir_si_conviene()
+
+        if self._get_diario() is not None:
+            self._get_diario().anotar_vaciado()
+
+        if self._flujo_cambios is not None:
+            self._flujo_cambios.emitir_vaciado()
+
+    def reservar(self, n : int) -> None:
+        """
+        Prepara el inventario para contener n elementos sin redimensionar: si la
+        capacidad es menor se amplía de una vez a n. Además, la capacidad no se
+        reducirá automáticamente por debajo de n (reservar(0) quita la reserva).
+
+        Parámetros -> n: int
+
+        Return -> None
+
+        Exception -> InventarioError si n < 0.
+        """
+
+        if n < 0:
+            raise InventarioError("El número de elementos a reservar ha de ser mayor o igual a 0.")
+
+        self._set_reserva(n)
+        if n > self._get_capacidad():
+            self._redimensionar(n)
+
+    # ============================= MODIFICADORES POR LOTES =============================
+
+    def agregar_lote(self, pares) -> None:
+        """
+        Agrega de una vez todos los pares (nombre, valor) proporcionados.
+        Los nombres repetidos dentro del lote se acumulan antes de aplicarlo.
+        Se valida todo el lote antes de modificar nada: o entran todos o ninguno.
+
+        Parámetros -> pares: Iterable[tuple[str, float]]
+
+        Return -> None
+
+        Excepciones ->
+            InventarioError si algún valor ≤ 0.
+        """
+
+        lote : dict[str, float] = {}
+        for nombre, valor in pares:
+            if valor <= 0:
+                raise InventarioError(f"Valor debe ser mayor a 0.")
+            lote[nombre] = lote.get(nombre, 0) + valor
+
+        #Reservamos sitio para todos los nombres nuevos con una única redimensión.
+        nuevos = [nombre for nombre in lote if nombre not in self._get_indice()]
+        self._asegurar_capacidad(self._get_ocupadas() + len(nuevos))
+
+        if nuevos:
+            self._preparar_escritura("_nombres", "_valores", "_indice")
+        else:
+            self._preparar_escritura("_valores")
+        indice = self._get_indice()
+        valores = self._get_valores()
+        for nombre, valor in lote.items():
+            i = indice.get(nombre)
+            if i is not None:
+                anterior = valores[i]
+                valores[i] = anterior + valor
+                self._registrar_cambio(nombre, anterior, anterior + valor)
+
+        #Los nombres nuevos se copian en bloque tras la última posición ocupada.
+        l = self._get_ocupadas()
+        k = len(nuevos)
+        valores_nuevos = [lote[nombre] for nombre in nuevos]
+
+        self._get_nombres()[l:l+k] = nuevos
+        valores[l:l+k] = array('d', valores_nuevos) if self._es_compacto() else valores_nuevos
+        indice.update(zip(nuevos, range(l, l+k)))
+        self._set_ocupadas(l + k)
+        self._set_longitud(self._get_longitud() + k)
+
+        for nombre, valor in zip(nuevos, valores_nuevos):
+            self._registrar_cambio(nombre, None, valor)
+
+    def _validar_actualizar_lote(self, pares) -> dict[str, float]:
+        #Valida un lote de actualizar_lote sin aplicarlo y lo devuelve agrupado por nombre.
+        indice = self._get_indice()
+        lote : dict[str, float] = {}
+        for nombre, nuevo_valor in pares:
+            if nuevo_valor <= 0:
+                raise InventarioError(f"Valor debe ser mayor a 0.")
+            elif nombre not in indice:
+                raise InventarioError(f"Nombre '{nombre}' no encontrado en el inventario.")
+            lote[nombre] = nuevo_valor
+
+        return lote
+
+    def actualizar_lote(self, pares) -> None:
+        """
+        Sustituye de una vez los valores de todos los pares (nombre, nuevo_valor).
+        Si un nombre se repite en el lote, prevalece su último valor.
+        Se valida todo el lote antes de modificar nada: o se aplican todos o ninguno.
+
+        Parámetros -> pares: Iterable[tuple[str, float]]
+
+        Return -> None
+
+        Excepciones ->
+            InventarioError si algún nombre no existe.
+            InventarioError si algún nuevo_valor ≤ 0.
+        """
+
+        lote = self._validar_actualizar_lote(pares)
+
+        self._preparar_escritura("_valores")
+        indice = self._get_indice()
+        valores = self._get_valores()
+        for nombre, nuevo_valor in lote.items():
+            i = indice[nombre]
+            anterior = valores[i]
+            valores[i] = nuevo_valor
+            self._registrar_cambio(nombre, anterior, nuevo_valor)
+
+    def _validar_eliminar_lote(self, pares) -> dict[str, float]:
+        #Valida un lote de eliminar_lote sin aplicarlo y lo devuelve agrupado por nombre.
+        indice = self._get_indice()
+        lote : dict[str, float] = {}
+        for nombre, cantidad in pares:
+            if nombre not in indice:
+                raise InventarioError("El elemento que se quiere eliminar no está en el inventario.")
+            elif cantidad < 0:
+                raise InventarioError(f"Valor a eliminar ha de ser mayor o igual a 0.")
+            lote[nombre] = lote.get(nombre, 0) + cantidad
+
+        return lote
+
+    def eliminar_lote(self, pares) -> None:
+        """
+        Resta de una vez las cantidades de todos los pares (nombre, cantidad).
+        Las cantidades de un mismo nombre se acumulan antes de aplicarlas y los
+        elementos que lleguen a valor ≤ 0 se retiran dejando lápidas.
+        Se valida todo el lote antes de modificar nada: o se aplican todos o ninguno.
+
+        Parámetros -> pares: Iterable[tuple[str, float]]
+
+        Return -> None
+
+        Excepciones ->
+            InventarioError si algún elemento no existe.
+            InventarioError si alguna cantidad < 0.
+        """
+
+        lote = self._validar_eliminar_lote(pares)
+
+        #Los nombres y el índice sólo se tocan si algún elemento llega a retirarse.
+        indice = self._get_indice()
+        valores = self._get_valores()
+        if any(cantidad >= valores[indice[nombre]] for nombre, cantidad in lote.items()):
+            self._preparar_escritura("_nombres", "_valores", "_indice")
+        else:
+            self._preparar_escritura("_valores")
+
+        indice = self._get_indice()
+        nombres = self._get_nombres()
+        valores = self._get_valores()
+
+        for nombre, cantidad in lote.items():
+            i = indice[nombre]
+            anterior = valores[i]
+            if cantidad < anterior:
+                valores[i] = anterior - cantidad
+                self._registrar_cambio(nombre, anterior, anterior - cantidad)
+            else:
+                #Dejamos una lápida; si se acumulan demasiadas se compacta una vez al final.
+                nombres[i] = None
+                valores[i] = self._hueco()
+                del indice[nombre]
+                self._decrementar_longitud()
+                self._registrar_cambio(nombre, anterior, None)
+
+        self._reducir_si_conviene()
+        self._compactar_lapidas()
 
     # ============================= PERSISTENCIA =============================
-    def cargar(self, ruta : str = "inventario.csv") -> None:
+    def _leer_csv(self, ruta : str):
         """
-        Carga los elementos desde un archivo CSV y los fusiona con el inventario actual.
+        Recorre en streaming los pares (nombre, valor) válidos de un archivo CSV.
+        Las filas con valor ≤ 0 se ignoran; cualquier otra fila incorrecta es un error.
 
         Parámetros -> ruta: str (ruta al archivo CSV)
 
-        Return -> None
+        Return -> pares: Iterator[tuple[str, float]]
 
         Exception -> InventarioError si el archivo no existe o su formato es incorrecto.
         """
 
-        inventario_en_archivo : 'Inventario' = Inventario()
-
         try:
             with open(ruta, "r", newline="", encoding="utf-8") as archivo:
                 reader = csv.reader(archivo, delimiter=",")
@@ -449,12 +1147,12 @@ class Inventario:
                     nombre, valor_str = row
                     try:
                         valor = float(valor_str)
-                        if valor > 0:
-                            inventario_en_archivo.agregar(nombre, valor)
-
                     except ValueError:
                         raise InventarioError(f"Valor no numérico en el archivo CSV: '{valor_str}'")
 
+                    if valor > 0:
+                        yield nombre, valor
+
         except FileNotFoundError:
             raise InventarioError(f"El archivo '{ruta}' no existe.")
         except InventarioError as e:
@@ -462,7 +1160,57 @@ class Inventario:
         except Exception as e:
             raise InventarioError(f"Error al cargar el archivo CSV en {ruta}: {e}")
 
-        self.fusionar(inventario_en_archivo)
+    def cargar(self, ruta : str = "inventario.csv") -> None:
+        """
+        Carga los elementos desde un archivo CSV y los fusiona con el inventario actual.
+        El archivo se valida entero antes de modificar el inventario.
+
+        Parámetros -> ruta: str (ruta al archivo CSV)
+
+        Return -> None
+
+        Exception -> InventarioError si el archivo no existe o su formato es incorrecto.
+        """
+
+        #Leemos todo el archivo antes de aplicar nada, para no dejar cargas a medias.
+        self.agregar_lote(list(self._leer_csv(ruta)))
+
+    def cargar_por_lotes(self, ruta : str = "inventario.csv", tamano_lote : int = 10000) -> dict[str, float]:
+        """
+        Carga un archivo CSV en streaming, aplicando las filas directamente en lotes
+        de tamano_lote sin construir un inventario intermedio. La validación es la
+        misma que en cargar, pero si una fila es incorrecta los lotes anteriores
+        ya se han aplicado.
+
+        Parámetros ->
+            ruta: str (ruta al archivo CSV)
+            tamano_lote: int (10000 por defecto)
+
+        Return -> estadisticas_carga: dict con "filas", "segundos" y "filas_por_segundo".
+
+        Exception -> InventarioError si el archivo no existe o su formato es incorrecto.
+        InventarioError si tamano_lote ≤ 0.
+        """
+
+        if tamano_lote <= 0:
+            raise InventarioError("El tamaño de lote ha de ser mayor a 0.")
+
+        inicio = time.perf_counter()
+        filas : int = 0
+        pares = self._leer_csv(ruta)
+
+        lote = list(islice(pares, tamano_lote))
+        while lote:
+            self.agregar_lote(lote)
+            filas += len(lote)
+            lote = list(islice(pares, tamano_lote))
+
+        segundos = time.perf_counter() - inicio
+        return {
+            "filas": filas,
+            "segundos": segundos,
+            "filas_por_segundo": filas / segundos if segundos > 0 else 0.0,
+        }
 
     def guardar(self, ruta : str = "inventario.csv") -> None:
         """
@@ -483,18 +1231,182 @@ class Inventario:
             #Si no existe, hacemos pass y guardamos el inventario actual tal cual.
             pass
 
+        #Escribimos sobre los arrays ya sin lápidas.
+        self._compactar_lapidas(forzar=True)
+
         try:
             with open(ruta, "w", newline="" ,encoding="utf-8") as archivo:
                 writer = csv.writer(archivo)
 
-                for i in range(self._get_longitud()):
-                    writer.writerow([self._get_nombres()[i], self._get_valores()[i]])
+                writer.writerows(self.items())
 
         except FileNotFoundError:
             raise InventarioError(f"El archivo '{ruta}' no existe.")
         except Exception as e:
             raise InventarioError(f"Error al guardar el archivo CSV en {ruta}: {e}")
 
+    def guardar_binario(self, ruta : str = "inventario.bin", ordenado : bool = False) -> None:
+        """
+        Guarda el inventario en el formato binario de formato_binario, sustituyendo
+        el archivo si existe. Con ordenado=True los nombres se escriben ordenados.
+
+        Parámetros ->
+            ruta: str
+            ordenado: bool (False por defecto)
+
+        Return -> None
+
+        Exception -> InventarioError si no se puede escribir en el archivo.
+        """
+
+        try:
+            formato_binario.escribir(ruta, self._pares(), ordenado)
+        except Exception as e:
+            raise InventarioError(f"Error al guardar el archivo binario en {ruta}: {e}")
+
+    def cargar_binario(self, ruta : str = "inventario.bin") -> None:
+        """
+        Carga los elementos desde un archivo binario y los fusiona con el inventario actual.
+
+        Parámetros -> ruta: str
+
+        Return -> None
+
+        Exception -> InventarioError si el archivo no existe o su formato es incorrecto.
+        """
+
+        try:
+            nombres, valores = formato_binario.leer(ruta)
+        except FileNotFoundError:
+            raise InventarioError(f"El archivo '{ruta}' no existe.")
+        except Exception as e:
+            raise InventarioError(f"Error al cargar el archivo binario en {ruta}: {e}")
+
+        self.agregar_lote(zip(nombres, valores))
+
+    def abrir_diario(self, ruta : str = "inventario.csv") -> None:
+        """
+        Activa la persistencia con diario. El inventario se vacía y se reconstruye
+        a partir de la instantánea CSV de ruta (si existe) y del diario ruta + ".log".
+        Desde ese momento cada modificación se añade al diario en cuanto ocurre.
+
+        Parámetros -> ruta: str (ruta de la instantánea CSV)
+
+        Return -> None
+
+        Exception -> InventarioError si ya hay un diario abierto o los archivos son incorrectos.
+        """
+
+        if self._get_diario() is not None:
+            raise InventarioError("El inventario ya tiene un diario abierto.")
+
+        self.vaciar()
+
+        if os.path.exists(ruta):
+            self.cargar(ruta)
+
+        try:
+            for operacion, nombre, valor in Diario.leer(ruta):
+                if operacion == Diario.FIJAR:
+                    self.fijar(nombre, valor)
+                elif operacion == Diario.BORRAR and self.existe(nombre):
+                    self.eliminar(nombre, self.consultar(nombre))
+                elif operacion == Diario.VACIAR:
+                    self.vaciar()
+
+            self._set_diario(Diario(ruta))
+        except InventarioError as e:
+            raise e
+        except Exception as e:
+            raise InventarioError(f"Error al leer el diario de {ruta}: {e}")
+
+    def compactar(self) -> None:
+        """
+        Vuelca el estado actual en la instantánea CSV y vacía el diario.
+
+        Parámetros -> self: Inventario
+
+        Return -> None
+
+        Exception -> InventarioError si no hay diario abierto o no se puede escribir.
+        """
+
+        if self._get_diario() is None:
+            raise InventarioError("El inventario no tiene un diario abierto.")
+
+        try:
+            self._get_diario().compactar(self._pares())
+        except Exception as e:
+            raise InventarioError(f"Error al compactar el diario de {self._get_diario().get_ruta_instantanea()}: {e}")
+
+    def cerrar_diario(self) -> None:
+        """
+        Cierra el diario abierto; el inventario deja de anotar sus cambios.
+
+        Parámetros -> self: Inventario
+
+        Return -> None
+
+        Exception -> None
+        """
+
+        if self._get_diario() is not None:
+            self._get_diario().cerrar()
+            self._set_diario(None)
+
+    def suscribir(self, sumidero) -> int:
+        """
+        Suscribe un sumidero al flujo de cambios del inventario (ver cambios.py): desde
+        ese momento cada modificación le llega como un Cambio numerado, para que una
+        Replica la aplique sobre otro inventario. Sin suscriptores no se emite nada.
+
+        Parámetros -> sumidero: objeto con recibir(cambio), p. ej. SumideroAnillo,
+                      SumideroArchivo o SumideroFlujo
+
+        Return -> secuencia: int, la del último cambio emitido antes de suscribirse
+
+        Exception -> None
+        """
+
+        if self._flujo_cambios is None:
+            self._flujo_cambios = FlujoCambios()
+        self._flujo_cambios.suscribir(sumidero)
+        return self._flujo_cambios.get_secuencia()
+
+    def desuscribir(self, sumidero) -> None:
+        """
+        Deja de enviar cambios al sumidero (o olvida uno desconectado por fallar,
+        ver sumideros_fallidos). La numeración continúa para el resto.
+
+        Parámetros -> sumidero: objeto suscrito con suscribir
+
+        Return -> None
+
+        Exception -> InventarioError si el sumidero no está suscrito
+        """
+
+        try:
+            self._flujo_cambios.desuscribir(sumidero)
+        except (AttributeError, ValueError):
+            raise InventarioError("El sumidero no está suscrito a los cambios del inventario.")
+
+    def sumideros_fallidos(self) -> list[tuple[object, Exception]]:
+        """
+        Devuelve los sumideros que fallaron al recibir un cambio, con la excepción que
+        lanzaron. Un fallo no interrumpe la modificación ni llega a quien la hizo: el
+        sumidero se desconecta y sus réplicas tendrán que resincronizarse.
+
+        Parámetros -> self: Inventario
+
+        Return -> fallidos: list[tuple[sumidero, Exception]]
+
+        Exception -> None
+        """
+
+        if self._flujo_cambios is None:
+            return []
+        return self._flujo_cambios.get_fallidos()
+
     # ============================= MÉTODOS MÁGICOS =============================
     def __len__(self) -> int:
         """
@@ -511,7 +1423,8 @@ class Inventario:
 
     def __iter__(self):
         """
-        Permite recorrer secuencialmente los nombres de los elementos del inventario.
+        Permite recorrer secuencialmente los nombres de los elementos del inventario,
+        en orden de inserción.
 
         Parámetros -> self: Inventario
 
@@ -520,8 +1433,7 @@ class Inventario:
         Exception -> None
         """
 
-        for i in range(self._get_longitud()):
-            yield self._get_nombres()[i]
+        return self._recorrer_nombres()
 
     def __str__(self) -> str:
         """
@@ -537,8 +1449,4 @@ class Inventario:
         if self._get_longitud() == 0:
             return "Inventario vacío"
 
-        resultado = "\nInventario:"
-        for nombre in self:
-            valor = self.consultar(nombre)
-            resultado += f"\n  {nombre}: {valor}"
-        return resultado
+        return "\nInventario:" + "".join(f"\n  {nombre}: {valor}" for nombre, valor in self.items())
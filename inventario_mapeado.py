@@ -0,0 +1,179 @@
+"""
+Inventario de solo lectura respaldado por un archivo binario ordenado abierto
+con mmap, pensado para catálogos de referencia demasiado grandes para tenerlos
+como objetos de Python.
+
+Las consultas se responden directamente desde las páginas mapeadas: los nombres
+se buscan por búsqueda binaria en la tabla de nombres y sólo se decodifican
+cuando se accede a ellos.
+"""
+from array import array
+import math
+import mmap
+import sys
+
+from errores import InventarioError
+import formato_binario
+
+
+class InventarioMapeado:
+
+    # ========================= CONSTRUCTOR =============================
+
+    def __init__(self, ruta: str):
+        """Abre un archivo binario guardado con ordenado=True."""
+        try:
+            with open(ruta, "rb") as archivo:
+                self._mapa: mmap.mmap = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            raise InventarioError(f"El archivo binario no existe en la ruta: {ruta}")
+        except Exception as e:
+            raise InventarioError(f"Error al mapear el archivo binario en {ruta}: {e}")
+
+        try:
+            banderas, n = formato_binario.leer_cabecera(self._mapa)
+            # Antes de crear las vistas: un archivo truncado no se puede interpretar
+            formato_binario.comprobar_tamano(self._mapa, n)
+        except ValueError as e:
+            self._mapa.close()
+            raise InventarioError(f"Error al mapear el archivo binario en {ruta}: {e}")
+
+        if not banderas & formato_binario.ORDENADO:
+            self._mapa.close()
+            raise InventarioError(f"El archivo binario {ruta} no está ordenado por nombre.")
+
+        inicio_valores, inicio_indice, inicio_tabla = formato_binario.desplazamientos(n)
+        self._longitud: int = n
+        self._inicio_tabla: int = inicio_tabla
+
+        vista: memoryview = memoryview(self._mapa)
+        if sys.byteorder == "little":
+            self._valores = vista[inicio_valores:inicio_indice].cast('d')
+            self._indice = vista[inicio_indice:inicio_tabla].cast('Q')
+        else:
+            # En máquinas big-endian las columnas numéricas se copian y se giran
+            self._valores = array('d', vista[inicio_valores:inicio_indice])
+            self._indice = array('Q', vista[inicio_indice:inicio_tabla])
+            self._valores.byteswap()
+            self._indice.byteswap()
+        vista.release()
+
+        # Agregados calculados la primera vez que se piden (los datos no cambian)
+        self._total: float | None = None
+        self._pos_maximo: int | None = None
+        self._pos_minimo: int | None = None
+
+    @classmethod
+    def desde_inventario(cls, inventario, ruta: str) -> 'InventarioMapeado':
+        """
+        Crea un InventarioMapeado a partir de un Inventario de cualquiera de los dos
+        módulos, guardándolo ordenado en ruta.
+        """
+        inventario.guardar_binario(ruta, ordenado=True)
+        return cls(ruta)
+
+    def cerrar(self) -> None:
+        """Libera el mapeo del archivo."""
+        if isinstance(self._valores, memoryview):
+            self._valores.release()
+            self._indice.release()
+        self._mapa.close()
+
+    def __enter__(self) -> 'InventarioMapeado':
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+
+    # ========================= ACCESO A LA TABLA =============================
+
+    def _get_longitud(self) -> int:
+        return self._longitud
+
+    def _nombre_bytes(self, i: int) -> bytes:
+        """Bytes UTF-8 del nombre i-ésimo, leídos del mapeo."""
+        inicio: int = self._inicio_tabla + self._indice[i] + formato_binario.LONGITUD_NOMBRE.size
+        fin: int = self._inicio_tabla + self._indice[i + 1]
+        return self._mapa[inicio:fin]
+
+    def _nombre(self, i: int) -> str:
+        return self._nombre_bytes(i).decode("utf-8")
+
+    def _buscar(self, nombre: str) -> int:
+        """Búsqueda binaria del nombre; devuelve su posición o -1 si no está."""
+        clave: bytes = nombre.encode("utf-8")
+        izquierda: int = 0
+        derecha: int = self._get_longitud()
+
+        while izquierda < derecha:
+            medio: int = (izquierda + derecha) // 2
+            if self._nombre_bytes(medio) < clave:
+                izquierda = medio + 1
+            else:
+                derecha = medio
+
+        if izquierda < self._get_longitud() and self._nombre_bytes(izquierda) == clave:
+            return izquierda
+        return -1
+
+    # ========================= MÉTODOS DE CONSULTA =============================
+
+    def consultar(self, nombre: str) -> float:
+        """Devuelve el valor actual del elemento nombre o 0.0 si no existe."""
+        i: int = self._buscar(nombre)
+        if i < 0:
+            return 0.0
+        return self._valores[i]
+
+    def existe(self, nombre: str) -> bool:
+        """Indica si el elemento nombre está presente en el inventario."""
+        return self._buscar(nombre) >= 0
+
+    def total_items(self) -> int:
+        """Retorna el número total de elementos distintos en el inventario."""
+        return self._get_longitud()
+
+    def cantidad_total(self) -> float:
+        """Retorna la suma de los valores de todos los elementos del inventario."""
+        if self._total is None:
+            self._total = math.fsum(self._valores)
+        return self._total
+
+    def maximo(self) -> str:
+        """Devuelve el elemento con el valor más alto."""
+        if self._get_longitud() == 0:
+            raise InventarioError("El inventario está vacío.")
+
+        if self._pos_maximo is None:
+            self._pos_maximo = max(range(self._get_longitud()), key=self._valores.__getitem__)
+        return self._nombre(self._pos_maximo)
+
+    def minimo(self) -> str:
+        """Devuelve el elemento con el valor más bajo."""
+        if self._get_longitud() == 0:
+            raise InventarioError("El inventario está vacío.")
+
+        if self._pos_minimo is None:
+            self._pos_minimo = min(range(self._get_longitud()), key=self._valores.__getitem__)
+        return self._nombre(self._pos_minimo)
+
+    # ========================= MÉTODOS MODIFICADORES =============================
+
+    def _solo_lectura(self, *args, **kwargs) -> None:
+        raise InventarioError("El inventario mapeado es de solo lectura.")
+
+    agregar = actualizar = eliminar = vaciar = fusionar = diferencia = _solo_lectura
+    agregar_lote = actualizar_lote = eliminar_lote = _solo_lectura
+
+    # ========================= MÉTODOS MÁGICOS =============================
+
+    def __len__(self) -> int:
+        return self.total_items()
+
+    def __iter__(self):
+        # Cada nombre se decodifica sólo cuando se pide
+        for i in range(self._get_longitud()):
+            yield self._nombre(i)
+
+    def __str__(self) -> str:
+        return f"InventarioMapeado de {self._get_longitud()} elementos"
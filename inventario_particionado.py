@@ -0,0 +1,477 @@
+"""
+Inventario particionado: reparte los nombres por hash entre N inventarios, cada
+uno dentro de su propio proceso trabajador, para usar varios núcleos.
+
+Las escrituras se agrupan por partición y se envían en lotes; las consultas
+agregadas se calculan en cada partición en paralelo y se combinan después.
+
+Ofrece las operaciones de datos de los dos Inventario: modificación (también
+por lotes), consultas y agregados, top, rango, buscar_prefijo, las vistas
+items/nombres/valores/por_valor, copiar y CSV. No ofrece lo que depende de un
+único almacenamiento local: el diario, el formato binario, las suscripciones
+de cambios ni la gestión de capacidad del inventario contiguo.
+
+Las altas con agregar y agregar_lote no esperan a su partición: si una
+partición rechaza un lote de altas, el error llega en la siguiente operación
+que espere a esa partición (ver agregar y sincronizar).
+"""
+import heapq
+from itertools import islice
+import math
+import multiprocessing
+import os
+import zlib
+
+from errores import InventarioError
+import inventario_contiguo
+from vistas import Vista
+
+
+# ========================= PROCESO TRABAJADOR =============================
+
+def _extremo(inventario, maximo: bool):
+    """(nombre, valor) del máximo o mínimo de la partición, o None si está vacía."""
+    if len(inventario) == 0:
+        return None
+    nombre: str = inventario.maximo() if maximo else inventario.minimo()
+    return nombre, inventario.consultar(nombre)
+
+
+def _validar(inventario, metodo: str, pares) -> None:
+    """Valida un lote con las reglas de la clase de la partición, sin aplicarlo."""
+    getattr(inventario, f"_validar_{metodo}")(pares)
+
+
+def _diferencia(inventario, pares) -> None:
+    otro = type(inventario)()
+    otro.agregar_lote(pares)
+    inventario.diferencia(otro)
+
+
+# Órdenes que no son métodos públicos del Inventario
+_ORDENES = {
+    "_pares": lambda inventario: list(inventario._pares()),
+    "_nombres": lambda inventario: list(inventario),
+    "_validar": _validar,
+    "_por_valor": lambda inventario, descendente: list(inventario.por_valor(descendente)),
+    "_maximo": lambda inventario: _extremo(inventario, True),
+    "_minimo": lambda inventario: _extremo(inventario, False),
+    "_diferencia": _diferencia,
+}
+
+
+def _trabajador(conexion, clase) -> None:
+    """Bucle del proceso trabajador: aplica las órdenes sobre su partición."""
+    inventario = clase()
+    while True:
+        mensaje = conexion.recv()
+        if mensaje is None:
+            break
+
+        orden, argumentos = mensaje
+        try:
+            if orden in _ORDENES:
+                resultado = _ORDENES[orden](inventario, *argumentos)
+            else:
+                resultado = getattr(inventario, orden)(*argumentos)
+            conexion.send((True, resultado))
+        except Exception as e:
+            conexion.send((False, str(e)))
+
+    conexion.close()
+
+
+def _por_valor_y_nombre(par: tuple[str, float]) -> tuple[float, str]:
+    """Orden del índice por valor de los Inventario: por valor y, a igualdad, por nombre."""
+    return par[1], par[0]
+
+
+# ========================= INVENTARIO PARTICIONADO =============================
+
+class InventarioParticionado:
+
+    # Lotes enviados a una partición sin esperar su confirmación
+    _LOTES_EN_VUELO: int = 2
+
+    # ========================= CONSTRUCTOR =============================
+
+    def __init__(self, particiones: int = None, clase=inventario_contiguo.Inventario,
+                 tamano_lote: int = 10000):
+        """
+        Arranca un proceso trabajador por partición, cada uno con un inventario
+        de la clase indicada (de cualquiera de los dos módulos).
+        """
+        if particiones is None:
+            particiones = os.cpu_count() or 1
+        if particiones <= 0:
+            raise InventarioError("El número de particiones debe ser mayor que 0.")
+        if tamano_lote <= 0:
+            raise InventarioError("El tamaño de lote debe ser mayor que 0.")
+
+        self._clase = clase
+        self._tamano_lote: int = tamano_lote
+        self._conexiones: list = []
+        self._procesos: list[multiprocessing.Process] = []
+        # Escrituras de agregar pendientes de enviar, por partición
+        self._pendientes: list[list[tuple[str, float]]] = [[] for _ in range(particiones)]
+        # Lotes enviados cuya confirmación aún no se ha leído, por partición
+        self._en_vuelo: list[int] = [0] * particiones
+
+        for _ in range(particiones):
+            extremo_padre, extremo_hijo = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(target=_trabajador, args=(extremo_hijo, clase), daemon=True)
+            proceso.start()
+            extremo_hijo.close()
+            self._conexiones.append(extremo_padre)
+            self._procesos.append(proceso)
+
+    def cerrar(self) -> None:
+        """
+        Envía las escrituras pendientes y termina los procesos trabajadores. No
+        espera la confirmación de los últimos lotes de altas: para saber si se han
+        aplicado, llama antes a sincronizar.
+        """
+        if not self._procesos:
+            return
+
+        self._enviar_pendientes()
+        for conexion in self._conexiones:
+            conexion.send(None)
+            conexion.close()
+        for proceso in self._procesos:
+            proceso.join()
+
+        self._conexiones = []
+        self._procesos = []
+
+    def __enter__(self) -> 'InventarioParticionado':
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+
+    # ========================= COMUNICACIÓN =============================
+
+    def _particiones(self) -> range:
+        return range(len(self._conexiones))
+
+    def _particion(self, nombre: str) -> int:
+        # crc32 es estable entre procesos, al contrario que hash() con cadenas
+        return zlib.crc32(nombre.encode("utf-8")) % len(self._conexiones)
+
+    def _recibir(self, i: int):
+        correcto, resultado = self._conexiones[i].recv()
+        self._en_vuelo[i] -= 1
+        if not correcto:
+            raise InventarioError(resultado)
+        return resultado
+
+    def _recibir_lote(self, i: int) -> None:
+        """
+        Lee la confirmación de un lote de altas enviado sin esperar (las demás
+        órdenes se envían con la tubería ya vacía y se leen en el momento).
+        """
+        try:
+            self._recibir(i)
+        except InventarioError as e:
+            raise InventarioError(f"La partición {i} ha rechazado un lote de altas enviado antes: {e}")
+
+    def _enviar(self, i: int, orden: str, *argumentos) -> None:
+        # Limitamos los lotes en vuelo para que ninguna tubería se llene en los dos sentidos
+        while self._en_vuelo[i] >= InventarioParticionado._LOTES_EN_VUELO:
+            self._recibir_lote(i)
+        self._conexiones[i].send((orden, argumentos))
+        self._en_vuelo[i] += 1
+
+    def _esperar(self, i: int) -> None:
+        """Lee todas las confirmaciones pendientes de la partición i."""
+        while self._en_vuelo[i] > 0:
+            self._recibir_lote(i)
+
+    def _enviar_pendientes_de(self, i: int) -> None:
+        if self._pendientes[i]:
+            self._enviar(i, "agregar_lote", self._pendientes[i])
+            self._pendientes[i] = []
+
+    def _enviar_pendientes(self) -> None:
+        for i in self._particiones():
+            self._enviar_pendientes_de(i)
+
+    def _llamar(self, i: int, orden: str, *argumentos):
+        """Ejecuta una orden en la partición i, respetando el orden de las escrituras previas."""
+        self._enviar_pendientes_de(i)
+        self._esperar(i)
+        self._enviar(i, orden, *argumentos)
+        return self._recibir(i)
+
+    def _llamar_todas(self, orden: str, argumentos_por_particion: list = None) -> list:
+        """Ejecuta una orden en todas las particiones en paralelo y devuelve sus resultados."""
+        self._enviar_pendientes()
+        for i in self._particiones():
+            self._esperar(i)
+
+        for i in self._particiones():
+            argumentos = argumentos_por_particion[i] if argumentos_por_particion is not None else ()
+            self._enviar(i, orden, *argumentos)
+
+        resultados: list = []
+        error: InventarioError = None
+        for i in self._particiones():
+            try:
+                resultados.append(self._recibir(i))
+            except InventarioError as e:
+                error = error or e
+        if error is not None:
+            raise error
+        return resultados
+
+    def _repartir(self, pares) -> list[list[tuple[str, float]]]:
+        repartidos: list[list[tuple[str, float]]] = [[] for _ in self._particiones()]
+        for nombre, valor in pares:
+            repartidos[self._particion(nombre)].append((nombre, valor))
+        return repartidos
+
+    def _pares(self):
+        for pares in self._llamar_todas("_pares"):
+            yield from pares
+
+    def sincronizar(self) -> None:
+        """
+        Envía las altas acumuladas y espera a que todas las particiones las hayan
+        aplicado. Lanza InventarioError si alguna rechazó un lote de altas.
+        """
+        self._enviar_pendientes()
+        for i in self._particiones():
+            self._esperar(i)
+
+    # ========================= MÉTODOS MODIFICADORES =============================
+
+    def agregar(self, nombre: str, valor: float = 1.0) -> None:
+        """
+        Añade el elemento nombre con el valor indicado. La escritura se acumula y se
+        envía a su partición junto con otras en un mismo lote, sin esperarla: aquí
+        sólo se comprueba el valor. Si la partición rechaza el lote (que entonces no
+        se aplica), el error se lanza en la siguiente operación que espere a esa
+        partición; sincronizar lo comprueba en un punto concreto.
+        """
+        if valor <= 0:
+            raise InventarioError("No se puede agregar un valor menor o igual a 0.")
+
+        i: int = self._particion(nombre)
+        self._pendientes[i].append((nombre, valor))
+        if len(self._pendientes[i]) >= self._tamano_lote:
+            self._enviar_pendientes_de(i)
+
+    def actualizar(self, nombre: str, nuevo_valor: float) -> None:
+        """Sustituye el valor actual del elemento nombre por nuevo_valor."""
+        self._llamar(self._particion(nombre), "actualizar", nombre, nuevo_valor)
+
+    def eliminar(self, nombre: str, cantidad: float = 1.0) -> None:
+        """Resta la cantidad indicada al elemento nombre; si llega a <= 0 se elimina."""
+        self._llamar(self._particion(nombre), "eliminar", nombre, cantidad)
+
+    def fijar(self, nombre: str, valor: float) -> None:
+        """Deja nombre con el valor indicado, exista o no."""
+        self._llamar(self._particion(nombre), "fijar", nombre, valor)
+
+    def agregar_lote(self, pares) -> None:
+        """
+        Agrega todos los pares (nombre, valor), validándolos antes de enviar nada.
+        Como en agregar, los lotes se envían sin esperar a las particiones.
+        """
+        pares = list(pares)
+        for _, valor in pares:
+            if valor <= 0:
+                raise InventarioError("No se puede agregar un valor menor o igual a 0.")
+
+        for i, pares_particion in enumerate(self._repartir(pares)):
+            self._pendientes[i].extend(pares_particion)
+            if len(self._pendientes[i]) >= self._tamano_lote:
+                self._enviar_pendientes_de(i)
+
+    def _aplicar_lote_validado(self, metodo: str, pares) -> None:
+        """
+        Reparte el lote y lo valida en todas las particiones, con las reglas de su
+        clase, antes de aplicarlo en ninguna: o se aplica entero o no se aplica.
+        """
+        repartidos = self._repartir(pares)
+        self._llamar_todas("_validar", [(metodo, pares_particion) for pares_particion in repartidos])
+        self._llamar_todas(metodo, [(pares_particion,) for pares_particion in repartidos])
+
+    def actualizar_lote(self, pares) -> None:
+        """
+        Sustituye los valores de todos los pares (nombre, nuevo_valor). Antes de aplicar
+        nada se comprueba que los valores sean válidos y que todos los nombres existan.
+        """
+        self._aplicar_lote_validado("actualizar_lote", pares)
+
+    def eliminar_lote(self, pares) -> None:
+        """
+        Resta las cantidades de todos los pares (nombre, cantidad). Antes de aplicar
+        nada se comprueba, con las reglas de la clase de las particiones, que las
+        cantidades sean válidas y que todos los nombres existan.
+        """
+        self._aplicar_lote_validado("eliminar_lote", pares)
+
+    def vaciar(self) -> None:
+        """Elimina todos los elementos del inventario."""
+        self._pendientes = [[] for _ in self._particiones()]
+        self._llamar_todas("vaciar")
+
+    def fusionar(self, otro) -> None:
+        """
+        Añade los elementos de otro inventario (de cualquier módulo, o particionado).
+        """
+        if not hasattr(otro, "_pares"):
+            raise InventarioError("El objeto a fusionar debe ser un inventario.")
+        self.agregar_lote(otro._pares())
+
+    def diferencia(self, otro) -> None:
+        """Resta los valores de los elementos contenidos en otro inventario."""
+        if not hasattr(otro, "_pares"):
+            raise InventarioError("El objeto para la diferencia debe ser un inventario.")
+        self._llamar_todas("_diferencia", [(pares,) for pares in self._repartir(otro._pares())])
+
+    # ========================= MÉTODOS DE PERSISTENCIA =============================
+
+    def cargar(self, ruta: str) -> None:
+        """
+        Carga un archivo CSV con las reglas de validación del módulo de la clase
+        de las particiones, enviando las filas en lotes a medida que se leen.
+        """
+        try:
+            self.agregar_lote(self._clase()._leer_csv(ruta))
+        except Exception as e:
+            raise InventarioError(str(e))
+
+    def guardar(self, ruta: str) -> None:
+        """Guarda el inventario en un archivo CSV, con la semántica de guardar de la clase."""
+        inventario = self._clase()
+        inventario.agregar_lote(self._pares())
+        try:
+            inventario.guardar(ruta)
+        except Exception as e:
+            raise InventarioError(str(e))
+
+    # ========================= MÉTODOS DE CONSULTA =============================
+
+    def consultar(self, nombre: str) -> float:
+        """Devuelve el valor actual del elemento nombre o 0.0 si no existe."""
+        return self._llamar(self._particion(nombre), "consultar", nombre)
+
+    def existe(self, nombre: str) -> bool:
+        """Indica si el elemento nombre está presente en el inventario."""
+        return self._llamar(self._particion(nombre), "existe", nombre)
+
+    def total_items(self) -> int:
+        """Retorna el número total de elementos distintos en el inventario."""
+        return sum(self._llamar_todas("total_items"))
+
+    def cantidad_total(self, prefijo: str | None = None) -> float:
+        """
+        Suma de los totales calculados en cada partición; con prefijo, sólo de los
+        elementos cuyo nombre empieza por él.
+        """
+        return math.fsum(self._llamar_todas("cantidad_total", [(prefijo,)] * len(self._conexiones)))
+
+    def maximo(self) -> str:
+        """Devuelve el elemento con el valor más alto entre los máximos de cada partición."""
+        candidatos = [par for par in self._llamar_todas("_maximo") if par is not None]
+        if not candidatos:
+            raise InventarioError("El inventario está vacío.")
+        return max(candidatos, key=lambda par: par[1])[0]
+
+    def minimo(self) -> str:
+        """Devuelve el elemento con el valor más bajo entre los mínimos de cada partición."""
+        candidatos = [par for par in self._llamar_todas("_minimo") if par is not None]
+        if not candidatos:
+            raise InventarioError("El inventario está vacío.")
+        return min(candidatos, key=lambda par: par[1])[0]
+
+    def top(self, k: int, descendente: bool = True) -> list[tuple[str, float]]:
+        """Combina los k primeros de cada partición."""
+        if k < 0:
+            raise InventarioError("El número de elementos pedido debe ser mayor o igual que 0.")
+
+        candidatos = [par for pares in self._llamar_todas("top", [(k, descendente)] * len(self._conexiones))
+                      for par in pares]
+        if descendente:
+            return heapq.nlargest(k, candidatos, key=lambda par: par[1])
+        return heapq.nsmallest(k, candidatos, key=lambda par: par[1])
+
+    def ordenar_por_valor(self, descendente: bool = False) -> list[str]:
+        """Devuelve los nombres ordenados por valor."""
+        pares = sorted(self._pares(), key=lambda par: par[1], reverse=descendente)
+        return [nombre for nombre, _ in pares]
+
+    def rango(self, valor_minimo: float, valor_maximo: float) -> list[tuple[str, float]]:
+        """
+        Devuelve los pares (nombre, valor) con valor_minimo <= valor <= valor_maximo,
+        ordenados por valor y nombre, mezclando los rangos de cada partición.
+        """
+        rangos = self._llamar_todas("rango", [(valor_minimo, valor_maximo)] * len(self._conexiones))
+        return list(heapq.merge(*rangos, key=_por_valor_y_nombre))
+
+    def contar_rango(self, valor_minimo: float, valor_maximo: float) -> int:
+        """Devuelve cuántos elementos tienen valor_minimo <= valor <= valor_maximo."""
+        return sum(self._llamar_todas("contar_rango", [(valor_minimo, valor_maximo)] * len(self._conexiones)))
+
+    def buscar_prefijo(self, prefijo: str, limite: int | None = None) -> list[tuple[str, float]]:
+        """
+        Devuelve los pares (nombre, valor) cuyo nombre empieza por prefijo, en orden
+        alfabético y como mucho limite de ellos (todos si limite es None). Cada
+        partición devuelve sus limite primeros y se mezclan.
+        """
+        if limite is not None and limite < 0:
+            raise InventarioError("El límite de resultados ha de ser mayor o igual a 0.")
+
+        encontrados = self._llamar_todas("buscar_prefijo", [(prefijo, limite)] * len(self._conexiones))
+        return list(islice(heapq.merge(*encontrados), limite))
+
+    # ========================= VISTAS Y COPIA =============================
+
+    # Cada recorrido de una vista pide los datos a las particiones en ese momento
+
+    def items(self) -> Vista:
+        """Vista de los pares (nombre, valor), partición a partición."""
+        return Vista(self, self._pares)
+
+    def nombres(self) -> Vista:
+        """Vista de los nombres, en el mismo orden que items()."""
+        return Vista(self, lambda: (nombre for nombre, _ in self._pares()))
+
+    def valores(self) -> Vista:
+        """Vista de los valores, en el mismo orden que nombres()."""
+        return Vista(self, lambda: (valor for _, valor in self._pares()))
+
+    def por_valor(self, descendente: bool = False) -> Vista:
+        """Vista de los pares (nombre, valor) ordenados por valor (y por nombre)."""
+        def recorrer():
+            ordenados = self._llamar_todas("_por_valor", [(descendente,)] * len(self._conexiones))
+            return heapq.merge(*ordenados, key=_por_valor_y_nombre, reverse=descendente)
+        return Vista(self, recorrer)
+
+    def copiar(self) -> 'InventarioParticionado':
+        """
+        Crea una copia independiente, con sus propios procesos trabajadores y el
+        mismo número de particiones. Al contrario que en los Inventario no es O(1):
+        los datos de cada partición se envían a la partición de la copia.
+        """
+        copia = InventarioParticionado(len(self._conexiones), self._clase, self._tamano_lote)
+        # Con el mismo número de particiones cada nombre cae en la misma
+        for i, pares in enumerate(self._llamar_todas("_pares")):
+            copia._pendientes[i] = pares
+        copia.sincronizar()
+        return copia
+
+    # ========================= MÉTODOS MÁGICOS =============================
+
+    def __len__(self) -> int:
+        return self.total_items()
+
+    def __iter__(self):
+        for nombres in self._llamar_todas("_nombres"):
+            yield from nombres
+
+    def __str__(self) -> str:
+        return f"InventarioParticionado de {len(self._conexiones)} particiones"
@@ -0,0 +1,113 @@
+"""
+Lista ordenada por bloques, genérica sobre el tipo de clave, en la que se
+apoyan los índices secundarios: el de valores (indice_valores) y el de
+nombres (indice_nombres). Las búsquedas devuelven posiciones para que cada
+índice recorra o cuente el tramo que le interesa.
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Iterator
+
+# Posición de un elemento: (bloque, desplazamiento dentro del bloque)
+Posicion = tuple[int, int]
+
+
+class ListaOrdenada:
+    """
+    Lista ordenada de claves distintas partida en bloques de como mucho
+    2 * _CARGA claves, con el máximo de cada bloque aparte para localizar el
+    bloque por búsqueda binaria.
+
+    Insertar o quitar una clave cuesta O(log n + _CARGA), y localizar una
+    posición O(log n); recorrer k claves desde ella cuesta O(k).
+    """
+
+    _CARGA: int = 256
+
+    def __init__(self, claves=()):
+        ordenadas: list = sorted(claves)
+        carga: int = ListaOrdenada._CARGA
+        self._bloques: list[list] = [ordenadas[i:i + carga] for i in range(0, len(ordenadas), carga)]
+        self._maximos: list = [bloque[-1] for bloque in self._bloques]
+        self._longitud: int = len(ordenadas)
+
+    def __len__(self) -> int:
+        return self._longitud
+
+    def __iter__(self) -> Iterator:
+        for bloque in self._bloques:
+            yield from bloque
+
+    def __reversed__(self) -> Iterator:
+        for bloque in reversed(self._bloques):
+            yield from reversed(bloque)
+
+    # ========================= ACTUALIZACIÓN =============================
+
+    def insertar(self, clave) -> None:
+        if not self._bloques:
+            self._bloques.append([clave])
+            self._maximos.append(clave)
+            self._longitud = 1
+            return
+
+        # Primer bloque cuyo máximo no es menor que la clave (o el último)
+        i: int = min(bisect_left(self._maximos, clave), len(self._bloques) - 1)
+        bloque: list = self._bloques[i]
+        insort(bloque, clave)
+        self._maximos[i] = bloque[-1]
+        self._longitud += 1
+
+        carga: int = ListaOrdenada._CARGA
+        if len(bloque) > 2 * carga:
+            self._bloques[i:i + 1] = [bloque[:carga], bloque[carga:]]
+            self._maximos[i:i + 1] = [bloque[carga - 1], bloque[-1]]
+
+    def quitar(self, clave) -> None:
+        """Quita una clave presente en la lista."""
+        i: int = bisect_left(self._maximos, clave)
+        bloque: list = self._bloques[i]
+        del bloque[bisect_left(bloque, clave)]
+        self._longitud -= 1
+
+        if bloque:
+            self._maximos[i] = bloque[-1]
+        else:
+            del self._bloques[i]
+            del self._maximos[i]
+
+    # ========================= POSICIONES =============================
+
+    def primera_no_menor(self, valor, key: Callable[[Any], Any] = None) -> Posicion:
+        """
+        Posición de la primera clave c con key(c) >= valor (o c >= valor sin key).
+        key ha de ser monótona respecto al orden de las claves.
+        """
+        i: int = bisect_left(self._maximos, valor, key=key)
+        if i == len(self._bloques):
+            return i, 0
+        return i, bisect_left(self._bloques[i], valor, key=key)
+
+    def primera_mayor(self, valor, key: Callable[[Any], Any] = None) -> Posicion:
+        """Posición de la primera clave c con key(c) > valor (o c > valor sin key)."""
+        i: int = bisect_right(self._maximos, valor, key=key)
+        if i == len(self._bloques):
+            return i, 0
+        return i, bisect_right(self._bloques[i], valor, key=key)
+
+    def entre(self, inicio: Posicion, fin: Posicion) -> Iterator:
+        """Recorre en orden las claves de las posiciones [inicio, fin)."""
+        i, j = inicio
+        while (i, j) < fin:
+            bloque: list = self._bloques[i]
+            hasta: int = fin[1] if i == fin[0] else len(bloque)
+            yield from bloque[j:hasta]
+            i, j = i + 1, 0
+
+    def contar_entre(self, inicio: Posicion, fin: Posicion) -> int:
+        """Número de claves de las posiciones [inicio, fin), sin recorrerlas."""
+        (i, j), (fin_i, fin_j) = inicio, fin
+        if (i, j) >= (fin_i, fin_j):
+            return 0
+        if i == fin_i:
+            return fin_j - j
+        return len(self._bloques[i]) - j + sum(len(bloque) for bloque in self._bloques[i + 1:fin_i]) + fin_j
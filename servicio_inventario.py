@@ -0,0 +1,304 @@
+"""
+Servicio asyncio que expone un Inventario (de cualquiera de los dos módulos)
+por TCP o por un socket Unix, y cliente asíncrono con pool de conexiones.
+
+Protocolo: una petición o respuesta JSON por línea.
+
+    petición    {"id": 7, "op": "agregar", "args": ["manzanas", 2.0]}
+    respuesta   {"id": 7, "ok": true, "resultado": null}
+                {"id": 7, "ok": false, "error": "mensaje"}
+
+Las peticiones se pueden encadenar sin esperar respuesta (pipelining): cada
+respuesta lleva el id de su petición. Los agregar/eliminar que llegan en la
+misma vuelta del bucle de eventos, de cualquier conexión, se aplican juntos con
+agregar_lote/eliminar_lote. Antes de cualquier otra operación se aplican las
+escrituras pendientes, así que cada cliente lee siempre lo que ya escribió.
+"""
+import asyncio
+import itertools
+import json
+
+from errores import InventarioError
+
+
+# Operaciones permitidas, por tipo
+_AGRUPABLES: set[str] = {"agregar", "eliminar"}
+_LECTURAS: set[str] = {"consultar", "existe", "total_items", "cantidad_total", "maximo", "minimo",
+                       "top", "ordenar_por_valor", "nombres"}
+_ESCRITURAS: set[str] = {"actualizar", "vaciar", "agregar_lote", "actualizar_lote", "eliminar_lote"}
+
+
+# ========================= SERVIDOR =============================
+
+class ServidorInventario:
+
+    def __init__(self, inventario):
+        self._inventario = inventario
+        self._servidor: asyncio.AbstractServer = None
+        # Escrituras agrupables pendientes: (op, nombre, valor, futuro)
+        self._pendientes: list[tuple[str, str, float, asyncio.Future]] = []
+        self._lotes_aplicados: int = 0
+
+    # ========================= ARRANQUE Y PARADA =============================
+
+    async def iniciar_tcp(self, host: str = "127.0.0.1", puerto: int = 0) -> tuple[str, int]:
+        """Escucha por TCP y devuelve la dirección real (puerto 0 = uno libre)."""
+        self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self._servidor.sockets[0].getsockname()[:2]
+
+    async def iniciar_unix(self, ruta: str) -> str:
+        """Escucha en un socket Unix."""
+        self._servidor = await asyncio.start_unix_server(self._atender, ruta)
+        return ruta
+
+    async def cerrar(self) -> None:
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+        self._aplicar_pendientes()
+
+    def get_lotes_aplicados(self) -> int:
+        """Número de lotes de escrituras agrupadas aplicados hasta ahora."""
+        return self._lotes_aplicados
+
+    # ========================= AGRUPACIÓN DE ESCRITURAS =============================
+
+    def _encolar(self, op: str, nombre: str, valor: float) -> asyncio.Future:
+        bucle = asyncio.get_running_loop()
+        if not self._pendientes:
+            # El lote se aplica al final de esta vuelta del bucle de eventos
+            bucle.call_soon(self._aplicar_pendientes)
+        futuro: asyncio.Future = bucle.create_future()
+        self._pendientes.append((op, nombre, valor, futuro))
+        return futuro
+
+    def _aplicar_pendientes(self) -> None:
+        pendientes, self._pendientes = self._pendientes, []
+
+        # Tramos consecutivos de la misma operación, cortando si un nombre se repite en
+        # un eliminar (restar dos veces por separado puede fallar y en lote no)
+        tramo: list = []
+        nombres_tramo: set[str] = set()
+        for escritura in pendientes:
+            op, nombre = escritura[0], escritura[1]
+            if tramo and (op != tramo[0][0] or (op == "eliminar" and nombre in nombres_tramo)):
+                self._aplicar_tramo(tramo)
+                tramo, nombres_tramo = [], set()
+            tramo.append(escritura)
+            nombres_tramo.add(nombre)
+        if tramo:
+            self._aplicar_tramo(tramo)
+
+    def _aplicar_tramo(self, tramo: list) -> None:
+        op: str = tramo[0][0]
+        try:
+            getattr(self._inventario, op + "_lote")([(nombre, valor) for _, nombre, valor, _ in tramo])
+            self._lotes_aplicados += 1
+            for *_, futuro in tramo:
+                if not futuro.done():
+                    futuro.set_result(None)
+        except Exception:
+            # El lote es atómico: si falla, nada se aplicó y repetimos una a una
+            # para devolver el error sólo a las peticiones que lo provocan
+            for _, nombre, valor, futuro in tramo:
+                try:
+                    getattr(self._inventario, op)(nombre, valor)
+                except Exception as e:
+                    if not futuro.done():
+                        futuro.set_exception(InventarioError(str(e)))
+                    continue
+                if not futuro.done():
+                    futuro.set_result(None)
+
+    # ========================= CONEXIONES =============================
+
+    def _ejecutar(self, op: str, args: list):
+        if op == "nombres":
+            return list(self._inventario)
+        resultado = getattr(self._inventario, op)(*args)
+        if op == "top":
+            return [list(par) for par in resultado]
+        return resultado
+
+    @staticmethod
+    def _responder(writer: asyncio.StreamWriter, id_peticion, futuro: asyncio.Future = None,
+                   resultado=None, error: str = None) -> None:
+        if futuro is not None:
+            error = str(futuro.exception()) if futuro.exception() is not None else None
+        if writer.is_closing():
+            return
+        if error is None:
+            respuesta = {"id": id_peticion, "ok": True, "resultado": resultado}
+        else:
+            respuesta = {"id": id_peticion, "ok": False, "error": error}
+        writer.write(json.dumps(respuesta).encode("utf-8") + b"\n")
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                linea: bytes = await reader.readline()
+                if not linea:
+                    break
+
+                try:
+                    peticion = json.loads(linea)
+                    id_peticion, op, args = peticion.get("id"), peticion["op"], peticion.get("args", [])
+                except Exception:
+                    ServidorInventario._responder(writer, None, error="Petición mal formada.")
+                    continue
+
+                if op in _AGRUPABLES and len(args) == 2:
+                    futuro = self._encolar(op, args[0], args[1])
+                    futuro.add_done_callback(
+                        lambda f, i=id_peticion: ServidorInventario._responder(writer, i, futuro=f))
+                elif op in _AGRUPABLES or op in _LECTURAS or op in _ESCRITURAS:
+                    self._aplicar_pendientes()
+                    try:
+                        resultado = self._ejecutar(op, args)
+                        ServidorInventario._responder(writer, id_peticion, resultado=resultado)
+                    except Exception as e:
+                        ServidorInventario._responder(writer, id_peticion, error=str(e))
+                else:
+                    ServidorInventario._responder(writer, id_peticion, error=f"Operación desconocida: {op}")
+
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+# ========================= CLIENTE =============================
+
+class _Conexion:
+    """Una conexión del pool: envía peticiones y reparte las respuestas por id."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._esperando: dict[int, asyncio.Future] = {}
+        self._lector: asyncio.Task = asyncio.create_task(self._leer())
+
+    async def _leer(self) -> None:
+        try:
+            while True:
+                linea: bytes = await self._reader.readline()
+                if not linea:
+                    break
+                respuesta = json.loads(linea)
+                futuro = self._esperando.pop(respuesta["id"], None)
+                if futuro is None or futuro.done():
+                    continue
+                if respuesta["ok"]:
+                    futuro.set_result(respuesta["resultado"])
+                else:
+                    futuro.set_exception(InventarioError(respuesta["error"]))
+        finally:
+            for futuro in self._esperando.values():
+                if not futuro.done():
+                    futuro.set_exception(InventarioError("Conexión cerrada por el servidor."))
+            self._esperando.clear()
+
+    def enviar(self, id_peticion: int, op: str, args: list) -> asyncio.Future:
+        futuro: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._esperando[id_peticion] = futuro
+        self._writer.write(json.dumps({"id": id_peticion, "op": op, "args": args}).encode("utf-8") + b"\n")
+        return futuro
+
+    async def drenar(self) -> None:
+        await self._writer.drain()
+
+    async def cerrar(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._lector
+
+
+class ClienteInventario:
+
+    def __init__(self, conexiones: list[_Conexion]):
+        self._conexiones: list[_Conexion] = conexiones
+        self._turno = itertools.cycle(conexiones)
+        self._ids = itertools.count()
+
+    @classmethod
+    async def conectar_tcp(cls, host: str = "127.0.0.1", puerto: int = 0,
+                           conexiones: int = 4) -> 'ClienteInventario':
+        """Abre un pool de conexiones TCP con el servidor."""
+        return cls([_Conexion(*await asyncio.open_connection(host, puerto)) for _ in range(conexiones)])
+
+    @classmethod
+    async def conectar_unix(cls, ruta: str, conexiones: int = 4) -> 'ClienteInventario':
+        """Abre un pool de conexiones por socket Unix con el servidor."""
+        return cls([_Conexion(*await asyncio.open_unix_connection(ruta)) for _ in range(conexiones)])
+
+    async def cerrar(self) -> None:
+        for conexion in self._conexiones:
+            await conexion.cerrar()
+
+    async def __aenter__(self) -> 'ClienteInventario':
+        return self
+
+    async def __aexit__(self, *excepcion) -> None:
+        await self.cerrar()
+
+    async def llamar(self, op: str, *args):
+        """Envía una petición por la siguiente conexión del pool y espera su respuesta."""
+        conexion: _Conexion = next(self._turno)
+        futuro = conexion.enviar(next(self._ids), op, list(args))
+        await conexion.drenar()
+        return await futuro
+
+    # ========================= API DEL INVENTARIO =============================
+
+    async def agregar(self, nombre: str, valor: float = 1.0) -> None:
+        await self.llamar("agregar", nombre, valor)
+
+    async def eliminar(self, nombre: str, cantidad: float = 1.0) -> None:
+        await self.llamar("eliminar", nombre, cantidad)
+
+    async def actualizar(self, nombre: str, nuevo_valor: float) -> None:
+        await self.llamar("actualizar", nombre, nuevo_valor)
+
+    async def agregar_lote(self, pares) -> None:
+        await self.llamar("agregar_lote", [list(par) for par in pares])
+
+    async def actualizar_lote(self, pares) -> None:
+        await self.llamar("actualizar_lote", [list(par) for par in pares])
+
+    async def eliminar_lote(self, pares) -> None:
+        await self.llamar("eliminar_lote", [list(par) for par in pares])
+
+    async def vaciar(self) -> None:
+        await self.llamar("vaciar")
+
+    async def consultar(self, nombre: str) -> float:
+        return await self.llamar("consultar", nombre)
+
+    async def existe(self, nombre: str) -> bool:
+        return await self.llamar("existe", nombre)
+
+    async def total_items(self) -> int:
+        return await self.llamar("total_items")
+
+    async def cantidad_total(self) -> float:
+        return await self.llamar("cantidad_total")
+
+    async def maximo(self) -> str:
+        return await self.llamar("maximo")
+
+    async def minimo(self) -> str:
+        return await self.llamar("minimo")
+
+    async def top(self, k: int, descendente: bool = True) -> list[tuple[str, float]]:
+        return [tuple(par) for par in await self.llamar("top", k, descendente)]
+
+    async def ordenar_por_valor(self, descendente: bool = False) -> list[str]:
+        return await self.llamar("ordenar_por_valor", descendente)
+
+    async def nombres(self) -> list[str]:
+        return await self.llamar("nombres")
@@ -0,0 +1,167 @@
+import io
+
+import pytest
+
+import cambios
+import inventarioEnlazado
+import inventario_contiguo
+
+MODULOS = [inventario_contiguo, inventarioEnlazado]
+
+
+class _SumideroRoto:
+    """Sumidero que falla a partir del cambio con secuencia fallo_en."""
+
+    def __init__(self, fallo_en: int):
+        self.fallo_en = fallo_en
+        self.recibidos = []
+
+    def recibir(self, cambio):
+        if cambio.secuencia >= self.fallo_en:
+            raise BrokenPipeError("tubería cerrada")
+        self.recibidos.append(cambio)
+
+
+@pytest.mark.parametrize("modulo", MODULOS)
+def test_un_sumidero_que_falla_no_afecta_a_la_modificacion_ni_a_los_demas(modulo):
+    inventario = modulo.Inventario()
+    roto = _SumideroRoto(fallo_en=2)
+    anillo = cambios.SumideroAnillo()
+    inventario.suscribir(roto)
+    inventario.suscribir(anillo)
+    replica = cambios.Replica(modulo.Inventario())
+
+    inventario.agregar("a", 1.0)
+    inventario.agregar("b", 2.0)  # falla el primer sumidero: no debe propagarse
+    inventario.agregar("a", 1.0)
+
+    assert sorted(inventario.items()) == [("a", 2.0), ("b", 2.0)]
+    assert [c.secuencia for c in anillo.desde(0)] == [1, 2, 3]
+    assert [c.secuencia for c in roto.recibidos] == [1]
+    [(fallido, error)] = inventario.sumideros_fallidos()
+    assert fallido is roto and isinstance(error, BrokenPipeError)
+
+    replica.seguir(anillo)
+    assert sorted(replica.get_inventario().items()) == sorted(inventario.items())
+
+    inventario.desuscribir(roto)
+    assert inventario.sumideros_fallidos() == []
+    with pytest.raises(modulo.InventarioError):
+        inventario.desuscribir(roto)
+
+
+@pytest.mark.parametrize("modulo", MODULOS)
+def test_fijar_agrega_o_actualiza(modulo):
+    inventario = modulo.Inventario()
+    inventario.fijar("a", 3.0)
+    inventario.fijar("a", 1.5)
+    assert inventario.consultar("a") == 1.5
+    with pytest.raises(modulo.InventarioError):
+        inventario.fijar("b", 0.0)
+
+
+@pytest.mark.parametrize("origen", MODULOS)
+@pytest.mark.parametrize("destino", MODULOS)
+def test_replica_sigue_lotes_vaciar_y_fusionar(origen, destino):
+    inventario = origen.Inventario()
+    anillo = cambios.SumideroAnillo()
+    replica = cambios.Replica(destino.Inventario(), inventario.suscribir(anillo))
+
+    def comprobar():
+        replica.seguir(anillo)
+        assert sorted(replica.get_inventario().items()) == sorted(inventario.items())
+
+    inventario.agregar_lote([("a", 1.0), ("b", 2.0), ("c", 3.0), ("a", 1.0)])
+    comprobar()
+    inventario.actualizar_lote([("b", 5.0), ("c", 0.5)])
+    inventario.eliminar_lote([("a", 1.0), ("c", 0.5)])
+    comprobar()
+    inventario.vaciar()
+    inventario.agregar("d", 4.0)
+    comprobar()
+
+    otro = origen.Inventario()
+    otro.agregar_lote([("d", 1.0), ("e", 2.0)])
+    inventario.fusionar(otro)
+    comprobar()
+    inventario.diferencia(otro)
+    comprobar()
+    assert sorted(replica.get_inventario().items()) == [("d", 4.0)]
+
+
+@pytest.mark.parametrize("modulo", MODULOS)
+def test_replica_ignora_cambios_ya_aplicados(modulo):
+    inventario = modulo.Inventario()
+    anillo = cambios.SumideroAnillo()
+    inventario.suscribir(anillo)
+    replica = cambios.Replica(modulo.Inventario())
+
+    inventario.agregar("a", 1.0)
+    inventario.agregar("a", 2.0)
+    assert replica.aplicar(anillo.desde(0)) == 2
+    inventario.agregar("b", 1.0)
+    # Se vuelve a entregar todo el historial: sólo el cambio nuevo se aplica
+    assert replica.aplicar(anillo.desde(0)) == 1
+    assert replica.aplicar(anillo.desde(0)) == 0
+    assert replica.get_secuencia() == 3
+    assert sorted(replica.get_inventario().items()) == [("a", 3.0), ("b", 1.0)]
+
+
+@pytest.mark.parametrize("modulo", MODULOS)
+def test_cambios_perdidos_por_hueco_y_por_desbordar_el_anillo(modulo):
+    inventario = modulo.Inventario()
+    anillo = cambios.SumideroAnillo(capacidad=3)
+    inventario.suscribir(anillo)
+    replica = cambios.Replica(modulo.Inventario())
+
+    for i in range(3):
+        inventario.agregar(f"n{i}", 1.0)
+    with pytest.raises(cambios.CambiosPerdidos):
+        replica.aplicar(anillo.desde(0)[1:])
+    assert replica.get_secuencia() == 0
+
+    replica.seguir(anillo)
+    inventario.agregar("n3", 1.0)
+    inventario.agregar("n4", 1.0)
+    inventario.agregar("n5", 1.0)
+    inventario.agregar("n6", 1.0)
+    # El anillo sólo guarda 5 a 7 y la réplica va por la 3: se ha perdido la 4
+    with pytest.raises(cambios.CambiosPerdidos):
+        replica.seguir(anillo)
+    assert replica.get_secuencia() == 3
+
+
+def test_sumidero_flujo_y_leer_ida_y_vuelta():
+    flujo = io.StringIO(newline="")
+    sumidero = cambios.SumideroFlujo(flujo)
+    enviados = [
+        cambios.Cambio(1, "=", 'nombre, con "comillas"', 2.5, 2.5),
+        cambios.Cambio(2, "=", "ñandú", 0.1 + 0.2, -2.2),
+        cambios.Cambio(3, "-", "ñandú", None, -(0.1 + 0.2)),
+        cambios.Cambio(4, "*"),
+    ]
+    for cambio in enviados:
+        sumidero.recibir(cambio)
+    sumidero.cerrar()
+    assert not flujo.closed
+
+    flujo.seek(0)
+    assert list(cambios.leer(flujo)) == enviados
+
+    with pytest.raises(ValueError):
+        list(cambios.leer(io.StringIO("1,?,a,,\r\n", newline="")))
+
+
+def test_sumidero_archivo(tmp_path):
+    ruta = str(tmp_path / "cambios.csv")
+    inventario = inventario_contiguo.Inventario()
+    sumidero = cambios.SumideroArchivo(ruta)
+    inventario.suscribir(sumidero)
+    inventario.agregar_lote([("a", 1.0), ("b", 2.0)])
+    inventario.eliminar("a", 1.0)
+    sumidero.cerrar()
+
+    replica = cambios.Replica(inventarioEnlazado.Inventario())
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        assert replica.aplicar(cambios.leer(archivo)) == 3
+    assert list(replica.get_inventario().items()) == [("b", 2.0)]
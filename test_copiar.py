@@ -0,0 +1,91 @@
+import pytest
+
+import inventarioEnlazado
+import inventario_contiguo
+
+FABRICAS = {
+    "contiguo": inventario_contiguo.Inventario,
+    "compacto": lambda: inventario_contiguo.Inventario(compacto=True),
+    "enlazado": inventarioEnlazado.Inventario,
+}
+
+PARES = [(f"sku{i:03d}", float(i % 13 + 1)) for i in range(200)]
+
+
+def _estado(inventario) -> tuple:
+    """Todo lo observable del inventario, para comparar antes y después."""
+    return (sorted(inventario.items()), inventario.total_items(), inventario.cantidad_total(),
+            inventario.consultar(inventario.maximo()), inventario.consultar(inventario.minimo()),
+            [valor for _, valor in inventario.top(5)], inventario.rango(3.0, 5.0))
+
+
+def _modificar(inventario) -> None:
+    inventario.agregar("sku000", 10.0)
+    inventario.agregar("nuevo", 100.0)
+    inventario.actualizar("sku001", 0.5)
+    inventario.eliminar("sku002", 1000.0)
+    inventario.eliminar_lote([(f"sku{i:03d}", 1000.0) for i in range(10, 150)])
+
+
+@pytest.fixture(params=FABRICAS.values(), ids=FABRICAS.keys())
+def fabrica(request):
+    def crear():
+        inventario = request.param()
+        inventario.agregar_lote(PARES)
+        # Índice por valor ya creado: la copia no debe compartirlo
+        inventario.rango(0.0, 1.0)
+        return inventario
+    return crear
+
+
+@pytest.fixture
+def inventario(fabrica):
+    return fabrica()
+
+
+def test_modificar_el_original_no_cambia_la_copia(inventario):
+    antes = _estado(inventario)
+    copia = inventario.copiar()
+    _modificar(inventario)
+
+    assert _estado(copia) == antes
+    assert _estado(inventario) != antes
+
+
+def test_modificar_la_copia_no_cambia_el_original(fabrica, inventario):
+    antes = _estado(inventario)
+    copia = inventario.copiar()
+    _modificar(copia)
+
+    assert _estado(inventario) == antes
+    # La copia queda igual que un inventario sin copias con las mismas modificaciones
+    sin_copias = fabrica()
+    _modificar(sin_copias)
+    assert _estado(copia) == _estado(sin_copias)
+
+
+def test_copias_encadenadas_y_vaciar(inventario):
+    antes = _estado(inventario)
+    copia = inventario.copiar()
+    copia_de_copia = copia.copiar()
+
+    copia.vaciar()
+    copia.agregar("solo_en_la_copia", 1.0)
+    inventario.eliminar("sku005", 1000.0)
+
+    assert _estado(copia_de_copia) == antes
+    assert list(copia.items()) == [("solo_en_la_copia", 1.0)]
+    assert not inventario.existe("sku005") and copia_de_copia.existe("sku005")
+
+
+def test_la_politica_del_enlazado_no_reordena_la_copia():
+    inventario = inventarioEnlazado.Inventario(politica=inventarioEnlazado.Inventario.MOVER_AL_FRENTE)
+    inventario.agregar_lote(PARES)
+    copia = inventario.copiar()
+    orden = list(copia)
+
+    # Con la cadena compartida las consultas no reordenan; tras escribir, sólo la del original
+    inventario.agregar("nuevo", 1.0)
+    inventario.consultar("sku100")
+    assert next(iter(inventario)) == "sku100"
+    assert list(copia) == orden
@@ -0,0 +1,45 @@
+import pytest
+
+import inventarioEnlazado
+import inventario_contiguo
+from diario import Diario
+
+BACKENDS = [inventario_contiguo.Inventario, inventarioEnlazado.Inventario]
+
+
+@pytest.mark.parametrize("clase", BACKENDS)
+def test_fila_incompleta_se_recorta_antes_de_anadir(tmp_path, clase):
+    ruta = str(tmp_path / "inventario.csv")
+    inventario = clase()
+    inventario.abrir_diario(ruta)
+    inventario.agregar("a", 1.0)
+    inventario.agregar("b", 2.0)
+    inventario.cerrar_diario()
+
+    # Una caída deja la última fila a medias, sin salto de línea
+    with open(Diario.ruta_log(ruta), "a", newline="", encoding="utf-8") as log:
+        log.write("=,c,3")
+
+    inventario = clase()
+    inventario.abrir_diario(ruta)
+    assert not inventario.existe("c")
+    inventario.agregar("d", 4.0)
+    inventario.cerrar_diario()
+
+    with open(Diario.ruta_log(ruta), newline="", encoding="utf-8") as log:
+        assert log.read() == "=,a,1.0\r\n=,b,2.0\r\n=,d,4.0\r\n"
+
+    inventario = clase()
+    inventario.abrir_diario(ruta)
+    assert sorted(inventario.items()) == [("a", 1.0), ("b", 2.0), ("d", 4.0)]
+    inventario.cerrar_diario()
+
+
+def test_recortar_sin_salto_de_linea_deja_el_diario_vacio(tmp_path):
+    ruta = str(tmp_path / "inventario.csv")
+    with open(Diario.ruta_log(ruta), "w", newline="", encoding="utf-8") as log:
+        log.write("=,a,1" * 30000)
+
+    Diario(ruta).cerrar()
+    with open(Diario.ruta_log(ruta), encoding="utf-8") as log:
+        assert log.read() == ""
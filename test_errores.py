@@ -0,0 +1,36 @@
+import pickle
+
+import pytest
+
+import inventarioEnlazado
+import inventario_concurrente
+import inventario_contiguo
+import inventario_mapeado
+import inventario_particionado
+import servicio_inventario
+
+
+@pytest.mark.parametrize("capturada", [inventario_contiguo.InventarioError, inventarioEnlazado.InventarioError])
+@pytest.mark.parametrize("provocar", [
+    lambda: inventario_contiguo.Inventario().eliminar("no_existe"),
+    lambda: inventarioEnlazado.Inventario().eliminar("no_existe"),
+    lambda: inventario_mapeado.InventarioMapeado("/no/existe.bin"),
+    lambda: inventario_particionado.InventarioParticionado(particiones=0),
+    lambda: inventario_concurrente.InventarioConcurrente(franjas=0),
+    lambda: inventario_concurrente.InventarioConcurrente(inventarioEnlazado.Inventario).maximo(),
+], ids=["contiguo", "enlazado", "mapeado", "particionado", "concurrente", "concurrente_enlazado"])
+def test_los_errores_de_todos_los_modulos_se_capturan_igual(provocar, capturada):
+    with pytest.raises(capturada):
+        provocar()
+
+
+def test_todos_los_modulos_reexportan_la_misma_excepcion():
+    modulos = [inventarioEnlazado, inventario_concurrente, inventario_mapeado, inventario_particionado,
+               servicio_inventario]
+    assert all(modulo.InventarioError is inventario_contiguo.InventarioError for modulo in modulos)
+
+
+def test_la_excepcion_se_puede_enviar_entre_procesos():
+    error = pickle.loads(pickle.dumps(inventario_contiguo.InventarioError("mensaje")))
+    assert isinstance(error, inventarioEnlazado.InventarioError)
+    assert str(error) == "mensaje"
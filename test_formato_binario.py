@@ -0,0 +1,63 @@
+import pytest
+
+import formato_binario
+import inventarioEnlazado
+import inventario_contiguo
+
+MODULOS = [inventario_contiguo, inventarioEnlazado]
+
+PARES = [("manzanas", 3.5), ("ñandú", 0.1 + 0.2), ("peras", 1e-300), ("", 7.0), ("a" * 1000, 2.0)]
+
+
+@pytest.mark.parametrize("ordenado", [False, True])
+def test_escribir_y_leer_ida_y_vuelta(tmp_path, ordenado):
+    ruta = str(tmp_path / "inventario.bin")
+    formato_binario.escribir(ruta, PARES, ordenado=ordenado)
+
+    nombres, valores = formato_binario.leer(ruta)
+    esperados = sorted(PARES) if ordenado else PARES
+    assert list(zip(nombres, valores)) == esperados
+    with open(ruta, "rb") as archivo:
+        banderas, n = formato_binario.leer_cabecera(archivo.read())
+    assert n == len(PARES) and bool(banderas & formato_binario.ORDENADO) == ordenado
+
+
+def test_inventario_vacio(tmp_path):
+    ruta = str(tmp_path / "vacio.bin")
+    formato_binario.escribir(ruta, [])
+    nombres, valores = formato_binario.leer(ruta)
+    assert nombres == [] and len(valores) == 0
+
+
+@pytest.mark.parametrize("origen", MODULOS)
+@pytest.mark.parametrize("destino", MODULOS)
+def test_guardar_y_cargar_binario_entre_implementaciones(tmp_path, origen, destino):
+    ruta = str(tmp_path / "inventario.bin")
+    inventario = origen.Inventario()
+    inventario.agregar_lote(PARES)
+    inventario.guardar_binario(ruta)
+
+    cargado = destino.Inventario()
+    cargado.agregar("manzanas", 1.0)
+    cargado.cargar_binario(ruta)
+    assert sorted(cargado.items()) == sorted(PARES[1:] + [("manzanas", 4.5)])
+
+
+@pytest.mark.parametrize("modulo", MODULOS)
+def test_cargar_un_archivo_truncado_o_ajeno(tmp_path, modulo):
+    ruta = str(tmp_path / "inventario.bin")
+    formato_binario.escribir(ruta, PARES)
+    with open(ruta, "rb") as archivo:
+        datos = archivo.read()
+
+    cortes = [0, 3, formato_binario.CABECERA.size - 1, formato_binario.CABECERA.size + 5, len(datos) - 1]
+    for corte in cortes:
+        with open(ruta, "wb") as archivo:
+            archivo.write(datos[:corte])
+        with pytest.raises(modulo.InventarioError):
+            modulo.Inventario().cargar_binario(ruta)
+
+    with open(ruta, "wb") as archivo:
+        archivo.write(b"nombre,valor\n" + datos)
+    with pytest.raises(modulo.InventarioError):
+        modulo.Inventario().cargar_binario(ruta)
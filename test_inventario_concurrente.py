@@ -0,0 +1,102 @@
+import sys
+import threading
+
+import pytest
+
+import inventarioEnlazado
+import inventario_contiguo
+from inventario_concurrente import InventarioConcurrente
+
+CLASES = [inventario_contiguo.Inventario, inventarioEnlazado.Inventario]
+
+HILOS = 8
+OPERACIONES = 2000
+
+
+@pytest.fixture(autouse=True)
+def cambios_de_hilo_frecuentes():
+    # Cambiar de hilo mucho más a menudo hace aparecer antes las carreras
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(intervalo)
+
+
+def _en_hilos(trabajo, hilos: int = HILOS) -> None:
+    barrera = threading.Barrier(hilos)
+    errores: list = []
+
+    def ejecutar(i):
+        barrera.wait()
+        try:
+            trabajo(i)
+        except Exception as e:
+            errores.append(e)
+
+    trabajadores = [threading.Thread(target=ejecutar, args=(i,)) for i in range(hilos)]
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+    assert errores == []
+
+
+@pytest.mark.parametrize("clase", CLASES)
+def test_agregar_desde_varios_hilos(clase):
+    inventario = InventarioConcurrente(clase, franjas=4)
+    nombres = [f"sku{i}" for i in range(100)]
+
+    _en_hilos(lambda i: [inventario.agregar(nombres[k % len(nombres)], 1.0) for k in range(OPERACIONES)])
+
+    assert inventario.cantidad_total() == HILOS * OPERACIONES
+    assert {inventario.consultar(nombre) for nombre in nombres} == {HILOS * OPERACIONES / len(nombres)}
+
+
+@pytest.mark.parametrize("clase", CLASES)
+def test_fusionar_con_escritores_concurrentes(clase):
+    inventario = InventarioConcurrente(clase, franjas=4)
+    otro = clase()
+    # Los nombres de otro coinciden con la mitad de los que escriben los demás hilos
+    otro.agregar_lote((f"sku{i}", 1.0) for i in range(0, 100, 2))
+    fusiones = 200
+
+    def trabajo(i):
+        if i == 0:
+            for _ in range(fusiones):
+                inventario.fusionar(otro)
+        else:
+            for k in range(OPERACIONES):
+                inventario.agregar(f"sku{k % 100}", 1.0)
+
+    _en_hilos(trabajo)
+
+    assert inventario.cantidad_total() == (HILOS - 1) * OPERACIONES + fusiones * 50
+    por_nombre = (HILOS - 1) * OPERACIONES / 100
+    assert {inventario.consultar(f"sku{i}") for i in range(0, 100, 2)} == {por_nombre + fusiones}
+    assert {inventario.consultar(f"sku{i}") for i in range(1, 100, 2)} == {por_nombre}
+
+
+@pytest.mark.parametrize("clase", CLASES)
+def test_fusionar_y_diferencia_con_escritores_concurrentes(clase):
+    inventario = InventarioConcurrente(clase, franjas=4)
+    base = [(f"sku{i}", 1000.0) for i in range(100)]
+    inventario.agregar_lote(base)
+    otro = clase()
+    otro.agregar_lote((f"sku{i}", 3.0) for i in range(0, 100, 2))
+    vueltas = 100
+
+    def trabajo(i):
+        if i < HILOS // 2:
+            # Cada fusionar se deshace con su diferencia: el efecto neto es nulo
+            for _ in range(vueltas):
+                inventario.fusionar(otro)
+                inventario.diferencia(otro)
+        else:
+            for k in range(OPERACIONES):
+                inventario.agregar(f"sku{k % 100}", 1.0)
+
+    _en_hilos(trabajo)
+
+    escritores = HILOS - HILOS // 2
+    assert inventario.cantidad_total() == 1000.0 * 100 + escritores * OPERACIONES
+    assert {inventario.consultar(nombre) for nombre, _ in base} == {1000.0 + escritores * OPERACIONES / 100}
@@ -0,0 +1,160 @@
+import pytest
+
+from inventario_contiguo import Inventario, InventarioError
+
+MODOS = [False, True]
+
+
+def _lleno(compacto: bool, n: int = 100) -> Inventario:
+    inventario = Inventario(compacto=compacto)
+    inventario.agregar_lote((f"n{i:03d}", float(i + 1)) for i in range(n))
+    return inventario
+
+
+def _comprobar(inventario: Inventario, modelo: dict[str, float]) -> None:
+    """Compara el inventario con un dict que conserva el orden de inserción."""
+    assert list(inventario.items()) == list(modelo.items())
+    assert inventario.total_items() == len(modelo)
+    assert inventario.cantidad_total() == sum(modelo.values())
+    assert inventario.consultar(inventario.maximo()) == max(modelo.values())
+    assert inventario.consultar(inventario.minimo()) == min(modelo.values())
+    assert inventario.top(3) == sorted(modelo.items(), key=lambda par: par[1], reverse=True)[:3]
+    assert inventario.top(3, descendente=False) == sorted(modelo.items(), key=lambda par: par[1])[:3]
+    assert inventario.rango(20.0, 40.0) == sorted(((n, v) for n, v in modelo.items() if 20.0 <= v <= 40.0),
+                                                  key=lambda par: (par[1], par[0]))
+    assert inventario.ordenar_por_valor() == [n for n, _ in sorted(modelo.items(), key=lambda par: par[1])]
+
+
+# ========================= LÁPIDAS =============================
+
+@pytest.mark.parametrize("compacto", MODOS)
+def test_eliminar_deja_lapidas_sin_alterar_el_orden(compacto):
+    inventario = _lleno(compacto)
+    inventario.reservar(100)  # sin reducciones: sólo se ven las lápidas
+    modelo = dict(inventario.items())
+
+    for i in range(0, 60, 3):
+        inventario.eliminar(f"n{i:03d}", 1000.0)
+        del modelo[f"n{i:03d}"]
+
+    estado = inventario.estado_capacidad()
+    assert estado["lapidas"] == 20 and estado["ocupadas"] == 100
+    _comprobar(inventario, modelo)
+
+    # Un nombre eliminado que vuelve a entrar va al final
+    inventario.agregar("n003", 7.0)
+    modelo["n003"] = 7.0
+    _comprobar(inventario, modelo)
+
+
+@pytest.mark.parametrize("compacto", MODOS)
+def test_pasado_el_umbral_se_compactan_las_lapidas(compacto):
+    inventario = _lleno(compacto)
+    inventario.reservar(100)
+    modelo = dict(inventario.items())
+    maximo_de_lapidas = 0
+
+    # Se eliminan los extremos y el centro para mover máximo y mínimo
+    for i in list(range(0, 30)) + list(range(70, 100)) + list(range(40, 50)):
+        inventario.eliminar(f"n{i:03d}", 1000.0)
+        del modelo[f"n{i:03d}"]
+        estado = inventario.estado_capacidad()
+        maximo_de_lapidas = max(maximo_de_lapidas, estado["lapidas"])
+        assert estado["lapidas"] <= estado["ocupadas"] * Inventario._PROPORCION_MAXIMA_LAPIDAS
+        assert estado["ocupadas"] == estado["longitud"] + estado["lapidas"]
+
+    assert maximo_de_lapidas > 0
+    assert inventario.estado_capacidad()["ocupadas"] < 100
+    _comprobar(inventario, modelo)
+
+
+@pytest.mark.parametrize("compacto", MODOS)
+def test_eliminar_lote_y_diferencia_con_lapidas(compacto):
+    inventario = _lleno(compacto)
+    modelo = dict(inventario.items())
+
+    inventario.eliminar_lote([(f"n{i:03d}", 1000.0) for i in range(0, 100, 2)])
+    otro = Inventario()
+    otro.agregar_lote([(f"n{i:03d}", 1.0) for i in range(1, 100, 4)] + [("ajeno", 1.0)])
+    inventario.diferencia(otro)
+
+    for i in range(100):
+        nombre = f"n{i:03d}"
+        if i % 2 == 0:
+            del modelo[nombre]
+        elif i % 4 == 1:
+            modelo[nombre] -= 1.0
+            if modelo[nombre] <= 0:
+                del modelo[nombre]
+    _comprobar(inventario, modelo)
+
+
+# ========================= CAPACIDAD =============================
+
+def test_reservar_amplia_de_una_vez():
+    inventario = Inventario()
+    inventario.reservar(1000)
+    estado = inventario.estado_capacidad()
+    assert estado["capacidad"] == 1000 and estado["reserva"] == 1000
+
+    inventario.agregar_lote((f"n{i}", 1.0) for i in range(1000))
+    assert inventario.estado_capacidad()["redimensiones"] == estado["redimensiones"]
+
+    with pytest.raises(InventarioError):
+        inventario.reservar(-1)
+
+
+def test_la_reserva_limita_la_reduccion():
+    inventario = _lleno(False, 1000)
+    inventario.reservar(500)
+
+    inventario.eliminar_lote([(f"n{i:03d}", 1e9) for i in range(990)])
+    assert inventario.estado_capacidad()["capacidad"] >= 500
+
+    # Sin reserva, la siguiente baja reduce a 1/factor de ocupación
+    inventario.reservar(0)
+    inventario.eliminar("n990", 1e9)
+    estado = inventario.estado_capacidad()
+    assert estado["capacidad"] == 9 * 2 and estado["longitud"] == 9
+    assert sorted(inventario.nombres()) == [f"n{i}" for i in range(991, 1000)]
+
+
+@pytest.mark.parametrize("compacto", MODOS)
+def test_vaciar_reduce_la_capacidad(compacto):
+    inventario = _lleno(compacto, 1000)
+    inventario.vaciar()
+    assert inventario.estado_capacidad()["capacidad"] == Inventario._CAPACIDAD_MINIMA
+
+    inventario = _lleno(compacto, 1000)
+    inventario.reservar(300)
+    inventario.vaciar()
+    assert inventario.estado_capacidad()["capacidad"] == 300
+    inventario.agregar("a", 1.0)
+    assert list(inventario.items()) == [("a", 1.0)]
+
+
+def test_agregar_y_eliminar_en_el_umbral_no_redimensiona_cada_vez():
+    inventario = Inventario()
+    inventario.agregar_lote((f"n{i}", 1.0) for i in range(64))
+    redimensiones = inventario.estado_capacidad()["redimensiones"]
+
+    # Justo al llenar la capacidad: alternar altas y bajas no debe redimensionar en bucle
+    # (las lápidas de "extra" se acumulan, pero la capacidad se estabiliza enseguida)
+    for _ in range(1000):
+        inventario.agregar("extra", 1.0)
+        inventario.eliminar("extra", 1.0)
+    assert inventario.estado_capacidad()["redimensiones"] <= redimensiones + 2
+    assert list(inventario.nombres()) == [f"n{i}" for i in range(64)]
+
+
+@pytest.mark.parametrize("factor", [1.5, 2.0, 4.0])
+def test_capacidad_entre_umbrales_tras_bajas_masivas(factor):
+    inventario = Inventario(factor_crecimiento=factor)
+    inventario.agregar_lote((f"n{i}", 1.0) for i in range(5000))
+
+    for restantes in (2500, 600, 100, 7, 0):
+        inventario.eliminar_lote([(f"n{i}", 1.0) for i in range(restantes, inventario.total_items())])
+        estado = inventario.estado_capacidad()
+        assert estado["longitud"] == restantes
+        # Ni más de 2·factor veces sobredimensionado ni por debajo de lo que hay
+        assert restantes <= estado["capacidad"] <= max(restantes * 2 * factor, Inventario._CAPACIDAD_MINIMA)
@@ -0,0 +1,73 @@
+from inventarioEnlazado import Inventario
+
+
+def _inventario(n: int) -> Inventario:
+    inventario = Inventario()
+    inventario.agregar_lote((f"n{i}", float(i + 1)) for i in range(n))
+    return inventario
+
+
+def test_eliminar_el_actual_durante_el_recorrido_no_lo_corta():
+    inventario = _inventario(10)
+    orden = list(inventario)
+
+    visitados = []
+    for nombre in inventario:
+        visitados.append(nombre)
+        inventario.eliminar(nombre, inventario.consultar(nombre))
+
+    assert visitados == orden
+    assert len(inventario) == 0 and list(inventario) == []
+
+
+def test_eliminar_durante_el_recorrido_no_reutiliza_nodos():
+    inventario = _inventario(10)
+    orden = list(inventario)
+
+    visitados = []
+    for nombre in inventario:
+        visitados.append(nombre)
+        if nombre in ("n3", "n5", "n7"):
+            inventario.eliminar(nombre, 100.0)
+            # Un alta durante el recorrido no puede ocupar el nodo recién eliminado
+            inventario.agregar(f"nuevo_{nombre}", 1.0)
+
+    assert visitados == orden
+    assert None not in visitados
+    assert sorted(inventario) == sorted([n for n in orden if n not in ("n3", "n5", "n7")]
+                                        + ["nuevo_n3", "nuevo_n5", "nuevo_n7"])
+
+
+def test_vaciar_durante_el_recorrido():
+    inventario = _inventario(5)
+    orden = list(inventario)
+
+    visitados = []
+    for nombre in inventario:
+        visitados.append(nombre)
+        inventario.vaciar()
+        inventario.agregar("otro", 1.0)
+
+    assert visitados == orden
+    assert list(inventario.items()) == [("otro", 1.0)]
+
+
+def test_los_nodos_eliminados_fuera_de_un_recorrido_se_reutilizan():
+    inventario = _inventario(10)
+    for i in range(10):
+        inventario.eliminar(f"n{i}", 100.0)
+    assert inventario._num_nodos_libres == 10
+    inventario.agregar_lote((f"m{i}", 1.0) for i in range(10))
+
+    assert inventario._num_nodos_libres == 0
+    assert sorted(inventario) == [f"m{i}" for i in range(10)]
+    assert inventario.cantidad_total() == 10.0
+
+
+def test_guardar_no_desactiva_la_politica(tmp_path):
+    inventario = Inventario(politica=Inventario.MOVER_AL_FRENTE)
+    inventario.agregar_lote((f"n{i}", 1.0) for i in range(10))
+    inventario.guardar(str(tmp_path / "inventario.csv"))
+
+    inventario.consultar("n3")
+    assert next(iter(inventario)) == "n3"
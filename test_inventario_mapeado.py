@@ -0,0 +1,75 @@
+import sys
+
+import pytest
+
+import formato_binario
+import inventarioEnlazado
+import inventario_contiguo
+from inventario_mapeado import InventarioError, InventarioMapeado
+
+MODULOS = [inventario_contiguo, inventarioEnlazado]
+
+PARES = [(f"sku{i:04d}", float(i % 97 + 1)) for i in range(1000)] + [("ñandú", 0.5), ("zz", 500.0)]
+
+
+def _mapeos_de(ruta: str) -> int:
+    """Número de regiones de memoria de este proceso que mapean ruta (sólo Linux)."""
+    with open("/proc/self/maps") as mapas:
+        return sum(linea.rstrip().endswith(ruta) for linea in mapas)
+
+
+@pytest.mark.parametrize("modulo", MODULOS)
+def test_consultas_sobre_el_archivo_mapeado(tmp_path, modulo):
+    inventario = modulo.Inventario()
+    inventario.agregar_lote(PARES)
+
+    with InventarioMapeado.desde_inventario(inventario, str(tmp_path / "catalogo.bin")) as mapeado:
+        assert len(mapeado) == len(PARES)
+        assert list(mapeado) == sorted(nombre for nombre, _ in PARES)
+        for nombre, valor in PARES[::37] + PARES[-2:]:
+            assert mapeado.existe(nombre) and mapeado.consultar(nombre) == valor
+        assert not mapeado.existe("sku") and mapeado.consultar("sku9999") == 0.0
+        assert mapeado.cantidad_total() == inventario.cantidad_total()
+        assert mapeado.maximo() == "zz" and mapeado.minimo() == "ñandú"
+        with pytest.raises(InventarioError):
+            mapeado.agregar("a", 1.0)
+
+
+def test_inventario_mapeado_vacio(tmp_path):
+    with InventarioMapeado.desde_inventario(inventario_contiguo.Inventario(), str(tmp_path / "vacio.bin")) as mapeado:
+        assert len(mapeado) == 0 and list(mapeado) == [] and not mapeado.existe("a")
+        with pytest.raises(InventarioError):
+            mapeado.maximo()
+
+
+def test_archivo_no_ordenado(tmp_path):
+    ruta = str(tmp_path / "catalogo.bin")
+    formato_binario.escribir(ruta, PARES)
+    with pytest.raises(InventarioError):
+        InventarioMapeado(ruta)
+
+
+def test_archivo_truncado_o_corrupto(tmp_path):
+    ruta = str(tmp_path / "catalogo.bin")
+    formato_binario.escribir(ruta, PARES, ordenado=True)
+    with open(ruta, "rb") as archivo:
+        datos = archivo.read()
+
+    _, inicio_indice, inicio_tabla = formato_binario.desplazamientos(len(PARES))
+    # Cortes dentro de la cabecera, de los valores, del índice y de la tabla, y bytes de más
+    variantes = [datos[:5], datos[:formato_binario.CABECERA.size + 3], datos[:inicio_indice + 8],
+                 datos[:inicio_tabla], datos[:-1], datos + b"\0"]
+    for variante in variantes:
+        with open(ruta, "wb") as archivo:
+            archivo.write(variante)
+        with pytest.raises(InventarioError):
+            InventarioMapeado(ruta)
+
+    if sys.platform.startswith("linux"):
+        # Cada intento fallido ha cerrado su mapeo
+        assert _mapeos_de(ruta) == 0
+
+
+def test_archivo_inexistente(tmp_path):
+    with pytest.raises(InventarioError):
+        InventarioMapeado(str(tmp_path / "no_existe.bin"))
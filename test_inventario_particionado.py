@@ -0,0 +1,86 @@
+import pytest
+
+import inventarioEnlazado
+import inventario_contiguo
+from inventario_particionado import InventarioError, InventarioParticionado
+
+
+@pytest.mark.parametrize("clase", [inventario_contiguo.Inventario, inventarioEnlazado.Inventario])
+def test_eliminar_lote_invalido_no_aplica_nada(clase):
+    nombres = [f"sku{i}" for i in range(20)]
+    with InventarioParticionado(particiones=4, clase=clase) as inventario:
+        inventario.agregar_lote((nombre, 5.0) for nombre in nombres)
+
+        # Una cantidad negativa en un solo elemento (y un 0, que el enlazado rechaza)
+        lotes = [[(nombre, 1.0) for nombre in nombres[:-1]] + [(nombres[-1], -1.0)]]
+        if clase is inventarioEnlazado.Inventario:
+            lotes.append([(nombre, 1.0) for nombre in nombres[:-1]] + [(nombres[-1], 0.0)])
+        for lote in lotes:
+            with pytest.raises(InventarioError):
+                inventario.eliminar_lote(lote)
+            assert {inventario.consultar(nombre) for nombre in nombres} == {5.0}
+
+
+def test_eliminar_lote_con_nombre_inexistente_no_aplica_nada():
+    with InventarioParticionado(particiones=3) as inventario:
+        inventario.agregar_lote([("a", 2.0), ("b", 2.0), ("c", 2.0)])
+        with pytest.raises(InventarioError):
+            inventario.eliminar_lote([("a", 1.0), ("b", 1.0), ("zz", 1.0)])
+        assert sorted(inventario._pares()) == [("a", 2.0), ("b", 2.0), ("c", 2.0)]
+
+        inventario.eliminar_lote([("a", 1.0), ("b", 2.0)])
+        assert sorted(inventario._pares()) == [("a", 1.0), ("c", 2.0)]
+
+
+class _InventarioExigente(inventario_contiguo.Inventario):
+    """Partición que rechaza las altas de nombres que empiezan por "malo"."""
+
+    def agregar_lote(self, pares) -> None:
+        pares = list(pares)
+        if any(nombre.startswith("malo") for nombre, _ in pares):
+            raise inventario_contiguo.InventarioError("Nombre no admitido.")
+        super().agregar_lote(pares)
+
+
+def test_un_lote_de_altas_rechazado_se_informa_al_sincronizar():
+    with InventarioParticionado(particiones=2, clase=_InventarioExigente) as inventario:
+        inventario.agregar("bueno", 1.0)
+        inventario.sincronizar()
+        inventario.agregar("malo", 1.0)  # sólo se acumula: aún no falla
+        inventario.agregar("bueno", 1.0)
+        with pytest.raises(InventarioError, match="lote de altas"):
+            inventario.sincronizar()
+
+        # El lote rechazado no se ha aplicado, y el error sólo se informa una vez
+        inventario.sincronizar()
+        assert not inventario.existe("malo") and inventario.total_items() == 1
+
+
+def test_api_de_consulta_repartida_entre_particiones():
+    pares = [(f"fruta/{i:03d}", float(i % 7 + 1)) for i in range(60)] + [(f"verdura/{i}", 2.0) for i in range(15)]
+    local = inventario_contiguo.Inventario()
+    local.agregar_lote(pares)
+
+    with InventarioParticionado(particiones=4) as inventario:
+        inventario.agregar_lote(pares)
+
+        assert inventario.rango(2.0, 4.0) == local.rango(2.0, 4.0)
+        assert inventario.contar_rango(2.0, 4.0) == local.contar_rango(2.0, 4.0)
+        assert list(inventario.por_valor()) == list(local.por_valor())
+        assert list(inventario.por_valor(descendente=True)) == list(local.por_valor(descendente=True))
+        assert inventario.buscar_prefijo("fruta/01") == local.buscar_prefijo("fruta/01")
+        assert inventario.buscar_prefijo("fruta/", limite=5) == local.buscar_prefijo("fruta/", limite=5)
+        assert inventario.cantidad_total("verdura/") == local.cantidad_total("verdura/") == 30.0
+        assert sorted(inventario.items()) == sorted(pares)
+        assert list(zip(inventario.nombres(), inventario.valores())) == list(inventario.items())
+        assert len(inventario.items()) == len(pares)
+
+        inventario.fijar("fruta/000", 9.0)
+        inventario.fijar("nueva", 3.0)
+        copia = inventario.copiar()
+        with copia:
+            copia.eliminar("nueva", 3.0)
+            inventario.agregar("fruta/001", 1.0)
+            assert copia.consultar("fruta/000") == 9.0 and not copia.existe("nueva")
+            assert copia.consultar("fruta/001") == 2.0
+        assert inventario.consultar("nueva") == 3.0 and inventario.consultar("fruta/001") == 3.0
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+import inventarioEnlazado
+import inventario_contiguo
+from servicio_inventario import ClienteInventario, InventarioError, ServidorInventario
+
+MODULOS = [inventario_contiguo, inventarioEnlazado]
+
+
+def _con_servicio(modulo, prueba, conexiones: int = 1):
+    """Arranca un servidor en localhost, ejecuta prueba(servidor, cliente, inventario) y lo para."""
+    async def principal():
+        inventario = modulo.Inventario()
+        servidor = ServidorInventario(inventario)
+        host, puerto = await servidor.iniciar_tcp("127.0.0.1", 0)
+        try:
+            async with await ClienteInventario.conectar_tcp(host, puerto, conexiones) as cliente:
+                await prueba(servidor, cliente, inventario)
+        finally:
+            await servidor.cerrar()
+
+    asyncio.run(principal())
+
+
+@pytest.mark.parametrize("modulo", MODULOS)
+def test_escrituras_encadenadas_se_aplican_en_lotes(modulo):
+    async def prueba(servidor, cliente, inventario):
+        await asyncio.gather(*(cliente.agregar(f"sku{i % 50}", 1.0) for i in range(500)))
+        assert inventario.total_items() == 50
+        assert inventario.cantidad_total() == 500.0
+        # 500 escrituras en muy pocos lotes, no una a una
+        assert 1 <= servidor.get_lotes_aplicados() < 50
+
+    _con_servicio(modulo, prueba, conexiones=4)
+
+
+@pytest.mark.parametrize("modulo", MODULOS)
+def test_un_error_en_un_lote_solo_afecta_a_su_peticion(modulo):
+    async def prueba(servidor, cliente, inventario):
+        await cliente.agregar_lote([("a", 5.0), ("b", 5.0)])
+        resultados = await asyncio.gather(cliente.eliminar("a", 1.0), cliente.eliminar("no_existe", 1.0),
+                                          cliente.eliminar("b", 2.0), return_exceptions=True)
+        assert resultados[0] is None and resultados[2] is None
+        assert isinstance(resultados[1], InventarioError)
+        assert inventario.consultar("a") == 4.0
+        assert inventario.consultar("b") == 3.0
+
+        # Lo mismo con un valor no válido entre altas correctas
+        resultados = await asyncio.gather(cliente.agregar("c", 1.0), cliente.agregar("d", -1.0),
+                                          return_exceptions=True)
+        assert resultados[0] is None and isinstance(resultados[1], InventarioError)
+        assert inventario.existe("c") and not inventario.existe("d")
+
+    _con_servicio(modulo, prueba)
+
+
+@pytest.mark.parametrize("modulo", MODULOS)
+def test_cada_cliente_lee_lo_que_ya_escribio(modulo):
+    async def prueba(servidor, cliente, inventario):
+        # Sin esperar a las escrituras: la lectura va detrás por la misma conexión
+        escrituras = [cliente.agregar("a", 1.0) for _ in range(20)]
+        lecturas = await asyncio.gather(*escrituras, cliente.consultar("a"), cliente.eliminar("a", 5.0),
+                                        cliente.consultar("a"), cliente.total_items())
+        assert lecturas[20:] == [20.0, None, 15.0, 1]
+
+    _con_servicio(modulo, prueba)
+
+
+def test_operacion_desconocida():
+    async def prueba(servidor, cliente, inventario):
+        with pytest.raises(InventarioError):
+            await cliente.llamar("borrar_todo")
+
+    _con_servicio(inventario_contiguo, prueba)
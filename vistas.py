@@ -0,0 +1,31 @@
+"""
+La Vista que devuelven items(), nombres(), valores() y por_valor(): en lugar de
+una lista con una copia de los datos, un objeto que los lee cada vez que se recorre.
+"""
+from typing import Callable, Iterator
+
+
+class Vista:
+    """
+    Vista de solo lectura sobre un inventario. No copia nada: cada recorrido
+    lee directamente del almacenamiento del inventario, así que se puede
+    recorrer varias veces y siempre refleja su estado actual.
+
+    Como al recorrer el propio inventario, no se admite modificarlo mientras
+    se recorre una de sus vistas.
+    """
+
+    __slots__ = ("_inventario", "_recorrer")
+
+    def __init__(self, inventario, recorrer: Callable[[], Iterator]):
+        self._inventario = inventario
+        self._recorrer: Callable[[], Iterator] = recorrer
+
+    def __iter__(self) -> Iterator:
+        return self._recorrer()
+
+    def __len__(self) -> int:
+        return len(self._inventario)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"